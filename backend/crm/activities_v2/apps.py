@@ -5,3 +5,6 @@ class ActivitiesV2Config(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'activities_v2'
     verbose_name = 'Activities V2'
+
+    def ready(self):
+        from . import signals  # noqa: F401
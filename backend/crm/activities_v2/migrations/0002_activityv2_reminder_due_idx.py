@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities_v2', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activityv2',
+            index=models.Index(
+                condition=models.Q(('deleted_at__isnull', True), ('reminder_sent', False)),
+                fields=['reminder_at', 'id'],
+                name='activities_v2_reminder_due_idx',
+            ),
+        ),
+    ]
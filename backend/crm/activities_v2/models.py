@@ -119,6 +119,10 @@ class ActivityV2(models.Model):
             models.Index(fields=['org_id', 'assigned_to_id'], name='activities_v2_assigned_idx'),
             models.Index(fields=['org_id', 'due_date'], name='activities_v2_due_idx'),
             models.Index(fields=['org_id', 'deleted_at'], name='activities_v2_deleted_idx'),
+            models.Index(
+                fields=['reminder_at', 'id'], name='activities_v2_reminder_due_idx',
+                condition=models.Q(reminder_sent=False, deleted_at__isnull=True),
+            ),
         ]
 
     def __str__(self):
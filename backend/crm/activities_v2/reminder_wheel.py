@@ -0,0 +1,154 @@
+"""
+Timing wheel for V2 activity reminders.
+
+Every activity with a pending reminder is a member of one Redis sorted set
+scored by its ``reminder_at`` timestamp. ``activities_v2.signals`` keeps the
+set in step with the table: a save that sets or moves ``reminder_at`` re-adds
+the activity with the new score, and a save that clears it, sends it,
+completes or deletes the activity (or a hard delete) removes it — always
+after the transaction commits.
+
+``manage.py reminder_scheduler`` runs ``run_wheel``: it pops the members
+whose time has come (atomically, so several schedulers can run) and queues
+``crm.tasks.send_due_activity_reminders`` for them, sleeping only until the
+next reminder is due, at most ``REMINDER_WHEEL_TICK_SECONDS``. Reminders
+therefore go out within seconds of ``reminder_at``.
+
+The beat-driven ``send_activity_v2_reminders`` poll is the safety net: it
+sends anything overdue the wheel missed and re-adds upcoming reminders
+written without signals (``QuerySet.update``, imports) or lost with Redis.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WHEEL_KEY = 'crm:reminders:wheel'
+
+DEFAULT_TICK_SECONDS = 1
+DEFAULT_RESYNC_MINUTES = 60
+
+# Pop members due by ARGV[1], at most ARGV[2] of them, in one step.
+POP_DUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+_client = None
+_pop_due = None
+
+
+def _setting(name, default):
+    return settings.CRM_SETTINGS.get(name, default)
+
+
+def redis_client():
+    global _client
+    if _client is None:
+        import redis
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def is_pending(activity) -> bool:
+    from .models import ActivityV2
+
+    return (
+        activity.reminder_at is not None
+        and not activity.reminder_sent
+        and activity.deleted_at is None
+        and activity.status in (ActivityV2.Status.PENDING, ActivityV2.Status.IN_PROGRESS)
+    )
+
+
+def schedule(activity_id, reminder_at):
+    redis_client().zadd(WHEEL_KEY, {str(activity_id): reminder_at.timestamp()})
+
+
+def cancel(activity_id):
+    redis_client().zrem(WHEEL_KEY, str(activity_id))
+
+
+def sync_activity(activity_id, reminder_at, pending: bool):
+    """Add, move or remove one activity. Redis errors only log: the poll catches up."""
+    try:
+        if pending:
+            schedule(activity_id, reminder_at)
+        else:
+            cancel(activity_id)
+    except Exception as e:
+        logger.warning(f"Could not update reminder wheel for activity {activity_id}: {e}")
+
+
+def pop_due(now=None, limit: int = None) -> list:
+    """Remove and return the ids of activities whose reminder is due by ``now``."""
+    global _pop_due
+    if _pop_due is None:
+        _pop_due = redis_client().register_script(POP_DUE_SCRIPT)
+    now = now or timezone.now()
+    limit = limit or _setting('REMINDER_BATCH_SIZE', 200)
+    return _pop_due(keys=[WHEEL_KEY], args=[now.timestamp(), limit])
+
+
+def seconds_until_next(now=None):
+    """Seconds until the earliest scheduled reminder, or None when the wheel is empty."""
+    first = redis_client().zrange(WHEEL_KEY, 0, 0, withscores=True)
+    if not first:
+        return None
+    now = now or timezone.now()
+    return max(0.0, first[0][1] - now.timestamp())
+
+
+def resync(horizon_minutes: int = None) -> int:
+    """(Re-)add every pending reminder due within ``horizon_minutes``; returns how many."""
+    from .reminders import due_reminders
+
+    horizon_minutes = horizon_minutes or _setting('REMINDER_WHEEL_RESYNC_MINUTES', DEFAULT_RESYNC_MINUTES)
+    horizon = timezone.now() + timedelta(minutes=horizon_minutes)
+    rows = due_reminders(horizon).values_list('id', 'reminder_at')
+
+    client = redis_client()
+    added = 0
+    pipe = client.pipeline(transaction=False)
+    for activity_id, reminder_at in rows.iterator(chunk_size=2000):
+        pipe.zadd(WHEEL_KEY, {str(activity_id): reminder_at.timestamp()})
+        added += 1
+        if added % 2000 == 0:
+            pipe.execute()
+    pipe.execute()
+    return added
+
+
+def enqueue_due(now=None) -> int:
+    """Hand due reminders to the workers, one task per batch; returns how many."""
+    from crm.tasks import send_due_activity_reminders
+
+    total = 0
+    while True:
+        ids = pop_due(now)
+        if not ids:
+            return total
+        send_due_activity_reminders.delay(ids)
+        total += len(ids)
+
+
+def run_wheel(tick_seconds: float = None):
+    """Queue reminders as they fall due, forever."""
+    tick_seconds = tick_seconds or _setting('REMINDER_WHEEL_TICK_SECONDS', DEFAULT_TICK_SECONDS)
+    while True:
+        try:
+            queued = enqueue_due()
+            if queued:
+                logger.info(f"Queued {queued} due reminder(s)")
+            wait = seconds_until_next()
+        except Exception as e:
+            logger.warning(f"Reminder wheel tick failed: {e}")
+            wait = None
+        time.sleep(tick_seconds if wait is None else min(wait, tick_seconds))
@@ -0,0 +1,248 @@
+"""
+Reminder dispatch for V2 activities.
+
+``dispatch_due_reminders`` works through the due reminders in batches of
+``REMINDER_BATCH_SIZE``. Each batch is claimed with
+``SELECT ... FOR UPDATE SKIP LOCKED`` inside its own transaction, so any
+number of workers (or overlapping beat runs) can dispatch at once without
+two of them emailing the same reminder: rows another worker holds are
+skipped, and rows it has sent are no longer due once it commits.
+
+A claimed batch resolves contact/company names once and owner emails with
+one cached, batched org-service lookup per org, renders every message, and
+sends them from ``REMINDER_SEND_THREADS`` threads. Each thread opens one
+SMTP connection for its share of the batch and hands messages to
+``send_messages``. The sent rows are then marked ``reminder_sent`` with a
+single UPDATE before the batch commits.
+
+``dispatch_reminders`` does the same for the ids ``reminder_wheel`` pops
+when they fall due; ``dispatch_due_reminders`` sweeps everything due and
+backs the wheel up.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from crm.member_directory import resolve_owner_emails
+
+from .models import ActivityV2
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_SEND_THREADS = 8
+
+# Clock skew tolerated between the scheduler that popped a reminder and the
+# worker checking that it is due.
+DUE_SKEW = timedelta(seconds=30)
+
+REMINDER_FIELDS = (
+    'id', 'org_id', 'owner_id', 'activity_type', 'subject', 'description',
+    'due_date', 'contact_id', 'company_id', 'reminder_at',
+)
+
+
+def _setting(name, default):
+    return settings.CRM_SETTINGS.get(name, default)
+
+
+def due_reminders(lookahead_time):
+    return ActivityV2.all_objects.filter(
+        reminder_at__lte=lookahead_time,
+        reminder_sent=False,
+        deleted_at__isnull=True,
+        status__in=[ActivityV2.Status.PENDING, ActivityV2.Status.IN_PROGRESS],
+    )
+
+
+def claim_batch(lookahead_time, batch_size, after=None):
+    """
+    Lock up to ``batch_size`` due reminders no other worker holds. ``after``
+    is the (reminder_at, id) of the previous batch's last row, so rows left
+    unsent (no owner email, SMTP failure) aren't claimed again in one run.
+    Must run inside a transaction.
+    """
+    queryset = due_reminders(lookahead_time)
+    if after is not None:
+        reminder_at, activity_id = after
+        queryset = queryset.filter(
+            Q(reminder_at__gt=reminder_at) | Q(reminder_at=reminder_at, id__gt=activity_id)
+        )
+    return list(
+        queryset.select_for_update(skip_locked=True)
+        .only(*REMINDER_FIELDS)
+        .order_by('reminder_at', 'id')[:batch_size]
+    )
+
+
+def _names(activities):
+    contact_ids = {a.contact_id for a in activities if a.contact_id}
+    company_ids = {a.company_id for a in activities if a.company_id}
+    contact_names = {}
+    company_names = {}
+
+    if contact_ids:
+        from contacts_v2.models import ContactV2
+        for c in ContactV2.objects.filter(id__in=contact_ids).only('id', 'entity_data'):
+            contact_names[c.id] = c.get_full_name()
+
+    if company_ids:
+        from companies_v2.models import CompanyV2
+        for c in CompanyV2.objects.filter(id__in=company_ids).only('id', 'entity_data'):
+            company_names[c.id] = c.get_name()
+
+    return contact_names, company_names
+
+
+def render_reminder(activity, contact_name=None, company_name=None) -> str:
+    due_str = (
+        activity.due_date.strftime('%B %d, %Y at %I:%M %p')
+        if activity.due_date else 'No due date'
+    )
+
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')
+    activity_url = f"{frontend_url}/activities-v2/{activity.activity_type}s/{activity.id}"
+
+    body = f"""Hi there,
+
+This is a reminder for your upcoming activity:
+
+Activity Type: {activity.activity_type.title()}
+Subject: {activity.subject}
+Due Date: {due_str}
+"""
+    if contact_name:
+        body += f"\nContact: {contact_name}"
+    if company_name:
+        body += f"\nCompany: {company_name}"
+    if activity.description:
+        body += f"\n\nDescription:\n{activity.description}"
+
+    body += f"\n\nView Activity: {activity_url}"
+    body += "\n\nBest regards,\nTrueValue CRM"
+    return body
+
+
+def _send_share(messages):
+    """Send ``[(activity_id, message)]`` over one SMTP connection; returns the sent ids."""
+    sent_ids = []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for activity_id, message in messages:
+            try:
+                if connection.send_messages([message]):
+                    sent_ids.append(activity_id)
+            except Exception as e:
+                logger.exception(f"Failed V2 reminder for activity {activity_id}: {e}")
+    except Exception as e:
+        logger.exception(f"Could not open SMTP connection for {len(messages)} reminder(s): {e}")
+    finally:
+        connection.close()
+    return sent_ids
+
+
+def send_messages_parallel(messages, threads=None) -> list:
+    """Split ``[(activity_id, message)]`` across a thread pool; returns the sent ids."""
+    if not messages:
+        return []
+    threads = max(1, min(threads or _setting('REMINDER_SEND_THREADS', DEFAULT_SEND_THREADS), len(messages)))
+    shares = [messages[i::threads] for i in range(threads)]
+    sent_ids = []
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='reminders') as pool:
+        for ids in pool.map(_send_share, shares):
+            sent_ids.extend(ids)
+    return sent_ids
+
+
+def dispatch_batch(activities) -> dict:
+    """Send one claimed batch and mark what was sent. Runs in the claiming transaction."""
+    contact_names, company_names = _names(activities)
+    emails = resolve_owner_emails(activities)
+    fallback_email = getattr(settings, 'REMINDER_FALLBACK_EMAIL', None)
+
+    messages = []
+    skipped = 0
+    for activity in activities:
+        owner_email = emails.get((activity.owner_id, activity.org_id)) or fallback_email
+        if not owner_email:
+            logger.warning(f"No email for owner {activity.owner_id}, skipping activity {activity.id}")
+            skipped += 1
+            continue
+        body = render_reminder(
+            activity,
+            contact_names.get(activity.contact_id),
+            company_names.get(activity.company_id),
+        )
+        messages.append((activity.id, EmailMessage(
+            subject=f"Reminder: {activity.subject}",
+            body=body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[owner_email],
+        )))
+
+    sent_ids = send_messages_parallel(messages)
+    if sent_ids:
+        ActivityV2.all_objects.filter(pk__in=sent_ids).update(reminder_sent=True)
+
+    return {'sent': len(sent_ids), 'failed': len(messages) - len(sent_ids), 'skipped': skipped}
+
+
+def dispatch_reminders(activity_ids, batch_size: int = None) -> dict:
+    """
+    Send the given reminders (popped from ``reminder_wheel``) if they are
+    still due and unsent; rows another worker holds are left to it.
+    """
+    batch_size = batch_size or _setting('REMINDER_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    activity_ids = list(activity_ids)
+    result = {'sent': 0, 'failed': 0, 'skipped': 0, 'total': 0}
+
+    for start in range(0, len(activity_ids), batch_size):
+        with transaction.atomic():
+            activities = list(
+                due_reminders(timezone.now() + DUE_SKEW)
+                .filter(pk__in=activity_ids[start:start + batch_size])
+                .select_for_update(skip_locked=True)
+                .only(*REMINDER_FIELDS)
+                .order_by('reminder_at', 'id')
+            )
+            if not activities:
+                continue
+            counts = dispatch_batch(activities)
+
+        result['total'] += len(activities)
+        for key, value in counts.items():
+            result[key] += value
+
+    return result
+
+
+def dispatch_due_reminders(lookahead_minutes: int = 0, batch_size: int = None) -> dict:
+    """Send every reminder due within ``lookahead_minutes`` that no other worker holds."""
+    batch_size = batch_size or _setting('REMINDER_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    lookahead_time = timezone.now() + timedelta(minutes=lookahead_minutes)
+    result = {'sent': 0, 'failed': 0, 'skipped': 0, 'total': 0}
+
+    after = None
+    while True:
+        with transaction.atomic():
+            activities = claim_batch(lookahead_time, batch_size, after)
+            if not activities:
+                break
+            counts = dispatch_batch(activities)
+
+        result['total'] += len(activities)
+        for key, value in counts.items():
+            result[key] += value
+        last = activities[-1]
+        after = (last.reminder_at, last.id)
+        if len(activities) < batch_size:
+            break
+
+    return result
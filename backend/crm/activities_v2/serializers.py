@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from .models import ActivityV2
+from crm.member_directory import resolve_member_name
+from crm_service.display_names import DisplayNameListSerializer, DisplayNameMixin
 
 
 class ActivityV2Serializer(serializers.ModelSerializer):
@@ -65,9 +67,7 @@ class ActivityV2Serializer(serializers.ModelSerializer):
         if not user_id:
             return ''
         try:
-            from crm.utils import fetch_member_names
-            members = fetch_member_names(str(org_id))
-            return members.get(str(user_id), '')
+            return resolve_member_name(org_id, user_id, self.context.get('request'))
         except Exception:
             return ''
 
@@ -130,7 +130,7 @@ class ActivityV2Serializer(serializers.ModelSerializer):
             return ''
 
 
-class ActivityV2ListSerializer(serializers.ModelSerializer):
+class ActivityV2ListSerializer(DisplayNameMixin, serializers.ModelSerializer):
     display_contact = serializers.SerializerMethodField()
     display_company = serializers.SerializerMethodField()
     display_assigned_to = serializers.SerializerMethodField()
@@ -150,39 +150,18 @@ class ActivityV2ListSerializer(serializers.ModelSerializer):
             'is_overdue',
             'created_at',
         ]
+        list_serializer_class = DisplayNameListSerializer
 
     def get_display_contact(self, obj):
-        if not obj.contact_id:
-            return ''
-        try:
-            from contacts_v2.models import ContactV2
-            contact = ContactV2.objects.filter(id=obj.contact_id, deleted_at__isnull=True).first()
-            if contact:
-                first = contact.entity_data.get('first_name', '')
-                last = contact.entity_data.get('last_name', '')
-                return f"{first} {last}".strip()
-            return ''
-        except Exception:
-            return ''
+        return self.display_names.contact_name(obj.contact_id)
 
     def get_display_company(self, obj):
-        if not obj.company_id:
-            return ''
-        try:
-            from companies_v2.models import CompanyV2
-            company = CompanyV2.objects.filter(id=obj.company_id, deleted_at__isnull=True).first()
-            if company:
-                return company.entity_data.get('name', '')
-            return ''
-        except Exception:
-            return ''
+        return self.display_names.company(obj.company_id)
 
     def get_display_assigned_to(self, obj):
         if not obj.assigned_to_id:
             return ''
         try:
-            from crm.utils import fetch_member_names
-            members = fetch_member_names(str(obj.org_id))
-            return members.get(str(obj.assigned_to_id), '')
+            return resolve_member_name(obj.org_id, obj.assigned_to_id, self.context.get('request'))
         except Exception:
             return ''
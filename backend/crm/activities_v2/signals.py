@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import ActivityV2
+from .reminder_wheel import is_pending, sync_activity
+
+REMINDER_FIELDS = ('reminder_at', 'reminder_sent', 'deleted_at', 'status')
+
+
+def _reminder_state(instance):
+    return (instance.reminder_at, is_pending(instance))
+
+
+def _schedule_wheel_sync(activity_id, reminder_at, pending):
+    transaction.on_commit(lambda: sync_activity(activity_id, reminder_at, pending))
+
+
+@receiver(post_init, sender=ActivityV2)
+def activity_loaded(sender, instance, **kwargs):
+    # Deferred loads (``only()``) skip the snapshot; their saves always sync.
+    if all(field in instance.__dict__ for field in REMINDER_FIELDS):
+        instance._reminder_state = _reminder_state(instance)
+
+
+@receiver(post_save, sender=ActivityV2)
+def activity_saved(sender, instance, created, **kwargs):
+    state = _reminder_state(instance)
+    previous = (None, False) if created else getattr(instance, '_reminder_state', None)
+    if state == previous:
+        return
+    instance._reminder_state = state
+    _schedule_wheel_sync(instance.id, *state)
+
+
+@receiver(post_delete, sender=ActivityV2)
+def activity_deleted(sender, instance, **kwargs):
+    if getattr(instance, '_reminder_state', (None, True))[1]:
+        _schedule_wheel_sync(instance.id, None, False)
@@ -4,8 +4,6 @@ import time as time_mod
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
-from django.http import HttpResponse
 from django.utils import timezone
 from django.db.models import Count, Q
 from django.db.models.functions import TruncDate
@@ -17,12 +15,16 @@ from .resources import ActivityV2ExportResource
 from crm_service.audit_v2 import AuditLogV2Mixin
 from crm.permissions import CRMResourcePermission
 from crm.services.base_service import AdvancedFilterMixin
-from crm.utils import fetch_member_names
+from crm.member_directory import get_member_names
+from crm.rollups import schedule_reconcile
+from crm_service.pagination import V2Pagination
+from crm_service.exports import stream_resource_csv
+from crm_service.export_jobs import handle_export_request
 
 EXPORT_MAX_ROWS = 10000
 
 
-class ActivityV2Pagination(PageNumberPagination):
+class ActivityV2Pagination(V2Pagination):
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -411,18 +413,18 @@ class ActivityV2ViewSet(AdvancedFilterMixin, AuditLogV2Mixin, viewsets.ModelView
         else:
             qs = self.get_queryset()
 
-        qs = qs[:EXPORT_MAX_ROWS]
-        member_map = fetch_member_names(org_id)
+        member_map = get_member_names(org_id, request)
         resource = ActivityV2ExportResource(member_map=member_map)
-        dataset = resource.export(list(qs))
         ts = time_mod.strftime('%Y-%m-%d')
 
         activity_type = request.query_params.get('activity_type', 'activities')
-        filename = f'{activity_type}-{ts}.csv'
+        base_name = f'{activity_type}-{ts}'
 
-        response = HttpResponse(dataset.csv, content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        return handle_export_request(
+            request, 'activity', qs,
+            lambda rows: stream_resource_csv(resource, rows, f'{base_name}.csv'),
+            max_rows=EXPORT_MAX_ROWS, base_name=base_name,
+        )
 
     @action(detail=False, methods=['post'])
     def bulk_delete(self, request):
@@ -461,5 +463,7 @@ class ActivityV2ViewSet(AdvancedFilterMixin, AuditLogV2Mixin, viewsets.ModelView
         count = ActivityV2.objects.filter(
             id__in=ids, org_id=org_id
         ).update(**safe_updates)
+        if count and 'status' in safe_updates:
+            schedule_reconcile(org_id)
 
         return Response({'updated': count})
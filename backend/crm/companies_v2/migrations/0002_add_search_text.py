@@ -0,0 +1,41 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from crm_service.search_index import build_search_text
+
+SEARCH_FIELDS = ('name', 'email', 'phone', 'website')
+
+
+def backfill_search_text(apps, schema_editor):
+    CompanyV2 = apps.get_model('companies_v2', 'CompanyV2')
+    batch = []
+    for obj in CompanyV2.objects.only('id', 'entity_data').iterator(chunk_size=1000):
+        obj.search_text = build_search_text(obj.entity_data, SEARCH_FIELDS)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            CompanyV2.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        CompanyV2.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_v2', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='companyv2',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='companyv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='companies_v2_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_v2', '0002_add_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companyv2',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='companyv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='companies_v2_search_fts_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from crm_service.search_index import backfill_search_vectors
+
+SEARCH_VECTOR_WEIGHTS = (
+    ('A', ('name',)),
+    ('B', ('email', 'website')),
+    ('C', ('phone',)),
+    ('D', ('description',)),
+)
+
+
+def backfill_search_vector(apps, schema_editor):
+    CompanyV2 = apps.get_model('companies_v2', 'CompanyV2')
+    backfill_search_vectors(CompanyV2, SEARCH_VECTOR_WEIGHTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies_v2', '0003_add_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
 import uuid
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 
+from crm_service.search_index import SearchIndexMixin
 
-class CompanyV2(models.Model):
+
+class CompanyV2(SearchIndexMixin, models.Model):
 
     class Status(models.TextChoices):
         ACTIVE = 'active', 'Active'
@@ -22,6 +26,14 @@ class CompanyV2(models.Model):
         ENTERPRISE = '501-1000', '501-1000'
         CORPORATE = '1000+', '1000+'
 
+    SEARCH_FIELDS = ('name', 'email', 'phone', 'website')
+    SEARCH_VECTOR_WEIGHTS = (
+        ('A', ('name',)),
+        ('B', ('email', 'website')),
+        ('C', ('phone',)),
+        ('D', ('description',)),
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     org_id = models.UUIDField(db_index=True)
 
@@ -51,6 +63,8 @@ class CompanyV2(models.Model):
     )
 
     entity_data = models.JSONField(default=dict, blank=True)
+    search_text = models.TextField(default='', blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -74,6 +88,15 @@ class CompanyV2(models.Model):
             models.Index(fields=['org_id', 'owner_id'], name='companies_v2_owner_idx'),
             models.Index(fields=['org_id', 'deleted_at'], name='companies_v2_deleted_idx'),
             models.Index(fields=['org_id', 'parent_company_id'], name='companies_v2_parent_idx'),
+            GinIndex(
+                name='companies_v2_search_trgm_idx',
+                fields=['search_text'],
+                opclasses=['gin_trgm_ops'],
+            ),
+            GinIndex(
+                name='companies_v2_search_fts_idx',
+                fields=['search_vector'],
+            ),
         ]
 
     def __str__(self):
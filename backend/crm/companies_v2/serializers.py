@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import CompanyV2
-from forms_v2.models import FormDefinition
+from forms_v2.uniqueness import check_unique, unique_violations
+from forms_v2.validation import get_form_validator
 from django.db import transaction
 
 
@@ -122,126 +123,14 @@ class CompanyV2Serializer(serializers.ModelSerializer):
         if not org_id:
             raise serializers.ValidationError("X-Org-Id header required")
 
-        form = FormDefinition.objects.filter(
-            org_id=org_id,
-            entity_type='company',
-            form_type='create',
-            is_default=True,
-            is_active=True
-        ).first()
-
-        if not form:
-            from forms_v2.default_schemas import get_default_company_schema
-            form = FormDefinition.objects.create(
-                org_id=org_id,
-                entity_type='company',
-                form_type='create',
-                name='Default Company Form',
-                description='Auto-generated default form for companies.',
-                is_default=True,
-                is_active=True,
-                schema=get_default_company_schema(),
-                created_by=getattr(request.user, 'id', None)
-            )
-
-        field_definitions = {}
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                field_name = field.get('name')
-                if field_name:
-                    field_definitions[field_name] = field
-
-        if not field_definitions:
+        validator = get_form_validator(
+            org_id, 'company', created_by=getattr(request.user, 'id', None)
+        )
+        if not validator.fields:
             raise serializers.ValidationError("No field definitions found in form schema.")
 
-        errors = {}
-
-        for field_name, field_def in field_definitions.items():
-            field_value = value.get(field_name)
-            field_label = field_def.get('label', field_name)
-            field_type = field_def.get('field_type')
-            is_required = field_def.get('is_required', False)
-            is_unique = field_def.get('is_unique', False)
-
-            if is_required:
-                if field_value is None or field_value == '':
-                    errors[field_name] = f"{field_label} is required"
-                    continue
-
-            if field_value is None or field_value == '':
-                continue
-
-            if is_unique and field_value:
-                from django.db.models import Q
-                existing_query = Q(**{f'entity_data__{field_name}': field_value})
-                existing = CompanyV2.objects.filter(
-                    org_id=org_id, deleted_at__isnull=True
-                ).filter(existing_query)
-
-                if self.instance:
-                    existing = existing.exclude(id=self.instance.id)
-
-                if existing.exists():
-                    errors[field_name] = f"{field_label} must be unique. This value already exists."
-                    continue
-
-            try:
-                if field_type in ['number', 'decimal', 'currency']:
-                    num_value = float(field_value) if not isinstance(field_value, (int, float)) else field_value
-                    validation = field_def.get('validation_rules', {})
-                    if 'min' in validation and num_value < validation['min']:
-                        errors[field_name] = f"{field_label} must be at least {validation['min']}"
-                    if 'max' in validation and num_value > validation['max']:
-                        errors[field_name] = f"{field_label} must be at most {validation['max']}"
-
-                elif field_type == 'email':
-                    if '@' not in str(field_value) or '.' not in str(field_value):
-                        errors[field_name] = f"{field_label} must be a valid email"
-
-                elif field_type == 'url':
-                    if not str(field_value).startswith(('http://', 'https://')):
-                        errors[field_name] = f"{field_label} must be a valid URL"
-
-                elif field_type == 'phone':
-                    if len(str(field_value).strip()) < 10:
-                        errors[field_name] = f"{field_label} must be a valid phone number"
-
-                elif field_type in ['select', 'radio']:
-                    options = field_def.get('options', {})
-                    valid_values = [opt['value'] for opt in options.get('options', [])]
-                    if valid_values and str(field_value) not in valid_values:
-                        errors[field_name] = f"{field_label} must be one of: {', '.join(valid_values)}"
-
-                elif field_type == 'multi_select':
-                    if not isinstance(field_value, list):
-                        errors[field_name] = f"{field_label} must be a list"
-                    else:
-                        options = field_def.get('options', {})
-                        valid_values = [opt['value'] for opt in options.get('options', [])]
-                        if valid_values:
-                            invalid = [v for v in field_value if str(v) not in valid_values]
-                            if invalid:
-                                errors[field_name] = f"{field_label} contains invalid values: {', '.join(map(str, invalid))}"
-
-                elif field_type == 'checkbox':
-                    if not isinstance(field_value, bool):
-                        errors[field_name] = f"{field_label} must be true or false"
-
-                elif field_type == 'text':
-                    validation = field_def.get('validation_rules', {})
-                    text_len = len(str(field_value))
-                    if 'min_length' in validation and text_len < validation['min_length']:
-                        errors[field_name] = f"{field_label} must be at least {validation['min_length']} characters"
-                    if 'max_length' in validation and text_len > validation['max_length']:
-                        errors[field_name] = f"{field_label} must be at most {validation['max_length']} characters"
-                    if 'pattern' in validation:
-                        import re
-                        if not re.match(validation['pattern'], str(field_value)):
-                            errors[field_name] = f"{field_label} format is invalid"
-
-            except Exception as e:
-                errors[field_name] = f"{field_label} validation error: {str(e)}"
-
+        conflicts = check_unique(CompanyV2, org_id, validator, value, instance=self.instance)
+        errors = validator.validate(value, conflicts=conflicts)
         if errors:
             raise serializers.ValidationError(errors)
 
@@ -249,13 +138,15 @@ class CompanyV2Serializer(serializers.ModelSerializer):
 
     @transaction.atomic
     def create(self, validated_data):
-        return CompanyV2.objects.create(**validated_data)
+        with unique_violations('company', validated_data.get('org_id')):
+            return CompanyV2.objects.create(**validated_data)
 
     @transaction.atomic
     def update(self, instance, validated_data):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        with unique_violations('company', instance.org_id):
+            instance.save()
         return instance
 
 
@@ -1,22 +1,26 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count, Sum, DecimalField
+from django.db.models.fields.json import KT
 from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django.http import HttpResponse
-import csv
 import json
 from uuid import UUID
 
 from .models import CompanyV2
 from .serializers import CompanyV2Serializer, CompanyV2ListSerializer
 from crm_service.audit_v2 import AuditLogV2Mixin
+from crm_service.bulk_actions import bulk_soft_delete, bulk_update_entities
+from crm_service.search_index import full_text_search
 from crm.permissions import CRMResourcePermission
+from crm_service.pagination import V2Pagination
+from crm_service.exports import CompanyCSVExport
+from crm_service.export_jobs import handle_export_request
+from crm_service.import_jobs import handle_import_request
 
 
-class CompanyV2Pagination(PageNumberPagination):
+class CompanyV2Pagination(V2Pagination):
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -40,7 +44,10 @@ class CompanyV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
         )
 
         search = self.request.query_params.get('search')
-        if search:
+        search_mode = self.request.query_params.get('mode')
+        if search and search_mode == 'fts':
+            queryset = full_text_search(queryset, search)
+        elif search:
             from forms_v2.models import FormDefinition
 
             form = FormDefinition.objects.filter(
@@ -160,9 +167,14 @@ class CompanyV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
 
         if sort_by in allowed_sort_fields:
             field = allowed_sort_fields[sort_by]
-            if sort_direction == 'desc':
+            if field.startswith('entity_data__'):
+                field = KT(field)
+                field = field.desc() if sort_direction == 'desc' else field.asc()
+            elif sort_direction == 'desc':
                 field = f'-{field}'
             queryset = queryset.order_by(field)
+        elif search and search_mode == 'fts':
+            queryset = queryset.order_by('-search_rank', '-created_at')
         else:
             queryset = queryset.order_by('-created_at')
 
@@ -244,12 +256,7 @@ class CompanyV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        deleted_by = request.user.id if hasattr(request, 'user') else None
-        companies = CompanyV2.objects.filter(id__in=company_ids, org_id=org_id, deleted_at__isnull=True)
-        count = 0
-        for company in companies:
-            company.soft_delete(deleted_by=deleted_by)
-            count += 1
+        count = bulk_soft_delete(CompanyV2, org_id, company_ids, request)
 
         return Response({
             'message': f'{count} companies deleted successfully',
@@ -287,23 +294,32 @@ class CompanyV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
             if field in data:
                 system_updates[field] = data[field]
 
-        companies = CompanyV2.objects.filter(
-            id__in=company_ids, org_id=org_id, deleted_at__isnull=True
+        count = bulk_update_entities(
+            CompanyV2, 'company', org_id, company_ids, system_updates, entity_data_updates, request
         )
-        count = 0
-        for company in companies:
-            for field, value in system_updates.items():
-                setattr(company, field, value)
-            if entity_data_updates:
-                company.entity_data.update(entity_data_updates)
-            company.save()
-            count += 1
 
         return Response({
             'message': f'{count} companies updated successfully',
             'count': count
         })
 
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_companies(self, request):
+        """
+        Bulk import companies from JSON list.
+        Request: {
+          "companies": [
+            { "name": "...", "website": "...", ... }
+          ],
+          "skip_duplicates": true,
+          "update_existing": false,
+          "duplicate_check_field": "name"
+        }
+        or multipart with a CSV/JSON ``file``. Uploads, and payloads over
+        IMPORT_SYNC_MAX_ROWS rows, run as an import job: 202 with its URL.
+        """
+        return handle_import_request(request, 'company', 'companies')
+
     @action(detail=False, methods=['get'])
     def export(self, request):
         org_id = request.headers.get('X-Org-Id')
@@ -326,58 +342,22 @@ class CompanyV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        EXPORT_MAX_ROWS = 50000
-        companies = list(queryset[:EXPORT_MAX_ROWS])
-
-        from forms_v2.models import FormDefinition
-        form = FormDefinition.objects.filter(
-            org_id=org_id, entity_type='company',
-            is_default=True, is_active=True
-        ).first()
-
-        if not form:
+        exporter = CompanyCSVExport.for_org(org_id)
+        if exporter is None:
             return Response(
                 {'error': 'No form definition found. Please configure company form first.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        db_column_fields = {
-            'status', 'industry', 'size', 'assigned_to', 'parent_company',
-        }
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="companies-{timezone.now().strftime("%Y-%m-%d")}.csv"'
-
-        writer = csv.writer(response)
-        headers = ['ID', 'Status', 'Industry', 'Size', 'Assigned To', 'Created At', 'Updated At']
-        field_names = []
-
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                if field['name'] not in db_column_fields:
-                    headers.append(field['label'])
-                    field_names.append(field['name'])
-
-        writer.writerow(headers)
-
-        for company in companies:
-            row = [
-                str(company.id),
-                company.status or '',
-                company.industry or '',
-                company.size or '',
-                str(company.assigned_to_id) if company.assigned_to_id else '',
-                company.created_at.strftime('%Y-%m-%d %H:%M:%S') if company.created_at else '',
-                company.updated_at.strftime('%Y-%m-%d %H:%M:%S') if company.updated_at else '',
-            ]
-            for field_name in field_names:
-                value = company.entity_data.get(field_name, '')
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                row.append(str(value) if value is not None else '')
-            writer.writerow(row)
-
-        return response
+        # Rows are streamed from a server-side cursor, chunk by chunk; larger
+        # exports (or ?async=true) run as an export job instead.
+        EXPORT_MAX_ROWS = 50000
+        base_name = f'companies-{timezone.now().strftime("%Y-%m-%d")}'
+        return handle_export_request(
+            request, 'company', queryset,
+            lambda qs: exporter.response(qs, f'{base_name}.csv'),
+            max_rows=EXPORT_MAX_ROWS, base_name=base_name,
+        )
 
     @action(detail=False, methods=['post'])
     def check_duplicate(self, request):
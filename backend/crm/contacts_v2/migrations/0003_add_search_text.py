@@ -0,0 +1,41 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from crm_service.search_index import build_search_text
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'phone')
+
+
+def backfill_search_text(apps, schema_editor):
+    ContactV2 = apps.get_model('contacts_v2', 'ContactV2')
+    batch = []
+    for obj in ContactV2.objects.only('id', 'entity_data').iterator(chunk_size=1000):
+        obj.search_text = build_search_text(obj.entity_data, SEARCH_FIELDS)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            ContactV2.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        ContactV2.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts_v2', '0002_add_contact_company_m2m'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='contactv2',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='contactv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='contacts_v2_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts_v2', '0003_add_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactv2',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='contactv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='contacts_v2_search_fts_idx'),
+        ),
+    ]
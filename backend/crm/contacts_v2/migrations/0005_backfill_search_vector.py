@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from crm_service.search_index import backfill_search_vectors
+
+SEARCH_VECTOR_WEIGHTS = (
+    ('A', ('first_name', 'last_name')),
+    ('B', ('email', 'secondary_email')),
+    ('C', ('phone', 'mobile')),
+    ('D', ('title', 'description')),
+)
+
+
+def backfill_search_vector(apps, schema_editor):
+    ContactV2 = apps.get_model('contacts_v2', 'ContactV2')
+    backfill_search_vectors(ContactV2, SEARCH_VECTOR_WEIGHTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts_v2', '0004_add_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
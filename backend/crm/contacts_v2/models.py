@@ -1,9 +1,13 @@
 import uuid
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 
+from crm_service.search_index import SearchIndexMixin
 
-class ContactV2(models.Model):
+
+class ContactV2(SearchIndexMixin, models.Model):
 
     class Status(models.TextChoices):
         ACTIVE = 'active', 'Active'
@@ -26,6 +30,14 @@ class ContactV2(models.Model):
         IMPORT = 'import', 'Data Import'
         OTHER = 'other', 'Other'
 
+    SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'phone')
+    SEARCH_VECTOR_WEIGHTS = (
+        ('A', ('first_name', 'last_name')),
+        ('B', ('email', 'secondary_email')),
+        ('C', ('phone', 'mobile')),
+        ('D', ('title', 'description')),
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     org_id = models.UUIDField(db_index=True)
 
@@ -54,6 +66,8 @@ class ContactV2(models.Model):
     )
 
     entity_data = models.JSONField(default=dict, blank=True)
+    search_text = models.TextField(default='', blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     converted_from_lead_id = models.UUIDField(null=True, blank=True)
     converted_at = models.DateTimeField(null=True, blank=True)
@@ -83,6 +97,15 @@ class ContactV2(models.Model):
             models.Index(fields=['org_id', 'company_id'], name='contacts_v2_company_idx'),
             models.Index(fields=['org_id', 'owner_id'], name='contacts_v2_owner_idx'),
             models.Index(fields=['org_id', 'deleted_at'], name='contacts_v2_deleted_idx'),
+            GinIndex(
+                name='contacts_v2_search_trgm_idx',
+                fields=['search_text'],
+                opclasses=['gin_trgm_ops'],
+            ),
+            GinIndex(
+                name='contacts_v2_search_fts_idx',
+                fields=['search_vector'],
+            ),
         ]
 
     def __str__(self):
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from .models import ContactV2, ContactCompanyV2
-from forms_v2.models import FormDefinition
+from forms_v2.uniqueness import check_unique, unique_violations
+from forms_v2.validation import get_form_validator
 from companies_v2.models import CompanyV2
+from crm_service.display_names import DisplayNameListSerializer, DisplayNameMixin
 from django.db import transaction
 
 
@@ -145,127 +147,14 @@ class ContactV2Serializer(serializers.ModelSerializer):
         if not org_id:
             raise serializers.ValidationError("X-Org-Id header required")
 
-        form = FormDefinition.objects.filter(
-            org_id=org_id,
-            entity_type='contact',
-            form_type='create',
-            is_default=True,
-            is_active=True
-        ).first()
-
-        if not form:
-            from forms_v2.default_schemas import get_default_contact_schema
-
-            form = FormDefinition.objects.create(
-                org_id=org_id,
-                entity_type='contact',
-                form_type='create',
-                name='Default Contact Form',
-                description='Auto-generated default form for contacts.',
-                is_default=True,
-                is_active=True,
-                schema=get_default_contact_schema(),
-                created_by=getattr(request.user, 'id', None)
-            )
-
-        field_definitions = {}
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                field_name = field.get('name')
-                if field_name:
-                    field_definitions[field_name] = field
-
-        if not field_definitions:
+        validator = get_form_validator(
+            org_id, 'contact', created_by=getattr(request.user, 'id', None)
+        )
+        if not validator.fields:
             raise serializers.ValidationError("No field definitions found in form schema.")
 
-        errors = {}
-
-        for field_name, field_def in field_definitions.items():
-            field_value = value.get(field_name)
-            field_label = field_def.get('label', field_name)
-            field_type = field_def.get('field_type')
-            is_required = field_def.get('is_required', False)
-            is_unique = field_def.get('is_unique', False)
-
-            if is_required:
-                if field_value is None or field_value == '':
-                    errors[field_name] = f"{field_label} is required"
-                    continue
-
-            if field_value is None or field_value == '':
-                continue
-
-            if is_unique and field_value:
-                from django.db.models import Q
-                existing_query = Q(**{f'entity_data__{field_name}': field_value})
-                existing = ContactV2.objects.filter(
-                    org_id=org_id, deleted_at__isnull=True
-                ).filter(existing_query)
-
-                if self.instance:
-                    existing = existing.exclude(id=self.instance.id)
-
-                if existing.exists():
-                    errors[field_name] = f"{field_label} must be unique. This value already exists."
-                    continue
-
-            try:
-                if field_type in ['number', 'decimal']:
-                    num_value = float(field_value) if not isinstance(field_value, (int, float)) else field_value
-                    validation = field_def.get('validation_rules', {})
-                    if 'min' in validation and num_value < validation['min']:
-                        errors[field_name] = f"{field_label} must be at least {validation['min']}"
-                    if 'max' in validation and num_value > validation['max']:
-                        errors[field_name] = f"{field_label} must be at most {validation['max']}"
-
-                elif field_type == 'email':
-                    if '@' not in str(field_value) or '.' not in str(field_value):
-                        errors[field_name] = f"{field_label} must be a valid email"
-
-                elif field_type == 'url':
-                    if not str(field_value).startswith(('http://', 'https://')):
-                        errors[field_name] = f"{field_label} must be a valid URL"
-
-                elif field_type == 'phone':
-                    if len(str(field_value).strip()) < 10:
-                        errors[field_name] = f"{field_label} must be a valid phone number"
-
-                elif field_type in ['select', 'radio']:
-                    options = field_def.get('options', {})
-                    valid_values = [opt['value'] for opt in options.get('options', [])]
-                    if valid_values and str(field_value) not in valid_values:
-                        errors[field_name] = f"{field_label} must be one of: {', '.join(valid_values)}"
-
-                elif field_type == 'multi_select':
-                    if not isinstance(field_value, list):
-                        errors[field_name] = f"{field_label} must be a list"
-                    else:
-                        options = field_def.get('options', {})
-                        valid_values = [opt['value'] for opt in options.get('options', [])]
-                        if valid_values:
-                            invalid = [v for v in field_value if str(v) not in valid_values]
-                            if invalid:
-                                errors[field_name] = f"{field_label} contains invalid values: {', '.join(map(str, invalid))}"
-
-                elif field_type == 'checkbox':
-                    if not isinstance(field_value, bool):
-                        errors[field_name] = f"{field_label} must be true or false"
-
-                elif field_type == 'text':
-                    validation = field_def.get('validation_rules', {})
-                    text_len = len(str(field_value))
-                    if 'min_length' in validation and text_len < validation['min_length']:
-                        errors[field_name] = f"{field_label} must be at least {validation['min_length']} characters"
-                    if 'max_length' in validation and text_len > validation['max_length']:
-                        errors[field_name] = f"{field_label} must be at most {validation['max_length']} characters"
-                    if 'pattern' in validation:
-                        import re
-                        if not re.match(validation['pattern'], str(field_value)):
-                            errors[field_name] = f"{field_label} format is invalid"
-
-            except Exception as e:
-                errors[field_name] = f"{field_label} validation error: {str(e)}"
-
+        conflicts = check_unique(ContactV2, org_id, validator, value, instance=self.instance)
+        errors = validator.validate(value, conflicts=conflicts)
         if errors:
             raise serializers.ValidationError(errors)
 
@@ -274,7 +163,8 @@ class ContactV2Serializer(serializers.ModelSerializer):
     @transaction.atomic
     def create(self, validated_data):
         company_id = validated_data.get('company_id')
-        contact = ContactV2.objects.create(**validated_data)
+        with unique_violations('contact', validated_data.get('org_id')):
+            contact = ContactV2.objects.create(**validated_data)
 
         if company_id:
             company = CompanyV2.objects.filter(id=company_id).first()
@@ -299,7 +189,8 @@ class ContactV2Serializer(serializers.ModelSerializer):
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        with unique_violations('contact', instance.org_id):
+            instance.save()
 
         if new_company_id and new_company_id != old_company_id:
             ContactCompanyV2.objects.filter(
@@ -323,15 +214,13 @@ class ContactV2Serializer(serializers.ModelSerializer):
         return instance
 
 
-class ContactV2ListSerializer(serializers.ModelSerializer):
+class ContactV2ListSerializer(DisplayNameMixin, serializers.ModelSerializer):
 
     display_name = serializers.SerializerMethodField()
     display_email = serializers.SerializerMethodField()
     display_company = serializers.SerializerMethodField()
     display_phone = serializers.SerializerMethodField()
 
-    _company_cache = None
-
     class Meta:
         model = ContactV2
         fields = [
@@ -341,19 +230,7 @@ class ContactV2ListSerializer(serializers.ModelSerializer):
             'display_name', 'display_email',
             'display_company', 'display_phone',
         ]
-
-    def _get_company_cache(self):
-        if self._company_cache is None:
-            if hasattr(self.instance, '__iter__') and not isinstance(self.instance, dict):
-                company_ids = {obj.company_id for obj in self.instance if obj.company_id}
-            else:
-                company_ids = {self.instance.company_id} if self.instance and self.instance.company_id else set()
-            if company_ids:
-                companies = CompanyV2.objects.filter(id__in=company_ids).only('id', 'entity_data')
-                self._company_cache = {c.id: c.get_name() for c in companies}
-            else:
-                self._company_cache = {}
-        return self._company_cache
+        list_serializer_class = DisplayNameListSerializer
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -382,9 +259,7 @@ class ContactV2ListSerializer(serializers.ModelSerializer):
         return obj.entity_data.get('email', 'N/A')
 
     def get_display_company(self, obj):
-        if obj.company_id:
-            return self._get_company_cache().get(obj.company_id, 'N/A')
-        return 'N/A'
+        return self.display_names.company_including_deleted(obj.company_id, 'N/A')
 
     def get_display_phone(self, obj):
         return obj.entity_data.get('phone', '') or obj.entity_data.get('mobile', 'N/A')
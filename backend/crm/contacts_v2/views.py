@@ -1,11 +1,9 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count
+from django.db.models.fields.json import KT
 from django.utils import timezone
-from django.http import HttpResponse
-import csv
 import json
 from uuid import UUID
 
@@ -15,10 +13,16 @@ from .serializers import (
     ContactCompanyV2Serializer, ContactCompanyV2WriteSerializer,
 )
 from crm_service.audit_v2 import AuditLogV2Mixin
+from crm_service.bulk_actions import bulk_soft_delete, bulk_update_entities
+from crm_service.search_index import full_text_search
 from crm.permissions import CRMResourcePermission
+from crm_service.pagination import V2Pagination
+from crm_service.exports import ContactCSVExport
+from crm_service.export_jobs import handle_export_request
+from crm_service.import_jobs import handle_import_request
 
 
-class ContactV2Pagination(PageNumberPagination):
+class ContactV2Pagination(V2Pagination):
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -42,7 +46,10 @@ class ContactV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
         )
 
         search = self.request.query_params.get('search')
-        if search:
+        search_mode = self.request.query_params.get('mode')
+        if search and search_mode == 'fts':
+            queryset = full_text_search(queryset, search)
+        elif search:
             from forms_v2.models import FormDefinition
 
             form = FormDefinition.objects.filter(
@@ -161,9 +168,14 @@ class ContactV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
 
         if sort_by in allowed_sort_fields:
             field = allowed_sort_fields[sort_by]
-            if sort_direction == 'desc':
+            if field.startswith('entity_data__'):
+                field = KT(field)
+                field = field.desc() if sort_direction == 'desc' else field.asc()
+            elif sort_direction == 'desc':
                 field = f'-{field}'
             queryset = queryset.order_by(field)
+        elif search and search_mode == 'fts':
+            queryset = queryset.order_by('-search_rank', '-created_at')
         else:
             queryset = queryset.order_by('-created_at')
 
@@ -246,12 +258,7 @@ class ContactV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        deleted_by = request.user.id if hasattr(request, 'user') else None
-        contacts = ContactV2.objects.filter(id__in=contact_ids, org_id=org_id, deleted_at__isnull=True)
-        count = 0
-        for contact in contacts:
-            contact.soft_delete(deleted_by=deleted_by)
-            count += 1
+        count = bulk_soft_delete(ContactV2, org_id, contact_ids, request)
 
         return Response({
             'message': f'{count} contacts deleted successfully',
@@ -289,17 +296,9 @@ class ContactV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
             if field in data:
                 system_updates[field] = data[field]
 
-        contacts = ContactV2.objects.filter(
-            id__in=contact_ids, org_id=org_id, deleted_at__isnull=True
+        count = bulk_update_entities(
+            ContactV2, 'contact', org_id, contact_ids, system_updates, entity_data_updates, request
         )
-        count = 0
-        for contact in contacts:
-            for field, value in system_updates.items():
-                setattr(contact, field, value)
-            if entity_data_updates:
-                contact.entity_data.update(entity_data_updates)
-            contact.save()
-            count += 1
 
         return Response({
             'message': f'{count} contacts updated successfully',
@@ -328,73 +327,22 @@ class ContactV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        EXPORT_MAX_ROWS = 50000
-        contacts = list(queryset[:EXPORT_MAX_ROWS])
-
-        from forms_v2.models import FormDefinition
-        form = FormDefinition.objects.filter(
-            org_id=org_id, entity_type='contact',
-            is_default=True, is_active=True
-        ).first()
-
-        if not form:
+        exporter = ContactCSVExport.for_org(org_id)
+        if exporter is None:
             return Response(
                 {'error': 'No form definition found. Please configure contact form first.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        db_column_fields = {
-            'status', 'source', 'assigned_to', 'company',
-            'do_not_call', 'do_not_email',
-        }
-
-        from companies_v2.models import CompanyV2
-        company_ids = {c.company_id for c in contacts if c.company_id}
-        company_names = {}
-        if company_ids:
-            companies = CompanyV2.objects.filter(id__in=company_ids).only('id', 'entity_data')
-            company_names = {c.id: c.get_name() for c in companies}
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="contacts-{timezone.now().strftime("%Y-%m-%d")}.csv"'
-
-        writer = csv.writer(response)
-        headers = ['ID', 'Status', 'Source', 'Company', 'Assigned To',
-                    'Do Not Call', 'Do Not Email', 'Created At', 'Updated At']
-        field_names = []
-
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                if field['name'] not in db_column_fields:
-                    headers.append(field['label'])
-                    field_names.append(field['name'])
-
-        writer.writerow(headers)
-
-        for contact in contacts:
-            company_display = ''
-            if contact.company_id:
-                company_display = company_names.get(contact.company_id, str(contact.company_id))
-
-            row = [
-                str(contact.id),
-                contact.status or '',
-                contact.source or '',
-                company_display,
-                str(contact.assigned_to_id) if contact.assigned_to_id else '',
-                'Yes' if contact.do_not_call else 'No',
-                'Yes' if contact.do_not_email else 'No',
-                contact.created_at.strftime('%Y-%m-%d %H:%M:%S') if contact.created_at else '',
-                contact.updated_at.strftime('%Y-%m-%d %H:%M:%S') if contact.updated_at else '',
-            ]
-            for field_name in field_names:
-                value = contact.entity_data.get(field_name, '')
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                row.append(str(value) if value is not None else '')
-            writer.writerow(row)
-
-        return response
+        # Rows are streamed from a server-side cursor, chunk by chunk; larger
+        # exports (or ?async=true) run as an export job instead.
+        EXPORT_MAX_ROWS = 50000
+        base_name = f'contacts-{timezone.now().strftime("%Y-%m-%d")}'
+        return handle_export_request(
+            request, 'contact', queryset,
+            lambda qs: exporter.response(qs, f'{base_name}.csv'),
+            max_rows=EXPORT_MAX_ROWS, base_name=base_name,
+        )
 
     @action(detail=False, methods=['post'])
     def check_duplicate(self, request):
@@ -634,82 +582,10 @@ class ContactV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
           "update_existing": false,
           "duplicate_check_field": "email"
         }
+        or multipart with a CSV/JSON ``file``. Uploads, and payloads over
+        IMPORT_SYNC_MAX_ROWS rows, run as an import job: 202 with its URL.
         """
-        org_id = request.headers.get('X-Org-Id')
-        if not org_id:
-            return Response(
-                {'error': 'X-Org-Id header required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        contacts_data = request.data.get('contacts', [])
-        if not contacts_data:
-            return Response(
-                {'error': 'contacts list is required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        skip_duplicates = request.data.get('skip_duplicates', True)
-        update_existing = request.data.get('update_existing', False)
-        dup_field = request.data.get('duplicate_check_field', 'email')
-
-        system_fields = {'status', 'source', 'assigned_to', 'company', 'do_not_call', 'do_not_email'}
-        user_id = request.user.id if hasattr(request, 'user') else None
-
-        results = {'total': len(contacts_data), 'created': 0, 'updated': 0, 'skipped': 0, 'errors': []}
-
-        for i, row in enumerate(contacts_data):
-            try:
-                if not row.get('first_name') and not row.get('email'):
-                    results['errors'].append({'row': i + 1, 'error': 'first_name or email is required'})
-                    continue
-
-                check_value = row.get(dup_field)
-                if check_value:
-                    existing = ContactV2.objects.filter(
-                        org_id=org_id,
-                        deleted_at__isnull=True,
-                        **{f'entity_data__{dup_field}__iexact': check_value}
-                    ).first()
-
-                    if existing:
-                        if update_existing:
-                            for key, val in row.items():
-                                if key in system_fields:
-                                    continue
-                                existing.entity_data[key] = val
-                            if 'status' in row and row['status'] in dict(ContactV2.Status.choices):
-                                existing.status = row['status']
-                            if 'source' in row and row['source'] in dict(ContactV2.Source.choices):
-                                existing.source = row['source']
-                            existing.save(update_fields=['entity_data', 'status', 'source', 'updated_at'])
-                            results['updated'] += 1
-                        elif skip_duplicates:
-                            results['skipped'] += 1
-                        else:
-                            results['errors'].append({
-                                'row': i + 1,
-                                'error': f'Duplicate {dup_field}: {check_value}'
-                            })
-                        continue
-
-                entity_data = {k: v for k, v in row.items() if k not in system_fields}
-                kwargs = {
-                    'org_id': org_id,
-                    'owner_id': user_id or org_id,
-                    'source': ContactV2.Source.IMPORT,
-                    'entity_data': entity_data,
-                }
-                if 'status' in row and row['status'] in dict(ContactV2.Status.choices):
-                    kwargs['status'] = row['status']
-
-                ContactV2.objects.create(**kwargs)
-                results['created'] += 1
-
-            except Exception as e:
-                results['errors'].append({'row': i + 1, 'error': str(e)})
-
-        return Response(results, status=status.HTTP_200_OK)
+        return handle_import_request(request, 'contact', 'contacts')
 
     @action(detail=False, methods=['post'])
     def merge(self, request):
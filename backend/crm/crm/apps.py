@@ -7,4 +7,5 @@ class CrmConfig(AppConfig):
     verbose_name = 'CRM'
     
     def ready(self):
-        pass
+        from .rollups import connect_signals
+        connect_signals()
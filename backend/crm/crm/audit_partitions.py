@@ -0,0 +1,199 @@
+"""
+Monthly partitions and retention for ``crm_audit_logs``.
+
+The audit table is range-partitioned on ``created_at``, one partition per
+UTC month (``crm_audit_logs_pYYYYMM``) plus a DEFAULT partition
+(migration 0007). ``maintain_partitions`` — run daily by
+``crm.tasks.maintain_audit_partitions`` and by
+``manage.py audit_partitions`` — does two things:
+
+- creates the partitions for the next ``AUDIT_LOG_PARTITIONS_AHEAD``
+  months, moving any rows the DEFAULT partition caught for them;
+- applies retention. Orgs keep entries for their ``AuditRetentionPolicy``
+  or ``AUDIT_LOG_RETENTION_DAYS``. A month partition past the longest
+  retention of any org is detached whole (renamed
+  ``crm_audit_logs_archive_pYYYYMM``) or dropped when
+  ``AUDIT_LOG_DROP_EXPIRED`` is set; entries of orgs with a shorter
+  retention are deleted from the partitions still attached.
+
+``retention_cutoff`` gives readers the oldest timestamp worth scanning for
+an org, so audit listings prune the partitions it can't have rows in.
+"""
+import logging
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AuditRetentionPolicy, CRMAuditLog
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = 'crm_audit_logs'
+DEFAULT_PARTITION = f'{PARENT_TABLE}_default'
+PARTITION_RE = re.compile(rf'^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$')
+
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_PARTITIONS_AHEAD = 3
+
+
+def _setting(name, default):
+    return settings.CRM_SETTINGS.get(name, default)
+
+
+def month_start(value: datetime) -> datetime:
+    value = value.astimezone(dt_timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f'{PARENT_TABLE}_p{month:%Y%m}'
+
+
+def attached_partitions() -> dict:
+    """{month start: partition name} for the monthly partitions currently attached."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [PARENT_TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            month = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+            partitions[month] = name
+    return partitions
+
+
+def create_partition(month: datetime):
+    """
+    Create and attach one month's partition. Rows the DEFAULT partition
+    already holds for that month are moved into it first, since Postgres
+    refuses to attach a range the DEFAULT partition has rows for.
+    """
+    name = partition_name(month)
+    lower, upper = month, add_months(month, 1)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)')
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= %s AND created_at < %s
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """,
+            [lower, upper],
+        )
+        # DDL takes no bind parameters; the bounds are our own timestamps.
+        cursor.execute(
+            f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    logger.info(f"Created audit log partition {name}")
+
+
+def ensure_partitions(months_ahead: int = None, now: datetime = None) -> list:
+    """Create any missing partitions from the current month to ``months_ahead`` ahead."""
+    if months_ahead is None:
+        months_ahead = _setting('AUDIT_LOG_PARTITIONS_AHEAD', DEFAULT_PARTITIONS_AHEAD)
+    current = month_start(now or timezone.now())
+    existing = attached_partitions()
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            create_partition(month)
+            created.append(partition_name(month))
+    return created
+
+
+def retention_policies() -> dict:
+    return dict(AuditRetentionPolicy.objects.values_list('org_id', 'retention_days'))
+
+
+def retention_days(org_id) -> int:
+    policy = AuditRetentionPolicy.objects.filter(org_id=org_id).values_list('retention_days', flat=True).first()
+    return policy or _setting('AUDIT_LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+
+
+def retention_cutoff(org_id, now: datetime = None) -> datetime:
+    """Oldest ``created_at`` an org's audit entries are kept for."""
+    return (now or timezone.now()) - timedelta(days=retention_days(org_id))
+
+
+def expire_partitions(horizon: datetime) -> list:
+    """Detach (archive) or drop the month partitions entirely older than ``horizon``."""
+    drop = bool(_setting('AUDIT_LOG_DROP_EXPIRED', 0))
+    expired = []
+    for month, name in sorted(attached_partitions().items()):
+        if add_months(month, 1) > horizon:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+            else:
+                archive = name.replace(f'{PARENT_TABLE}_p', f'{PARENT_TABLE}_archive_p')
+                cursor.execute(f'ALTER TABLE "{name}" RENAME TO "{archive}"')
+        logger.info(f"{'Dropped' if drop else 'Archived'} audit log partition {name}")
+        expired.append(name)
+    return expired
+
+
+def delete_expired_rows(policies: dict, now: datetime) -> int:
+    """
+    Delete entries past their org's retention from the partitions still
+    attached. Each DELETE is bounded by ``created_at``, so it only touches
+    the partitions before that cutoff.
+    """
+    default_days = _setting('AUDIT_LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    deleted = 0
+
+    by_days = {}
+    for org_id, days in policies.items():
+        by_days.setdefault(days, []).append(org_id)
+    for days, org_ids in by_days.items():
+        deleted += CRMAuditLog.objects.filter(
+            org_id__in=org_ids, created_at__lt=now - timedelta(days=days),
+        ).delete()[0]
+
+    deleted += CRMAuditLog.objects.filter(
+        created_at__lt=now - timedelta(days=default_days),
+    ).exclude(org_id__in=list(policies)).delete()[0]
+    return deleted
+
+
+def apply_retention(now: datetime = None) -> dict:
+    now = now or timezone.now()
+    policies = retention_policies()
+    default_days = _setting('AUDIT_LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    longest = max([default_days, *policies.values()])
+
+    expired = expire_partitions(now - timedelta(days=longest))
+    deleted = delete_expired_rows(policies, now)
+    return {'expired_partitions': expired, 'deleted_rows': deleted}
+
+
+def maintain_partitions(months_ahead: int = None, retention: bool = True) -> dict:
+    result = {'created_partitions': ensure_partitions(months_ahead)}
+    if retention:
+        result.update(apply_retention())
+    return result
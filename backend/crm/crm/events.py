@@ -1,28 +1,117 @@
-import json
+"""
+Kafka event publishing through a transactional outbox.
+
+``publish_event`` never talks to the broker. It stores the event in
+``crm_event_outbox`` inside the caller's transaction, so an event exists
+exactly when the change it describes commits and a request thread never
+waits on Kafka. ``crm.outbox`` relays the table in large batches with the
+producer from ``get_producer`` — idempotent, compressed, with linger and
+batch sizes tuned for throughput — from the ``relay_events`` command or the
+``crm.tasks.relay_event_outbox`` task, which each commit nudges.
+
+Delivery reports feed ``delivery_metrics`` (per-topic counts, bytes and
+broker latency). Whatever the producer still buffers is flushed when the
+process exits or a Celery worker shuts down. ``KAFKA_PRODUCER_BACKEND=memory``
+swaps in the in-process broker of ``crm.kafka_memory``.
+"""
+import atexit
 import logging
+import threading
 from typing import Dict, Any, Optional
 from uuid import UUID
 from datetime import datetime
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
+RELAY_NUDGE_KEY = 'event_outbox:nudge'
+
 _producer = None
 
 
+class DeliveryMetrics:
+    """Running totals of delivery reports, per topic."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._topics = {}
+
+    def _totals(self, topic):
+        return self._topics.setdefault(topic, {
+            'delivered': 0, 'failed': 0, 'dead_lettered': 0, 'bytes': 0,
+            'latency_total': 0.0, 'latency_max': 0.0,
+        })
+
+    def record_dead_letters(self, topic, count: int):
+        with self._lock:
+            self._totals(topic)['dead_lettered'] += count
+
+    def record(self, err, msg):
+        latency = msg.latency() if msg is not None else None
+        with self._lock:
+            totals = self._totals(msg.topic() if msg is not None else None)
+            if err is not None:
+                totals['failed'] += 1
+                return
+            totals['delivered'] += 1
+            totals['bytes'] += len(msg.value() or b'')
+            if latency is not None:
+                totals['latency_total'] += latency
+                totals['latency_max'] = max(totals['latency_max'], latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for topic, totals in self._topics.items():
+                delivered = totals['delivered']
+                result[topic] = {
+                    'delivered': delivered,
+                    'failed': totals['failed'],
+                    'dead_lettered': totals['dead_lettered'],
+                    'bytes': totals['bytes'],
+                    'avg_latency_ms': round(totals['latency_total'] * 1000 / delivered, 2) if delivered else None,
+                    'max_latency_ms': round(totals['latency_max'] * 1000, 2),
+                }
+            return result
+
+
+delivery_metrics = DeliveryMetrics()
+
+
+def producer_config() -> Dict[str, Any]:
+    return {
+        'bootstrap.servers': settings.KAFKA_BOOTSTRAP_SERVERS,
+        'client.id': 'crm-service',
+        'enable.idempotence': True,
+        'acks': 'all',
+        'compression.type': settings.KAFKA_PRODUCER_COMPRESSION,
+        'linger.ms': settings.KAFKA_PRODUCER_LINGER_MS,
+        'batch.size': settings.KAFKA_PRODUCER_BATCH_BYTES,
+        'batch.num.messages': settings.KAFKA_PRODUCER_BATCH_MESSAGES,
+        'queue.buffering.max.messages': settings.KAFKA_PRODUCER_QUEUE_MAX_MESSAGES,
+    }
+
+
 def get_producer():
-    """Get or create Kafka producer."""
+    """Get or create the Kafka producer the outbox relay publishes with."""
     global _producer
     
     if _producer is None:
         try:
-            from confluent_kafka import Producer
+            if settings.KAFKA_PRODUCER_BACKEND == 'memory':
+                from .kafka_memory import InMemoryProducer as Producer
+            else:
+                from confluent_kafka import Producer
             
-            _producer = Producer({
-                'bootstrap.servers': settings.KAFKA_BOOTSTRAP_SERVERS,
-                'client.id': 'crm-service',
-            })
+            _producer = Producer(producer_config())
+            atexit.register(flush_events, settings.KAFKA_PRODUCER_SHUTDOWN_TIMEOUT)
             logger.info("Kafka producer initialized")
         except Exception as e:
             logger.warning(f"Failed to initialize Kafka producer: {e}")
@@ -31,7 +120,7 @@ def get_producer():
     return _producer
 
 
-def publish_event(
+def build_event(
     topic: str,
     event_type: str,
     data: Dict[str, Any],
@@ -40,23 +129,9 @@ def publish_event(
     entity_type: str = None,
     entity_id: UUID = None,
 ):
-    """
-    Publish an event to Kafka.
-    
-    Args:
-        topic: Kafka topic name
-        event_type: Type of event (e.g., 'contact.created')
-        data: Event payload
-        org_id: Organization ID
-        user_id: User who triggered the event
-        entity_type: Type of entity (contact, company, deal, etc.)
-        entity_id: ID of the entity
-    """
-    producer = get_producer()
-    if producer is None:
-        logger.debug(f"Skipping event publish (no producer): {event_type}")
-        return
-    
+    """An unsaved outbox row for one event; see ``publish_event`` for the arguments."""
+    from .models import EventOutbox
+
     event = {
         'event_type': event_type,
         'source_service': 'crm-service',
@@ -72,25 +147,55 @@ def publish_event(
         event['entity_type'] = entity_type
     if entity_id:
         event['entity_id'] = str(entity_id)
+
+    return EventOutbox(topic=topic, key=str(org_id) if org_id else None, payload=event)
+
+
+def publish_events(events):
+    """Queue outbox rows built with ``build_event`` in the current transaction."""
+    from .models import EventOutbox
+
+    if not events:
+        return
+    EventOutbox.objects.bulk_create(events, batch_size=1000)
+    transaction.on_commit(_nudge_relay)
+
+
+def publish_event(
+    topic: str,
+    event_type: str,
+    data: Dict[str, Any],
+    org_id: UUID = None,
+    user_id: UUID = None,
+    entity_type: str = None,
+    entity_id: UUID = None,
+):
+    """
+    Queue an event for Kafka; it is published once the current transaction
+    commits and is dropped if it rolls back.
     
-    try:
-        producer.produce(
-            topic,
-            key=str(org_id) if org_id else None,
-            value=json.dumps(event).encode('utf-8'),
-            callback=_delivery_callback,
-        )
-        producer.poll(0)
-    except Exception as e:
-        logger.error(f"Failed to publish event {event_type}: {e}")
+    Args:
+        topic: Kafka topic name
+        event_type: Type of event (e.g., 'contact.created')
+        data: Event payload
+        org_id: Organization ID
+        user_id: User who triggered the event
+        entity_type: Type of entity (contact, company, deal, etc.)
+        entity_id: ID of the entity
+    """
+    publish_events([
+        build_event(topic, event_type, data, org_id, user_id, entity_type, entity_id)
+    ])
 
 
-def _delivery_callback(err, msg):
-    """Kafka delivery callback."""
-    if err:
-        logger.error(f"Message delivery failed: {err}")
-    else:
-        logger.debug(f"Message delivered to {msg.topic()} [{msg.partition()}]")
+def _nudge_relay():
+    """Queue a relay run, at most once per second, so events don't wait for the beat."""
+    try:
+        if cache.add(RELAY_NUDGE_KEY, 1, timeout=1):
+            from .tasks import relay_event_outbox
+            relay_event_outbox.delay()
+    except Exception as e:
+        logger.warning(f"Could not nudge the event outbox relay: {e}")
 
 
 def publish_contact_event(
@@ -205,8 +310,10 @@ def publish_audit_event(
     )
 
 
-def flush_events():
-    """Flush pending events to Kafka."""
-    producer = get_producer()
-    if producer:
-        producer.flush(timeout=5)
+def flush_events(timeout: float = 5):
+    """Wait for events the relay has handed to the producer to be delivered."""
+    if _producer is None:
+        return
+    remaining = _producer.flush(timeout)
+    if remaining:
+        logger.warning(f"{remaining} Kafka message(s) still undelivered after flush")
@@ -13,5 +13,6 @@ urlpatterns = [
     path('v2/deals/<uuid:deal_id>', internal_v2_views.get_deal_v2, name='internal-deal-v2'),
     path('v2/orgs/<uuid:org_id>/stats', internal_v2_views.get_org_stats_v2, name='internal-org-stats-v2'),
     path('v2/orgs/<uuid:org_id>/usage', internal_v2_views.record_usage_v2, name='internal-record-usage-v2'),
+    path('v2/orgs/<uuid:org_id>/invalidate-members', internal_v2_views.invalidate_members_v2, name='internal-invalidate-members-v2'),
     path('v2/users/<uuid:user_id>/invalidate-permissions', internal_v2_views.invalidate_permissions_v2, name='internal-invalidate-permissions-v2'),
 ]
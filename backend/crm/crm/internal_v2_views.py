@@ -6,6 +6,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 
 from .internal_views import require_service_auth
+from .member_directory import invalidate_member_directory
 from .middleware import bump_permission_version
 
 logger = logging.getLogger(__name__)
@@ -92,6 +93,32 @@ def get_org_stats_v2(request, org_id):
     except ValueError:
         return JsonResponse({'error': 'Invalid org_id'}, status=400)
 
+    from .rollups import get_org_metrics
+    metrics = get_org_metrics(org_uuid)
+    if metrics is not None:
+        return JsonResponse({
+            'org_id': str(org_id),
+            'version': 'v2',
+            'contacts': metrics.count('contact'),
+            'companies': metrics.count('company'),
+            'activities': metrics.count('activity'),
+            'deals': {
+                'total': metrics.count('deal'),
+                'open': metrics.count('deal', 'open'),
+                'won': metrics.count('deal', 'won'),
+                'lost': metrics.count('deal', 'lost'),
+                'total_value': str(metrics.value('deal')),
+                'won_value': str(metrics.value('deal', 'won')),
+                'lost_value': str(metrics.value('deal', 'lost')),
+                'open_value': str(metrics.value('deal', 'open')),
+            },
+            'leads': {
+                'total': metrics.count('lead'),
+                'new': metrics.count('lead', 'new'),
+                'converted': metrics.count('lead', 'converted'),
+            },
+        })
+
     from django.db import connection
     with connection.cursor() as cursor:
         cursor.execute("""
@@ -181,3 +208,17 @@ def invalidate_permissions_v2(request, user_id):
     new_version = bump_permission_version(str(user_id))
     logger.info(f"[V2] Permission version bumped for user={user_id} to v{new_version}")
     return JsonResponse({'user_id': str(user_id), 'version': new_version})
+
+
+@csrf_exempt
+@require_http_methods(['POST'])
+@require_service_auth
+def invalidate_members_v2(request, org_id):
+    try:
+        UUID(str(org_id))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid org_id'}, status=400)
+
+    invalidate_member_directory(str(org_id))
+    logger.info(f"[V2] Member directory invalidated for org={org_id}")
+    return JsonResponse({'org_id': str(org_id), 'invalidated': True})
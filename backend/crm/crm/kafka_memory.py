@@ -0,0 +1,127 @@
+"""
+In-process stand-in for the Kafka broker.
+
+With ``KAFKA_PRODUCER_BACKEND=memory`` ``crm.events.get_producer`` returns
+an ``InMemoryProducer``: it accepts the same ``produce`` / ``poll`` /
+``flush`` calls as ``confluent_kafka.Producer``, appends messages to the
+module-level ``broker`` and serves delivery reports on ``poll`` / ``flush``
+just like librdkafka does. The outbox relay and its throughput can then be
+exercised offline, and what was published read back with
+``broker.messages(topic)``.
+"""
+import threading
+import time
+import zlib
+
+
+class InMemoryMessage:
+    """The subset of ``confluent_kafka.Message`` delivery callbacks use."""
+
+    def __init__(self, topic, key, value, partition, produced_at, headers=None):
+        self._topic = topic
+        self._key = key
+        self._value = value
+        self._headers = headers
+        self._partition = partition
+        self._offset = None
+        self._produced_at = produced_at
+        self._latency = None
+
+    def topic(self):
+        return self._topic
+
+    def key(self):
+        return self._key
+
+    def value(self):
+        return self._value
+
+    def headers(self):
+        return self._headers
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def latency(self):
+        return self._latency
+
+    def __len__(self):
+        return len(self._value or b'')
+
+
+class InMemoryBroker:
+    """Topics as append-only lists of partitioned messages."""
+
+    def __init__(self, partitions=3):
+        self.partitions = partitions
+        self._lock = threading.Lock()
+        self._topics = {}
+
+    def partition_for(self, key):
+        if key is None:
+            return 0
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        return zlib.crc32(key) % self.partitions
+
+    def append(self, message):
+        with self._lock:
+            log = self._topics.setdefault(message.topic(), [])
+            message._offset = len(log)
+            log.append(message)
+
+    def messages(self, topic):
+        with self._lock:
+            return list(self._topics.get(topic, ()))
+
+    def topics(self):
+        with self._lock:
+            return sorted(self._topics)
+
+    def clear(self):
+        with self._lock:
+            self._topics.clear()
+
+
+broker = InMemoryBroker()
+
+
+class InMemoryProducer:
+    """Producer writing to ``broker``; delivery reports are queued until poll/flush."""
+
+    def __init__(self, config=None, target=None):
+        self.config = dict(config or {})
+        self.broker = target or broker
+        self.max_queued = int(self.config.get('queue.buffering.max.messages', 100000))
+        self._lock = threading.Lock()
+        self._queue = []
+
+    def produce(self, topic, value=None, key=None, on_delivery=None, callback=None, headers=None):
+        with self._lock:
+            if len(self._queue) >= self.max_queued:
+                raise BufferError('Local: Queue full')
+            message = InMemoryMessage(
+                topic, key, value, self.broker.partition_for(key), time.monotonic(), headers,
+            )
+            self._queue.append((message, on_delivery or callback))
+
+    def poll(self, timeout=None):
+        with self._lock:
+            queued, self._queue = self._queue, []
+        for message, on_delivery in queued:
+            self.broker.append(message)
+            message._latency = time.monotonic() - message._produced_at
+            if on_delivery is not None:
+                on_delivery(None, message)
+        return len(queued)
+
+    def flush(self, timeout=None):
+        self.poll(0)
+        return len(self)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._queue)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from crm.audit_partitions import ensure_partitions, maintain_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming crm_audit_logs partitions and apply audit log retention.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=None,
+            help='Months of partitions to create ahead (default AUDIT_LOG_PARTITIONS_AHEAD)',
+        )
+        parser.add_argument(
+            '--skip-retention', action='store_true',
+            help='Only create partitions; leave expired partitions and rows alone',
+        )
+
+    def handle(self, *args, **options):
+        if options['skip_retention']:
+            result = {'created_partitions': ensure_partitions(options['months_ahead'])}
+        else:
+            result = maintain_partitions(options['months_ahead'])
+
+        for name in result['created_partitions']:
+            self.stdout.write(f'  created {name}')
+        for name in result.get('expired_partitions', []):
+            self.stdout.write(f'  expired {name}')
+        if 'deleted_rows' in result:
+            self.stdout.write(f"  deleted {result['deleted_rows']} rows past org retention")
+        self.stdout.write(self.style.SUCCESS('Audit log partitions up to date'))
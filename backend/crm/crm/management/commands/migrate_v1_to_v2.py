@@ -6,6 +6,8 @@ from django.core.management.base import BaseCommand
 from django.db import connection, transaction
 from django.utils import timezone
 
+from crm_service.search_index import build_search_text, refresh_search_vectors
+
 logger = logging.getLogger(__name__)
 
 ENTITY_ORDER = [
@@ -55,6 +57,14 @@ class Command(BaseCommand):
             self.stdout.write(f'{"="*60}')
             handler()
 
+        if not self.dry_run:
+            # bulk_create bypasses the rollup signals; rebuild on next read.
+            from crm.models import OrgMetricsRollupState
+            states = OrgMetricsRollupState.objects.all()
+            if self.org_id:
+                states = states.filter(org_id=self.org_id)
+            states.delete()
+
         self.stdout.write(f'\n{"="*60}')
         self.stdout.write('SUMMARY')
         self.stdout.write(f'{"="*60}')
@@ -275,15 +285,18 @@ class Command(BaseCommand):
                 size=c.size or '',
                 status='active',
                 entity_data=entity_data,
+                search_text=build_search_text(entity_data, CompanyV2.SEARCH_FIELDS),
             ))
 
             if len(batch) >= self.batch_size:
                 CompanyV2.objects.bulk_create(batch, ignore_conflicts=True)
+                refresh_search_vectors(CompanyV2.objects.filter(id__in=[obj.id for obj in batch]))
                 self.stats['companies']['migrated'] += len(batch)
                 batch = []
 
         if batch:
             CompanyV2.objects.bulk_create(batch, ignore_conflicts=True)
+            refresh_search_vectors(CompanyV2.objects.filter(id__in=[obj.id for obj in batch]))
             self.stats['companies']['migrated'] += len(batch)
 
         self.stdout.write(self.style.SUCCESS(
@@ -364,15 +377,18 @@ class Command(BaseCommand):
                 last_activity_at=c.last_activity_at,
                 last_contacted_at=c.last_contacted_at,
                 entity_data=entity_data,
+                search_text=build_search_text(entity_data, ContactV2.SEARCH_FIELDS),
             ))
 
             if len(batch) >= self.batch_size:
                 ContactV2.objects.bulk_create(batch, ignore_conflicts=True)
+                refresh_search_vectors(ContactV2.objects.filter(id__in=[obj.id for obj in batch]))
                 self.stats['contacts']['migrated'] += len(batch)
                 batch = []
 
         if batch:
             ContactV2.objects.bulk_create(batch, ignore_conflicts=True)
+            refresh_search_vectors(ContactV2.objects.filter(id__in=[obj.id for obj in batch]))
             self.stats['contacts']['migrated'] += len(batch)
 
         self.stdout.write(self.style.SUCCESS(
@@ -463,15 +479,18 @@ class Command(BaseCommand):
                 deleted_by=l.deleted_by,
                 last_activity_at=l.last_activity_at,
                 entity_data=entity_data,
+                search_text=build_search_text(entity_data, LeadV2.SEARCH_FIELDS),
             ))
 
             if len(batch) >= self.batch_size:
                 LeadV2.objects.bulk_create(batch, ignore_conflicts=True)
+                refresh_search_vectors(LeadV2.objects.filter(id__in=[obj.id for obj in batch]))
                 self.stats['leads']['migrated'] += len(batch)
                 batch = []
 
         if batch:
             LeadV2.objects.bulk_create(batch, ignore_conflicts=True)
+            refresh_search_vectors(LeadV2.objects.filter(id__in=[obj.id for obj in batch]))
             self.stats['leads']['migrated'] += len(batch)
 
         self.stdout.write(self.style.SUCCESS(
@@ -540,15 +559,18 @@ class Command(BaseCommand):
                 deleted_by=d.deleted_by,
                 last_activity_at=d.last_activity_at,
                 entity_data=entity_data,
+                search_text=build_search_text(entity_data, DealV2.SEARCH_FIELDS),
             ))
 
             if len(batch) >= self.batch_size:
                 DealV2.objects.bulk_create(batch, ignore_conflicts=True)
+                refresh_search_vectors(DealV2.objects.filter(id__in=[obj.id for obj in batch]))
                 self.stats['deals']['migrated'] += len(batch)
                 batch = []
 
         if batch:
             DealV2.objects.bulk_create(batch, ignore_conflicts=True)
+            refresh_search_vectors(DealV2.objects.filter(id__in=[obj.id for obj in batch]))
             self.stats['deals']['migrated'] += len(batch)
 
         self.stdout.write(self.style.SUCCESS(
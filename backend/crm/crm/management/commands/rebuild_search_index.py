@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+
+from crm_service.search_index import refresh_search_vectors
+
+ENTITY_CHOICES = ['contacts', 'companies', 'deals', 'leads']
+
+
+def _get_model(entity):
+    if entity == 'contacts':
+        from contacts_v2.models import ContactV2
+        return ContactV2
+    if entity == 'companies':
+        from companies_v2.models import CompanyV2
+        return CompanyV2
+    if entity == 'deals':
+        from deals_v2.models import DealV2
+        return DealV2
+    from leads_v2.models import LeadV2
+    return LeadV2
+
+
+class Command(BaseCommand):
+    help = 'Backfill search_text and search_vector for V2 entities in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity', type=str, default=None,
+            choices=ENTITY_CHOICES,
+            help='Rebuild only this entity type',
+        )
+        parser.add_argument(
+            '--org-id', type=str, default=None,
+            help='Rebuild only this org',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows per UPDATE batch (default 1000)',
+        )
+        parser.add_argument(
+            '--only-missing', action='store_true',
+            help='Skip rows whose search_vector is already populated',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        entities = [options['entity']] if options['entity'] else ENTITY_CHOICES
+
+        for entity in entities:
+            model = _get_model(entity)
+            qs = model._base_manager.all()
+            if options['org_id']:
+                qs = qs.filter(org_id=options['org_id'])
+            if options['only_missing']:
+                qs = qs.filter(search_vector__isnull=True)
+
+            total = 0
+            batch = []
+            for obj in qs.only('id', 'entity_data').order_by('id').iterator(chunk_size=batch_size):
+                obj.search_text = obj.build_search_text()
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    total += self._flush(model, batch)
+                    batch = []
+            if batch:
+                total += self._flush(model, batch)
+
+            self.stdout.write(self.style.SUCCESS(f'  {entity}: {total} rows reindexed'))
+
+    def _flush(self, model, batch):
+        model._base_manager.bulk_update(batch, ['search_text'])
+        refresh_search_vectors(model._base_manager.filter(id__in=[obj.id for obj in batch]))
+        return len(batch)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from crm.events import delivery_metrics, flush_events
+from crm.outbox import backlog, drain, requeue_dead_letters, run_relay
+
+
+class Command(BaseCommand):
+    help = 'Relay queued events from crm_event_outbox to Kafka.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the outbox once and exit instead of running continuously',
+        )
+        parser.add_argument(
+            '--requeue-dead', action='store_true',
+            help='Move dead-lettered events back into the outbox and exit',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Events per batch (default EVENT_OUTBOX_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=None,
+            help='Seconds to sleep when the outbox is empty (default EVENT_OUTBOX_POLL_INTERVAL)',
+        )
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            requeued = requeue_dead_letters()
+            self.stdout.write(self.style.SUCCESS(f'Requeued {requeued} dead-lettered event(s)'))
+            return
+
+        if options['once']:
+            sent = drain(batch_size=options['batch_size'])
+            for topic, totals in sorted(delivery_metrics.snapshot().items()):
+                self.stdout.write(f'  {topic}: {totals}')
+            self.stdout.write(f'  backlog: {backlog()}')
+            self.stdout.write(self.style.SUCCESS(f'Relayed {sent} event(s)'))
+            return
+
+        self.stdout.write('Relaying events from crm_event_outbox (Ctrl+C to stop)')
+        try:
+            run_relay(poll_interval=options['poll_interval'], batch_size=options['batch_size'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            flush_events()
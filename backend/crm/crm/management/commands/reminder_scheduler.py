@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from activities_v2.reminder_wheel import resync, run_wheel
+
+
+class Command(BaseCommand):
+    help = 'Queue V2 activity reminders as they fall due, from the Redis reminder wheel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tick', type=float, default=None,
+            help='Longest sleep between checks in seconds (default REMINDER_WHEEL_TICK_SECONDS)',
+        )
+        parser.add_argument(
+            '--resync-only', action='store_true',
+            help='Re-add upcoming reminders to the wheel and exit',
+        )
+
+    def handle(self, *args, **options):
+        added = resync()
+        self.stdout.write(f'  {added} upcoming reminder(s) in the wheel')
+        if options['resync_only']:
+            return
+
+        self.stdout.write('Scheduling reminders (Ctrl+C to stop)')
+        try:
+            run_wheel(options['tick'])
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,167 @@
+"""
+Org member directory used to resolve user UUIDs to display names.
+
+Names come from the org service (``fetch_member_names``). Each org's map is
+kept in Redis for ``CRM_SETTINGS['MEMBER_DIRECTORY_TTL']`` seconds and
+memoized on the request, so serializing a page or an export costs at most
+one org-service call per org instead of one per row and field.
+
+Owner emails (``get_member_emails`` / ``resolve_owner_emails``, used by the
+activity reminders) are cached in Redis too, one key per (org, user) read
+and written with ``get_many`` / ``set_many``; ids not cached yet are resolved
+with one batched org-service call per org. Members the org service doesn't
+know (or who have no email) are cached as '' for
+``ORG_SERVICE_NEGATIVE_CACHE_TTL`` seconds. The keys carry the org's cache
+generation from ``crm.org_service``, so an invalidation retires all of them.
+
+The org service calls ``POST /internal/v2/orgs/<org_id>/invalidate-members``
+when membership or names change.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .org_service import cache_generation, get_org_service_client
+from .utils import fetch_member_names, fetch_members
+
+logger = logging.getLogger(__name__)
+
+MEMBER_DIRECTORY_PREFIX = 'member_directory:'
+MEMBER_EMAILS_PREFIX = 'member_emails:'
+DEFAULT_MEMBER_DIRECTORY_TTL = 300
+
+
+def _cache_key(org_id) -> str:
+    return f'{MEMBER_DIRECTORY_PREFIX}{org_id}'
+
+
+def _request_memo(request):
+    if request is None:
+        return None
+    # DRF's Request wraps the HttpRequest; memoize on the underlying one so
+    # nested serializers and views share it.
+    http_request = getattr(request, '_request', request)
+    memo = getattr(http_request, '_member_directory', None)
+    if memo is None:
+        memo = {}
+        http_request._member_directory = memo
+    return memo
+
+
+def get_member_names(org_id, request=None) -> dict:
+    """Return {user_id: display name} for an org."""
+    if not org_id:
+        return {}
+    org_id = str(org_id)
+
+    memo = _request_memo(request)
+    if memo is not None and org_id in memo:
+        return memo[org_id]
+
+    key = _cache_key(org_id)
+    try:
+        members = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Member directory cache read failed for org={org_id}: {e}")
+        members = None
+
+    if members is None:
+        members = fetch_member_names(org_id)
+        # An empty map usually means the org service failed; don't pin it.
+        if members:
+            try:
+                cache.set(key, members, timeout=_ttl())
+            except Exception as e:
+                logger.warning(f"Member directory cache write failed for org={org_id}: {e}")
+
+    if memo is not None:
+        memo[org_id] = members
+    return members
+
+
+def resolve_member_name(org_id, user_id, request=None) -> str:
+    if not user_id:
+        return ''
+    return get_member_names(org_id, request).get(str(user_id), '')
+
+
+def _ttl() -> int:
+    return settings.CRM_SETTINGS.get('MEMBER_DIRECTORY_TTL', DEFAULT_MEMBER_DIRECTORY_TTL)
+
+
+def _negative_ttl() -> int:
+    return getattr(settings, 'ORG_SERVICE_NEGATIVE_CACHE_TTL', 30)
+
+
+def _email_key(org_id, generation, user_id) -> str:
+    return f'{MEMBER_EMAILS_PREFIX}{org_id}:{generation}:{user_id}'
+
+
+def get_member_emails(org_id, user_ids) -> dict:
+    """Return {user_id: email} for the given members of one org."""
+    user_ids = {str(user_id) for user_id in user_ids if user_id}
+    if not org_id or not user_ids:
+        return {}
+    org_id = str(org_id)
+
+    generation = cache_generation(org_id)
+    keys = {user_id: _email_key(org_id, generation, user_id) for user_id in user_ids}
+    try:
+        cached = cache.get_many(keys.values())
+    except Exception as e:
+        logger.warning(f"Member email cache read failed for org={org_id}: {e}")
+        cached = {}
+
+    emails = {}
+    missing = set()
+    for user_id, key in keys.items():
+        if key not in cached:
+            missing.add(user_id)
+        elif cached[key]:
+            emails[user_id] = cached[key]
+
+    if missing:
+        members = fetch_members(org_id, missing, include_missing=True)
+        found = {}
+        unknown = {}
+        for user_id, member in members.items():
+            email = member.get('email') if member else None
+            if email:
+                emails[user_id] = email
+                found[keys[user_id]] = email
+            else:
+                # '' marks "no email" so it isn't looked up again until it expires.
+                unknown[keys[user_id]] = ''
+        try:
+            if found:
+                cache.set_many(found, timeout=_ttl())
+            if unknown:
+                cache.set_many(unknown, timeout=_negative_ttl())
+        except Exception as e:
+            logger.warning(f"Member email cache write failed for org={org_id}: {e}")
+
+    return emails
+
+
+def resolve_owner_emails(records) -> dict:
+    """
+    {(owner_id, org_id): email or None} for objects with ``owner_id`` and
+    ``org_id`` — one cached, batched lookup per org.
+    """
+    owners_by_org = {}
+    for record in records:
+        owners_by_org.setdefault(record.org_id, set()).add(record.owner_id)
+
+    result = {}
+    for org_id, owner_ids in owners_by_org.items():
+        emails = get_member_emails(org_id, owner_ids)
+        for owner_id in owner_ids:
+            result[(owner_id, org_id)] = emails.get(str(owner_id))
+    return result
+
+
+def invalidate_member_directory(org_id) -> None:
+    cache.delete(_cache_key(org_id))
+    # Bumps the org's cache generation, which retires the email keys too.
+    get_org_service_client().invalidate_org(org_id)
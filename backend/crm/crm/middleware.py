@@ -1,5 +1,5 @@
 """
-CRM middleware for permission staleness detection.
+CRM middleware for permission staleness detection and V2 audit batching.
 
 When an admin changes a user's role, the platform bumps a permission version
 in Redis using the current timestamp. Auth Service stamps each JWT with
@@ -12,6 +12,8 @@ from django.conf import settings
 from django.core.cache import cache
 from django.http import JsonResponse
 
+from crm_service.audit_v2 import buffered_audit
+
 logger = logging.getLogger(__name__)
 
 PERM_VERSION_PREFIX = 'perm_version:'
@@ -90,3 +92,17 @@ class PermissionStalenessMiddleware:
 
     def _should_skip(self, request):
         return any(request.path.startswith(p) for p in self.skip_prefixes)
+
+
+class AuditBufferMiddleware:
+    """
+    Writes the V2 audit rows a request produces with one ``bulk_create``
+    once the view has returned, instead of one INSERT per audited write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered_audit():
+            return self.get_response(request)
@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0003_alter_activity_call_direction_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrgMetricsRollup',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('org_id', models.UUIDField()),
+                ('metric', models.CharField(choices=[('contact', 'Contact'), ('company', 'Company'), ('lead', 'Lead'), ('deal', 'Deal'), ('deal_closed', 'Deal Closed'), ('activity', 'Activity')], max_length=20)),
+                ('status', models.CharField(blank=True, default='', max_length=30)),
+                ('day', models.DateField()),
+                ('count', models.BigIntegerField(default=0)),
+                ('value_sum', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'crm_org_metrics_rollup',
+                'constraints': [models.UniqueConstraint(fields=('org_id', 'metric', 'status', 'day'), name='crm_rollup_bucket_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrgMetricsRollupState',
+            fields=[
+                ('org_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('reconciled_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'crm_org_metrics_rollup_state',
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0005_importjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('org_id', models.UUIDField()),
+                ('created_by', models.UUIDField(blank=True, null=True)),
+                ('entity_type', models.CharField(choices=[('contact', 'Contact'), ('company', 'Company'), ('lead', 'Lead'), ('deal', 'Deal'), ('activity', 'Activity')], max_length=20)),
+                ('file_format', models.CharField(choices=[('csv', 'Gzipped CSV'), ('parquet', 'Parquet')], default='csv', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('query', models.BinaryField()),
+                ('file_name', models.CharField(blank=True, default='', max_length=255)),
+                ('file_path', models.CharField(blank=True, default='', max_length=500)),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'crm_export_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['org_id', 'created_at'], name='crm_export_jobs_org_idx'),
+                    models.Index(fields=['status', 'updated_at'], name='crm_export_jobs_status_idx'),
+                ],
+            },
+        ),
+    ]
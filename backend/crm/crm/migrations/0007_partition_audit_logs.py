@@ -0,0 +1,98 @@
+import uuid
+
+from django.db import migrations, models
+
+# Rebuild crm_audit_logs as a table range-partitioned by month on created_at.
+# Existing rows are copied into monthly partitions (plus three months
+# ahead); a DEFAULT partition catches anything outside the created ranges
+# until crm.audit_partitions.ensure_partitions moves it out. Secondary
+# indexes are recreated on the parent under their original names, so the
+# model state is unchanged.
+PARTITION_SQL = """
+ALTER TABLE crm_audit_logs RENAME TO crm_audit_logs_legacy;
+ALTER TABLE crm_audit_logs_legacy RENAME CONSTRAINT crm_audit_logs_pkey TO crm_audit_logs_legacy_pkey;
+
+CREATE TABLE crm_audit_logs (LIKE crm_audit_logs_legacy INCLUDING DEFAULTS)
+    PARTITION BY RANGE (created_at);
+ALTER TABLE crm_audit_logs ADD CONSTRAINT crm_audit_logs_pkey PRIMARY KEY (id, created_at);
+CREATE TABLE crm_audit_logs_default PARTITION OF crm_audit_logs DEFAULT;
+
+DO $$
+DECLARE
+    part_month timestamp;
+    last_month timestamp;
+    idx record;
+BEGIN
+    SELECT date_trunc('month', COALESCE(min(created_at), now()) AT TIME ZONE 'UTC')
+        INTO part_month FROM crm_audit_logs_legacy;
+    last_month := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months';
+    WHILE part_month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF crm_audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'crm_audit_logs_p' || to_char(part_month, 'YYYYMM'),
+            part_month AT TIME ZONE 'UTC',
+            (part_month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        part_month := part_month + interval '1 month';
+    END LOOP;
+
+    INSERT INTO crm_audit_logs SELECT * FROM crm_audit_logs_legacy;
+
+    CREATE TEMP TABLE crm_audit_log_indexes ON COMMIT DROP AS
+        SELECT indexdef FROM pg_indexes
+        WHERE tablename = 'crm_audit_logs_legacy' AND indexname <> 'crm_audit_logs_legacy_pkey';
+    DROP TABLE crm_audit_logs_legacy;
+    FOR idx IN SELECT indexdef FROM crm_audit_log_indexes LOOP
+        EXECUTE replace(idx.indexdef, 'crm_audit_logs_legacy', 'crm_audit_logs');
+    END LOOP;
+END $$;
+"""
+
+UNPARTITION_SQL = """
+ALTER TABLE crm_audit_logs RENAME TO crm_audit_logs_partitioned;
+ALTER TABLE crm_audit_logs_partitioned RENAME CONSTRAINT crm_audit_logs_pkey TO crm_audit_logs_partitioned_pkey;
+
+CREATE TABLE crm_audit_logs (LIKE crm_audit_logs_partitioned INCLUDING DEFAULTS);
+INSERT INTO crm_audit_logs SELECT * FROM crm_audit_logs_partitioned;
+ALTER TABLE crm_audit_logs ADD CONSTRAINT crm_audit_logs_pkey PRIMARY KEY (id);
+
+DO $$
+DECLARE
+    idx record;
+BEGIN
+    CREATE TEMP TABLE crm_audit_log_indexes ON COMMIT DROP AS
+        SELECT indexdef FROM pg_indexes
+        WHERE tablename = 'crm_audit_logs_partitioned' AND indexname <> 'crm_audit_logs_partitioned_pkey';
+    DROP TABLE crm_audit_logs_partitioned;
+    FOR idx IN SELECT indexdef FROM crm_audit_log_indexes LOOP
+        EXECUTE replace(
+            replace(idx.indexdef, 'ON ONLY ', 'ON '),
+            'crm_audit_logs_partitioned', 'crm_audit_logs'
+        );
+    END LOOP;
+END $$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0006_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditRetentionPolicy',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('org_id', models.UUIDField(unique=True)),
+                ('retention_days', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'crm_audit_retention_policies',
+            },
+        ),
+        migrations.RunSQL(PARTITION_SQL, reverse_sql=UNPARTITION_SQL),
+    ]
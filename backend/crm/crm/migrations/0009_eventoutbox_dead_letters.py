@@ -0,0 +1,37 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0008_eventoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventoutbox',
+            index=models.Index(
+                condition=models.Q(('attempts__gt', 0)),
+                fields=['key', 'id'],
+                name='crm_event_outbox_failed_idx',
+            ),
+        ),
+        migrations.CreateModel(
+            name='EventOutboxDeadLetter',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('topic', models.CharField(max_length=100)),
+                ('key', models.CharField(blank=True, max_length=100, null=True)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField()),
+                ('failed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'crm_event_outbox_dead',
+                'ordering': ['id'],
+            },
+        ),
+    ]
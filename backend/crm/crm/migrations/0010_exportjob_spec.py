@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fail_unfinished_jobs(apps, schema_editor):
+    # Their pickled queries are dropped with the column; they can't run.
+    ExportJob = apps.get_model('crm', 'ExportJob')
+    ExportJob.objects.filter(status__in=['pending', 'running']).update(
+        status='failed',
+        error_message='Export was interrupted by an upgrade. Please start it again.',
+        finished_at=timezone.now(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0009_eventoutbox_dead_letters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportjob',
+            name='spec',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(fail_unfinished_jobs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='exportjob',
+            name='query',
+        ),
+    ]
@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_errors(apps, schema_editor):
+    ImportJob = apps.get_model('crm', 'ImportJob')
+    ImportJobError = apps.get_model('crm', 'ImportJobError')
+    for job in ImportJob.objects.exclude(errors=[]).only('id', 'errors').iterator(chunk_size=100):
+        ImportJobError.objects.bulk_create([
+            ImportJobError(job_id=job.id, row=error['row'], error=error['error'], data=error.get('data'))
+            for error in job.errors
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0010_exportjob_spec'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJobError',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('row', models.PositiveIntegerField()),
+                ('error', models.TextField()),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('job', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='failed_rows', to='crm.importjob')),
+            ],
+            options={
+                'db_table': 'crm_import_job_errors',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['job', 'row'], name='crm_import_job_errors_job_idx')],
+            },
+        ),
+        migrations.RunPython(move_errors, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='importjob',
+            name='errors',
+        ),
+    ]
@@ -1,5 +1,6 @@
 import uuid
 from decimal import Decimal
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db.models.functions import Upper
 from django.contrib.postgres.indexes import GinIndex
@@ -1075,6 +1076,10 @@ class CRMAuditLog(BaseModel):
     
     Tracks changes to CRM entities for history and compliance.
     Also publishes to central Audit Log service via Kafka.
+
+    The table is range-partitioned by month on ``created_at`` (primary key
+    ``(id, created_at)`` in the database); ``crm.audit_partitions`` keeps
+    future partitions created and expired ones detached.
     """
     
     class Action(models.TextChoices):
@@ -1118,3 +1123,271 @@ class CRMAuditLog(BaseModel):
     
     def __str__(self):
         return f"{self.action} {self.entity_type}:{self.entity_id} by {self.actor_id}"
+
+
+class AuditRetentionPolicy(BaseModel):
+    """
+    How long an org's audit log entries are kept. Orgs without a policy use
+    ``CRM_SETTINGS['AUDIT_LOG_RETENTION_DAYS']``; see ``crm.audit_partitions``.
+    """
+    org_id = models.UUIDField(unique=True)
+    retention_days = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = 'crm_audit_retention_policies'
+
+    def __str__(self):
+        return f"{self.org_id}: {self.retention_days} days"
+
+
+class OrgMetricsRollup(models.Model):
+    """
+    Pre-aggregated V2 entity counts and value sums per org.
+
+    One row per (org, metric, status, day) bucket; ``day`` is the UTC
+    creation date, except for ``deal_closed`` where it is the deal's
+    ``actual_close_date``. Kept current incrementally by ``crm.rollups``
+    and rebuilt per org by the ``reconcile_org_metrics_rollup`` task.
+    """
+
+    class Metric(models.TextChoices):
+        CONTACT = 'contact', 'Contact'
+        COMPANY = 'company', 'Company'
+        LEAD = 'lead', 'Lead'
+        DEAL = 'deal', 'Deal'
+        DEAL_CLOSED = 'deal_closed', 'Deal Closed'
+        ACTIVITY = 'activity', 'Activity'
+
+    id = models.BigAutoField(primary_key=True)
+    org_id = models.UUIDField()
+    metric = models.CharField(max_length=20, choices=Metric.choices)
+    status = models.CharField(max_length=30, blank=True, default='')
+    day = models.DateField()
+
+    count = models.BigIntegerField(default=0)
+    value_sum = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal('0'))
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'crm_org_metrics_rollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['org_id', 'metric', 'status', 'day'],
+                name='crm_rollup_bucket_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.org_id} {self.metric}/{self.status} {self.day}: {self.count}"
+
+
+class OrgMetricsRollupState(models.Model):
+    """When an org's rollup rows were last rebuilt from the source tables."""
+
+    org_id = models.UUIDField(primary_key=True)
+    reconciled_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'crm_org_metrics_rollup_state'
+
+    def __str__(self):
+        return f"{self.org_id} reconciled at {self.reconciled_at}"
+
+
+class ImportJob(BaseModel):
+    """
+    A V2 bulk import processed in the background.
+
+    The uploaded rows are kept in file storage until the job finishes;
+    ``processed_rows`` is the checkpoint a resumed run continues from and is
+    committed together with each chunk's writes.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    class EntityType(models.TextChoices):
+        CONTACT = 'contact', 'Contact'
+        LEAD = 'lead', 'Lead'
+        COMPANY = 'company', 'Company'
+
+    org_id = models.UUIDField()
+    created_by = models.UUIDField(null=True, blank=True)
+
+    entity_type = models.CharField(max_length=20, choices=EntityType.choices)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    options = models.JSONField(default=dict, blank=True)
+    # {"skip_duplicates": true, "update_existing": false, "duplicate_check_field": "email"}
+
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    file_path = models.CharField(max_length=500, blank=True, default='')
+
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    # Failed rows themselves are ImportJobError rows, capped at IMPORT_JOB_MAX_ERRORS.
+
+    error_message = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'crm_import_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['org_id', 'created_at'], name='crm_import_jobs_org_idx'),
+            models.Index(fields=['status', 'updated_at'], name='crm_import_jobs_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} import {self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+
+class ImportJobError(models.Model):
+    """
+    One failed row of an ``ImportJob`` with the reason and the row as sent.
+    Appended with each chunk's checkpoint, so the job row itself stays small.
+    """
+    id = models.BigAutoField(primary_key=True)
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name='failed_rows', db_index=False)
+    row = models.PositiveIntegerField()
+    error = models.TextField()
+    data = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'crm_import_job_errors'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['job', 'row'], name='crm_import_job_errors_job_idx'),
+        ]
+
+    def __str__(self):
+        return f"import {self.job_id} row {self.row}"
+
+
+class ExportJob(BaseModel):
+    """
+    A V2 export written to file storage in the background.
+
+    ``spec`` holds the export request's filter, search and ordering
+    parameters and any explicit ids (see ``crm_service.export_jobs``); the
+    worker rebuilds the queryset from it, so it exports what the request
+    asked for, without the synchronous row cap.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    class EntityType(models.TextChoices):
+        CONTACT = 'contact', 'Contact'
+        COMPANY = 'company', 'Company'
+        LEAD = 'lead', 'Lead'
+        DEAL = 'deal', 'Deal'
+        ACTIVITY = 'activity', 'Activity'
+
+    class FileFormat(models.TextChoices):
+        CSV = 'csv', 'Gzipped CSV'
+        PARQUET = 'parquet', 'Parquet'
+
+    org_id = models.UUIDField()
+    created_by = models.UUIDField(null=True, blank=True)
+
+    entity_type = models.CharField(max_length=20, choices=EntityType.choices)
+    file_format = models.CharField(max_length=20, choices=FileFormat.choices, default=FileFormat.CSV)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    spec = models.JSONField(default=dict)
+
+    file_name = models.CharField(max_length=255, blank=True, default='')
+    file_path = models.CharField(max_length=500, blank=True, default='')
+    file_size = models.BigIntegerField(default=0)
+
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+
+    error_message = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'crm_export_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['org_id', 'created_at'], name='crm_export_jobs_org_idx'),
+            models.Index(fields=['status', 'updated_at'], name='crm_export_jobs_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} export {self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.COMPLETED, self.Status.FAILED)
+
+
+class EventOutbox(models.Model):
+    """
+    Kafka events waiting to be relayed.
+
+    ``crm.events.publish_event`` inserts a row in the caller's transaction,
+    so an event exists exactly when the change it describes commits; the
+    relay (``crm.outbox``) publishes rows in id order and deletes them once
+    the broker has acknowledged them.
+    """
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, null=True, blank=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'crm_event_outbox'
+        ordering = ['id']
+        indexes = [
+            # Finds a key's earlier failed rows, which hold back its later ones.
+            models.Index(
+                fields=['key', 'id'], name='crm_event_outbox_failed_idx',
+                condition=models.Q(attempts__gt=0),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id}"
+
+
+class EventOutboxDeadLetter(models.Model):
+    """
+    Outbox rows that failed ``EVENT_OUTBOX_MAX_ATTEMPTS`` times. The relay
+    moves them here so they stop holding back later events for their key;
+    they are kept for inspection for ``EVENT_OUTBOX_DEAD_LETTER_RETENTION_DAYS``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    topic = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, null=True, blank=True)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'crm_event_outbox_dead'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.topic} #{self.id} (dead)"
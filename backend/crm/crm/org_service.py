@@ -0,0 +1,434 @@
+"""
+Client for the org service's internal API.
+
+One ``OrgServiceClient`` per process keeps a pooled keep-alive
+``httpx.Client`` (``AsyncOrgServiceClient`` is the ``httpx.AsyncClient``
+twin) and signs every call with the service HMAC headers.
+
+Member lookups are cached in-process per (org_id, user_id) with a TTL and an
+LRU bound; "not found" answers are cached for a shorter TTL. Local entries
+are tagged with the org's generation counter from the shared (Redis) cache,
+read once per lookup; ``invalidate_org`` bumps it, so an invalidation in any
+process retires every process's entries for that org at once. A circuit
+breaker stops calling the org service for ``ORG_SERVICE_BREAKER_RESET``
+seconds after ``ORG_SERVICE_BREAKER_THRESHOLD`` consecutive failures, so a
+down org service costs callers nothing instead of a timeout per call.
+
+Failures never raise: lookups return ``None`` / ``{}`` and log, like the
+helpers in ``crm.utils`` that wrap this client.
+"""
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache as shared_cache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+GENERATION_PREFIX = 'org_service_generation:'
+
+
+def cache_generation(org_id):
+    """The org's shared cache generation; None when the shared cache is unreachable."""
+    try:
+        return shared_cache.get(f'{GENERATION_PREFIX}{org_id}', 0)
+    except Exception as e:
+        logger.warning(f"Org service cache generation read failed for org={org_id}: {e}")
+        return None
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=_MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: tuple):
+        with self._lock:
+            for key in [k for k in self._data if k[:len(prefix)] == prefix]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class CircuitBreaker:
+    """
+    Closed until ``threshold`` consecutive failures, then open for
+    ``reset_timeout`` seconds; after that one trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"Org service circuit opened after {self._failures} consecutive failures"
+                    )
+                self._opened_at = time.monotonic()
+
+
+class _OrgServiceBase:
+
+    def __init__(self, base_url=None, service_name=None, service_secret=None,
+                 timeout=None, cache=None, breaker=None):
+        self.base_url = (base_url or getattr(settings, 'ORG_SERVICE_URL', 'http://org-service:8000')).rstrip('/')
+        self.service_name = service_name or getattr(settings, 'SERVICE_NAME', 'crm-service')
+        self.service_secret = service_secret if service_secret is not None else getattr(settings, 'ORG_SERVICE_SECRET', '')
+        self.timeout = timeout or getattr(settings, 'ORG_SERVICE_TIMEOUT', 5.0)
+        self.cache_ttl = getattr(settings, 'ORG_SERVICE_CACHE_TTL', 300)
+        self.negative_cache_ttl = getattr(settings, 'ORG_SERVICE_NEGATIVE_CACHE_TTL', 30)
+        self.cache = cache or TTLCache(getattr(settings, 'ORG_SERVICE_CACHE_SIZE', 4096))
+        self.breaker = breaker or CircuitBreaker(
+            threshold=getattr(settings, 'ORG_SERVICE_BREAKER_THRESHOLD', 5),
+            reset_timeout=getattr(settings, 'ORG_SERVICE_BREAKER_RESET', 30.0),
+        )
+
+    def _limits(self) -> httpx.Limits:
+        max_connections = getattr(settings, 'ORG_SERVICE_MAX_CONNECTIONS', 20)
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0,
+        )
+
+    def _signed_headers(self, path: str) -> dict:
+        ts = str(int(time.time()))
+        sig = hmac.new(
+            self.service_secret.encode(),
+            f"{self.service_name}:{ts}:{path}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        return {
+            'X-Service-Name': self.service_name,
+            'X-Service-Timestamp': ts,
+            'X-Service-Signature': sig,
+        }
+
+    def _handle_response(self, resp: httpx.Response, path: str) -> Optional[httpx.Response]:
+        # 5xx means the org service is unhealthy; 4xx is a valid answer.
+        if resp.status_code >= 500:
+            self.breaker.record_failure()
+            logger.warning(f"Org service {path} returned {resp.status_code}")
+            return None
+        self.breaker.record_success()
+        return resp
+
+    def _generation(self, org_id):
+        return cache_generation(org_id)
+
+    def _member_key(self, org_id, generation, user_id) -> tuple:
+        return ('member', str(org_id), generation, str(user_id))
+
+    def _owner_key(self, org_id, generation) -> tuple:
+        return ('owner', str(org_id), generation)
+
+    def _cache_member(self, org_id, generation, user_id, member: Optional[dict]):
+        ttl = self.cache_ttl if member is not None else self.negative_cache_ttl
+        self.cache.set(self._member_key(org_id, generation, user_id), member, ttl)
+
+    def invalidate_org(self, org_id):
+        """
+        Drop the org from this process's cache and bump its shared generation,
+        so every other process misses its local entries on the next read.
+        """
+        self.cache.delete_prefix(('member', str(org_id)))
+        self.cache.delete_prefix(('owner', str(org_id)))
+        key = f'{GENERATION_PREFIX}{org_id}'
+        try:
+            shared_cache.add(key, 0, timeout=None)
+            shared_cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Org service cache generation bump failed for org={org_id}: {e}")
+
+    # The lookups below are written once as generators: each yields
+    # ``(method, path, kwargs)`` for the request it needs and is sent the
+    # response (or None). ``OrgServiceClient`` and ``AsyncOrgServiceClient``
+    # only drive them over their own transport.
+
+    def _get_member(self, org_id, user_id, generation=_MISSING):
+        if generation is _MISSING:
+            generation = self._generation(org_id)
+        cached = self.cache.get(self._member_key(org_id, generation, user_id))
+        if cached is not _MISSING:
+            return cached
+
+        resp = yield ('GET', f"/internal/orgs/{org_id}/members/{user_id}", {})
+        if resp is None:
+            return None
+        if resp.status_code == 200:
+            member = resp.json()
+            self._cache_member(org_id, generation, user_id, member)
+            return member
+        if resp.status_code == 404:
+            self._cache_member(org_id, generation, user_id, None)
+        else:
+            logger.warning(f"Failed to fetch user {user_id} from org service: {resp.status_code}")
+        return None
+
+    def _get_members(self, org_id, user_ids: Iterable, include_missing=False):
+        generation = self._generation(org_id)
+        result = {}
+        pending = []
+        for user_id in {str(u) for u in user_ids if u}:
+            cached = self.cache.get(self._member_key(org_id, generation, user_id))
+            if cached is _MISSING:
+                pending.append(user_id)
+            elif cached is not None or include_missing:
+                result[user_id] = cached
+
+        if not pending:
+            return result
+
+        resp = yield (
+            'POST', f"/internal/orgs/{org_id}/members/batch",
+            {'json': {'user_ids': sorted(pending)}},
+        )
+        if resp is not None and resp.status_code == 404:
+            # Org service without the batch endpoint: fall back to single
+            # lookups over the pooled connection.
+            for user_id in pending:
+                member = yield from self._get_member(org_id, user_id, generation)
+                if member is not None:
+                    result[user_id] = member
+                elif include_missing and self.cache.get(
+                        self._member_key(org_id, generation, user_id)) is None:
+                    result[user_id] = None
+            return result
+        if resp is None or resp.status_code != 200:
+            return result
+
+        members = resp.json().get('members', {})
+        for user_id in pending:
+            member = members.get(user_id)
+            self._cache_member(org_id, generation, user_id, member)
+            if member is not None or include_missing:
+                result[user_id] = member
+        return result
+
+    def _get_member_names(self, org_id):
+        resp = yield ('GET', f"/internal/orgs/{org_id}/members/names", {})
+        if resp is None:
+            return {}
+        if resp.status_code == 200:
+            return resp.json().get('members', {})
+        logger.warning(f"Failed to fetch member names: {resp.status_code}")
+        return {}
+
+    def _get_org_owner(self, org_id):
+        key = self._owner_key(org_id, self._generation(org_id))
+        cached = self.cache.get(key)
+        if cached is not _MISSING:
+            return cached
+
+        resp = yield ('GET', f"/internal/orgs/{org_id}/owner", {})
+        if resp is None:
+            return None
+        if resp.status_code == 200:
+            owner_id = resp.json().get('user_id')
+            self.cache.set(key, owner_id, self.cache_ttl)
+            return owner_id
+        logger.warning(f"Failed to fetch org owner: {resp.status_code}")
+        return None
+
+
+class OrgServiceClient(_OrgServiceBase):
+    """Synchronous org-service client backed by a pooled ``httpx.Client``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self._limits(),
+        )
+
+    def close(self):
+        self._client.close()
+
+    def _request(self, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        if not self.breaker.allow():
+            logger.debug(f"Org service circuit open, skipping {path}")
+            return None
+        try:
+            resp = self._client.request(method, path, headers=self._signed_headers(path), **kwargs)
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            logger.warning(f"Org service {path} request failed: {e}")
+            return None
+        return self._handle_response(resp, path)
+
+    def _run(self, lookup):
+        try:
+            method, path, kwargs = next(lookup)
+            while True:
+                method, path, kwargs = lookup.send(self._request(method, path, **kwargs))
+        except StopIteration as done:
+            return done.value
+
+    def get_member(self, org_id, user_id) -> Optional[dict]:
+        """Member record (``email``, names, role...) or None when unknown."""
+        return self._run(self._get_member(org_id, user_id))
+
+    def get_members(self, org_id, user_ids: Iterable, include_missing=False) -> dict:
+        """
+        Batch lookup: {user_id: member} for the ids the org service knows.
+        Cache hits are served locally; the rest go out in one request.
+        With ``include_missing``, ids the org service confirmed unknown map
+        to None; ids that could not be looked up are left out either way.
+        """
+        return self._run(self._get_members(org_id, user_ids, include_missing))
+
+    def get_user_email(self, org_id, user_id) -> Optional[str]:
+        member = self.get_member(org_id, user_id)
+        return member.get('email') if member else None
+
+    def get_member_names(self, org_id) -> dict:
+        return self._run(self._get_member_names(org_id))
+
+    def get_org_owner(self, org_id) -> Optional[str]:
+        return self._run(self._get_org_owner(org_id))
+
+
+class AsyncOrgServiceClient(_OrgServiceBase):
+    """``httpx.AsyncClient`` twin of ``OrgServiceClient`` for async callers."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self._limits(),
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        if not self.breaker.allow():
+            logger.debug(f"Org service circuit open, skipping {path}")
+            return None
+        try:
+            resp = await self._client.request(method, path, headers=self._signed_headers(path), **kwargs)
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            logger.warning(f"Org service {path} request failed: {e}")
+            return None
+        return self._handle_response(resp, path)
+
+    async def _run(self, lookup):
+        try:
+            method, path, kwargs = next(lookup)
+            while True:
+                method, path, kwargs = lookup.send(await self._request(method, path, **kwargs))
+        except StopIteration as done:
+            return done.value
+
+    async def get_member(self, org_id, user_id) -> Optional[dict]:
+        return await self._run(self._get_member(org_id, user_id))
+
+    async def get_members(self, org_id, user_ids: Iterable, include_missing=False) -> dict:
+        return await self._run(self._get_members(org_id, user_ids, include_missing))
+
+    async def get_user_email(self, org_id, user_id) -> Optional[str]:
+        member = await self.get_member(org_id, user_id)
+        return member.get('email') if member else None
+
+    async def get_member_names(self, org_id) -> dict:
+        return await self._run(self._get_member_names(org_id))
+
+    async def get_org_owner(self, org_id) -> Optional[str]:
+        return await self._run(self._get_org_owner(org_id))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_org_service_client() -> OrgServiceClient:
+    """Process-wide client; connections and caches are shared by all callers."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OrgServiceClient()
+    return _client
+
+
+def _reset_after_fork():
+    # Pooled sockets and locks must not be shared with forked workers
+    # (gunicorn/celery prefork); each child builds its own client.
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,264 @@
+"""
+Relay from ``crm_event_outbox`` to Kafka.
+
+``crm.events.publish_event`` only inserts outbox rows in the caller's
+transaction; this module sends them. ``relay_batch`` reads up to
+``EVENT_OUTBOX_BATCH_SIZE`` rows in id order, hands all of them to the
+producer (which compresses and batches them per partition), waits once for
+the broker's acknowledgements and deletes the delivered rows in the same
+transaction. Each row is encoded for its topic by ``crm.event_codecs`` at
+this point, off the request path.
+
+Rows that fail stay in place with ``attempts`` and ``last_error`` updated.
+A failed row holds back the later rows of its key: batches skip them until
+it is delivered or given up on, and a row that fails to encode stops the
+rest of its key in that batch. Ids are assigned at insert time, so this
+keeps events in id order per key, which is commit order for writes that
+serialize on the same rows; events already in flight when a delivery fails
+can still land after it. After ``EVENT_OUTBOX_MAX_ATTEMPTS`` failures a row
+is moved to ``crm_event_outbox_dead`` (counted as ``dead_lettered`` in
+``delivery_metrics``), which releases its key. ``requeue_dead_letters``
+puts them back; ``purge_dead_letters`` drops them after
+``EVENT_OUTBOX_DEAD_LETTER_RETENTION_DAYS``.
+
+One relay runs at a time (a transaction-level advisory lock).
+``manage.py relay_events`` runs it as a long-lived process;
+``crm.tasks.relay_event_outbox`` drains it from Celery, queued by each
+commit that writes events and by beat as a backstop.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, Min, OuterRef
+from django.utils import timezone
+
+from .event_codecs import EventEncodingError, encode_event
+from .events import delivery_metrics, get_producer
+from .models import EventOutbox, EventOutboxDeadLetter
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = 'crm_event_outbox_relay'
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_FLUSH_TIMEOUT = 30
+DEFAULT_POLL_INTERVAL = 1
+DEFAULT_DEAD_LETTER_RETENTION_DAYS = 14
+
+# Seconds between "no producer" warnings while the outbox backs up.
+NO_PRODUCER_WARNING_INTERVAL = 60
+
+_no_producer_warned_at = None
+
+
+def _setting(name, default):
+    return settings.CRM_SETTINGS.get(name, default)
+
+
+def _try_relay_lock() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_xact_lock(hashtext(%s))', [LOCK_KEY])
+        return cursor.fetchone()[0]
+
+
+def backlog() -> dict:
+    """Pending and dead-lettered outbox rows, and the age of the oldest pending one."""
+    pending = EventOutbox.objects.aggregate(count=Count('id'), oldest=Min('created_at'))
+    oldest = pending['oldest']
+    return {
+        'pending': pending['count'],
+        'oldest_age_seconds': int((timezone.now() - oldest).total_seconds()) if oldest else 0,
+        'dead_letters': EventOutboxDeadLetter.objects.count(),
+    }
+
+
+def _warn_no_producer():
+    global _no_producer_warned_at
+    now = time.monotonic()
+    if _no_producer_warned_at is not None and now - _no_producer_warned_at < NO_PRODUCER_WARNING_INTERVAL:
+        return
+    _no_producer_warned_at = now
+    try:
+        stats = backlog()
+    except Exception as e:
+        stats = {'error': str(e)}
+    logger.warning(f"Event outbox relay has no Kafka producer; outbox backlog: {stats}")
+
+
+def pending_rows(max_attempts: int):
+    """Relayable rows in id order: skips rows whose key has an earlier failed row."""
+    earlier_failure = EventOutbox.objects.filter(
+        key=OuterRef('key'), id__lt=OuterRef('id'),
+        attempts__gt=0, attempts__lt=max_attempts,
+    )
+    return (
+        EventOutbox.objects.filter(attempts__lt=max_attempts)
+        .exclude(Exists(earlier_failure))
+        .order_by('id')
+    )
+
+
+def _dead_letter(queryset) -> int:
+    """Move the given outbox rows to ``crm_event_outbox_dead``; returns how many."""
+    rows = list(queryset)
+    if not rows:
+        return 0
+    EventOutboxDeadLetter.objects.bulk_create([
+        EventOutboxDeadLetter(
+            id=row.id, topic=row.topic, key=row.key, payload=row.payload,
+            attempts=row.attempts, last_error=row.last_error, created_at=row.created_at,
+        )
+        for row in rows
+    ], ignore_conflicts=True)
+    EventOutbox.objects.filter(id__in=[row.id for row in rows]).delete()
+
+    by_topic = {}
+    for row in rows:
+        by_topic[row.topic] = by_topic.get(row.topic, 0) + 1
+    for topic, count in by_topic.items():
+        delivery_metrics.record_dead_letters(topic, count)
+    logger.error(f"Event outbox: {len(rows)} event(s) dead-lettered after repeated failures: {by_topic}")
+    return len(rows)
+
+
+def _produce(producer, row, on_delivery):
+    value, headers = encode_event(row.topic, row.payload)
+    while True:
+        try:
+            producer.produce(
+                row.topic, key=row.key, value=value, headers=headers, on_delivery=on_delivery,
+            )
+            return
+        except BufferError:
+            # Local queue full: serve delivery reports until there is room.
+            producer.poll(1)
+
+
+def relay_batch(batch_size: int = None) -> int:
+    """Send one batch of outbox rows; returns how many were delivered."""
+    producer = get_producer()
+    if producer is None:
+        _warn_no_producer()
+        return 0
+    batch_size = batch_size or _setting('EVENT_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    max_attempts = _setting('EVENT_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+
+    with transaction.atomic():
+        if not _try_relay_lock():
+            return 0
+        rows = list(pending_rows(max_attempts)[:batch_size])
+        if not rows:
+            return 0
+
+        delivered = []
+        errors = {}
+        produced = []
+        held_keys = set()
+
+        def reporter(row_id):
+            def on_delivery(err, msg):
+                delivery_metrics.record(err, msg)
+                if err is None:
+                    delivered.append(row_id)
+                else:
+                    errors[row_id] = str(err)
+            return on_delivery
+
+        for row in rows:
+            if row.key is not None and row.key in held_keys:
+                continue
+            try:
+                _produce(producer, row, reporter(row.id))
+                produced.append(row.id)
+            except EventEncodingError as e:
+                errors[row.id] = str(e)
+                if row.key is not None:
+                    held_keys.add(row.key)
+        remaining = producer.flush(_setting('EVENT_OUTBOX_FLUSH_TIMEOUT', DEFAULT_FLUSH_TIMEOUT))
+
+        if remaining:
+            delivered_ids = set(delivered)
+            for row_id in produced:
+                if row_id not in delivered_ids and row_id not in errors:
+                    errors[row_id] = 'Delivery not acknowledged before flush timeout'
+
+        if delivered:
+            EventOutbox.objects.filter(id__in=delivered).delete()
+        by_error = {}
+        for row_id, error in errors.items():
+            by_error.setdefault(error, []).append(row_id)
+        for error, row_ids in by_error.items():
+            EventOutbox.objects.filter(id__in=row_ids).update(
+                attempts=F('attempts') + 1, last_error=error,
+            )
+        if errors:
+            _dead_letter(EventOutbox.objects.filter(id__in=list(errors), attempts__gte=max_attempts))
+
+    if errors:
+        logger.warning(f"Event outbox relay: {len(errors)} event(s) not delivered, will retry")
+    return len(delivered)
+
+
+def requeue_dead_letters(ids=None) -> int:
+    """
+    Put dead-lettered events (all, or the given ids) back in the outbox with
+    fresh attempts. They get new ids, so they go out after anything queued
+    for their key since.
+    """
+    with transaction.atomic():
+        queryset = EventOutboxDeadLetter.objects.select_for_update()
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+        dead = list(queryset)
+        if not dead:
+            return 0
+        EventOutbox.objects.bulk_create([
+            EventOutbox(topic=row.topic, key=row.key, payload=row.payload) for row in dead
+        ])
+        EventOutboxDeadLetter.objects.filter(id__in=[row.id for row in dead]).delete()
+    return len(dead)
+
+
+def purge_dead_letters() -> dict:
+    """
+    Dead-letter rows stranded at ``EVENT_OUTBOX_MAX_ATTEMPTS`` (e.g. after the
+    limit was lowered) and delete dead letters past their retention.
+    """
+    max_attempts = _setting('EVENT_OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+    retention_days = _setting('EVENT_OUTBOX_DEAD_LETTER_RETENTION_DAYS', DEFAULT_DEAD_LETTER_RETENTION_DAYS)
+
+    with transaction.atomic():
+        moved = _dead_letter(EventOutbox.objects.filter(attempts__gte=max_attempts).select_for_update())
+    purged, _ = EventOutboxDeadLetter.objects.filter(
+        failed_at__lt=timezone.now() - timedelta(days=retention_days),
+    ).delete()
+    return {'dead_lettered': moved, 'purged': purged}
+
+
+def drain(max_seconds: float = None, batch_size: int = None) -> int:
+    """Relay batches until the outbox is empty (or ``max_seconds`` have passed)."""
+    batch_size = batch_size or _setting('EVENT_OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    total = 0
+    while True:
+        sent = relay_batch(batch_size)
+        total += sent
+        if sent < batch_size:
+            return total
+        if deadline and time.monotonic() >= deadline:
+            return total
+
+
+def run_relay(poll_interval: float = None, batch_size: int = None):
+    """Relay forever, sleeping ``poll_interval`` seconds whenever the outbox is empty."""
+    poll_interval = poll_interval or _setting('EVENT_OUTBOX_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+    while True:
+        sent = drain(batch_size=batch_size)
+        if sent:
+            logger.debug(f"Relayed {sent} event(s)")
+        else:
+            time.sleep(poll_interval)
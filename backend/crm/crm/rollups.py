@@ -0,0 +1,327 @@
+"""
+Org metrics rollup maintenance.
+
+``OrgMetricsRollup`` holds counts and value sums per (org, metric, status,
+day) for the live (not soft-deleted) V2 contacts, companies, leads, deals
+and activities, so the dashboard and org-stats endpoints read a handful of
+bucket rows instead of scanning the entity tables.
+
+Rows are kept current incrementally: every V2 instance remembers the
+buckets it counted towards when it was loaded, and on save/delete the
+difference is upserted in the same transaction. Writes that bypass model
+signals (``QuerySet.update``, raw SQL) call ``schedule_reconcile``, which
+marks the org stale until the queued rebuild has run.
+
+``reconcile_org`` rebuilds an org's buckets from the source tables. Readers
+only trust an org's rollup while its last reconcile is younger than
+``CRM_SETTINGS['ORG_ROLLUP_MAX_AGE']``; otherwise they fall back to live
+queries and queue a rebuild. The periodic ``reconcile_org_metrics_rollup``
+run only rebuilds orgs from ``orgs_due_for_reconcile``: those about to reach
+that age that have been written to since their last reconcile. Idle orgs
+are left to age out, since the next reader queues their rebuild anyway.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from decimal import Decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, Sum
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.utils import timezone
+
+from .models import OrgMetricsRollup, OrgMetricsRollupState
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_RECONCILE_LOCK_PREFIX = 'org_rollup_reconcile:'
+DEFAULT_ROLLUP_MAX_AGE = 3600
+# How far ahead of ORG_ROLLUP_MAX_AGE the periodic run rebuilds an org; one
+# beat interval, so readers don't see the rollup expire between runs.
+RECONCILE_AHEAD = 900
+RECENT_DAYS = 30
+
+# Fields a model's contributions are computed from.
+TRACKED_FIELDS = {
+    'contact': ('org_id', 'status', 'created_at', 'deleted_at'),
+    'company': ('org_id', 'status', 'created_at', 'deleted_at'),
+    'lead': ('org_id', 'status', 'created_at', 'deleted_at'),
+    'activity': ('org_id', 'status', 'created_at', 'deleted_at'),
+    'deal': ('org_id', 'status', 'created_at', 'deleted_at', 'value', 'actual_close_date'),
+}
+
+UPSERT_SQL = """
+    INSERT INTO crm_org_metrics_rollup (org_id, metric, status, day, count, value_sum, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, now())
+    ON CONFLICT (org_id, metric, status, day) DO UPDATE SET
+        count = crm_org_metrics_rollup.count + EXCLUDED.count,
+        value_sum = crm_org_metrics_rollup.value_sum + EXCLUDED.value_sum,
+        updated_at = now()
+"""
+
+RECONCILE_SQL = """
+    INSERT INTO crm_org_metrics_rollup (org_id, metric, status, day, count, value_sum, updated_at)
+    SELECT %(org_id)s, metric, status, day, COUNT(*), COALESCE(SUM(value), 0), now()
+    FROM (
+        SELECT 'contact' AS metric, COALESCE(status, '') AS status,
+               (created_at AT TIME ZONE 'UTC')::date AS day, 0::numeric AS value
+        FROM crm_contacts_v2 WHERE org_id = %(org_id)s AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'company', COALESCE(status, ''), (created_at AT TIME ZONE 'UTC')::date, 0
+        FROM crm_companies_v2 WHERE org_id = %(org_id)s AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'lead', COALESCE(status, ''), (created_at AT TIME ZONE 'UTC')::date, 0
+        FROM crm_leads_v2 WHERE org_id = %(org_id)s AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'activity', COALESCE(status, ''), (created_at AT TIME ZONE 'UTC')::date, 0
+        FROM crm_activities_v2 WHERE org_id = %(org_id)s AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'deal', COALESCE(status, ''), (created_at AT TIME ZONE 'UTC')::date, COALESCE(value, 0)
+        FROM crm_deals_v2 WHERE org_id = %(org_id)s AND deleted_at IS NULL
+        UNION ALL
+        SELECT 'deal_closed', status, actual_close_date, COALESCE(value, 0)
+        FROM crm_deals_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL
+          AND status IN ('won', 'lost') AND actual_close_date IS NOT NULL
+    ) src
+    GROUP BY metric, status, day
+    ON CONFLICT (org_id, metric, status, day) DO UPDATE SET
+        count = crm_org_metrics_rollup.count + EXCLUDED.count,
+        value_sum = crm_org_metrics_rollup.value_sum + EXCLUDED.value_sum,
+        updated_at = now()
+"""
+
+
+@lru_cache(maxsize=None)
+def _tracked_models():
+    from contacts_v2.models import ContactV2
+    from companies_v2.models import CompanyV2
+    from leads_v2.models import LeadV2
+    from deals_v2.models import DealV2
+    from activities_v2.models import ActivityV2
+    return {
+        ContactV2: 'contact',
+        CompanyV2: 'company',
+        LeadV2: 'lead',
+        DealV2: 'deal',
+        ActivityV2: 'activity',
+    }
+
+
+def _utc_day(value):
+    return value.astimezone(dt_timezone.utc).date() if value else None
+
+
+def contributions(metric, instance) -> dict:
+    """{(metric, status, day): (count, value)} the instance counts towards."""
+    if instance.deleted_at is not None or instance.created_at is None:
+        return {}
+
+    status_value = instance.status or ''
+    value = Decimal('0')
+    if metric == 'deal':
+        value = instance.value or Decimal('0')
+
+    buckets = {(metric, status_value, _utc_day(instance.created_at)): (1, value)}
+    if metric == 'deal' and status_value in ('won', 'lost') and instance.actual_close_date:
+        buckets[('deal_closed', status_value, instance.actual_close_date)] = (1, value)
+    return buckets
+
+
+def apply_deltas(org_id, old: dict, new: dict):
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    for key, (count, value) in old.items():
+        deltas[key][0] -= count
+        deltas[key][1] -= value
+    for key, (count, value) in new.items():
+        deltas[key][0] += count
+        deltas[key][1] += value
+
+    rows = [
+        (str(org_id), metric, status_value, day, count, value)
+        for (metric, status_value, day), (count, value) in deltas.items()
+        if count or value
+    ]
+    if not rows:
+        return
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.executemany(UPSERT_SQL, rows)
+    except Exception as e:
+        # Never fail the entity write over the rollup; let reads fall back.
+        logger.exception(f"Rollup update failed for org={org_id}: {e}")
+        mark_stale(org_id)
+
+
+def _snapshot(metric, instance):
+    deferred = instance.get_deferred_fields()
+    if any(field in deferred for field in TRACKED_FIELDS[metric]):
+        return None
+    return contributions(metric, instance)
+
+
+def _on_post_init(sender, instance, **kwargs):
+    # Runs before from_db() flags the instance as loaded, so new instances
+    # get a snapshot too; pre_save discards it for inserts.
+    metric = _tracked_models().get(sender)
+    if metric:
+        instance._rollup_snapshot = _snapshot(metric, instance)
+
+
+def _on_pre_save(sender, instance, **kwargs):
+    metric = _tracked_models().get(sender)
+    if not metric or kwargs.get('raw'):
+        return
+    if instance._state.adding:
+        instance._rollup_snapshot = {}
+    elif getattr(instance, '_rollup_snapshot', None) is None:
+        # Loaded with deferred fields: read the stored state once.
+        stored = sender._base_manager.filter(pk=instance.pk).only(*TRACKED_FIELDS[metric]).first()
+        instance._rollup_snapshot = contributions(metric, stored) if stored else {}
+
+
+def _on_post_save(sender, instance, **kwargs):
+    metric = _tracked_models().get(sender)
+    if not metric or kwargs.get('raw'):
+        return
+    new = contributions(metric, instance)
+    apply_deltas(instance.org_id, getattr(instance, '_rollup_snapshot', None) or {}, new)
+    instance._rollup_snapshot = new
+
+
+def _on_post_delete(sender, instance, **kwargs):
+    metric = _tracked_models().get(sender)
+    if not metric:
+        return
+    old = getattr(instance, '_rollup_snapshot', None)
+    if old is None:
+        old = contributions(metric, instance)
+    apply_deltas(instance.org_id, old, {})
+    instance._rollup_snapshot = {}
+
+
+def connect_signals():
+    for model in _tracked_models():
+        uid = f'org_rollup_{model._meta.label_lower}'
+        post_init.connect(_on_post_init, sender=model, dispatch_uid=f'{uid}_init')
+        pre_save.connect(_on_pre_save, sender=model, dispatch_uid=f'{uid}_pre_save')
+        post_save.connect(_on_post_save, sender=model, dispatch_uid=f'{uid}_post_save')
+        post_delete.connect(_on_post_delete, sender=model, dispatch_uid=f'{uid}_post_delete')
+
+
+def reconcile_org(org_id):
+    """Rebuild every bucket of one org from the V2 tables."""
+    org_id = str(org_id)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [f'org_rollup:{org_id}'])
+            cursor.execute('DELETE FROM crm_org_metrics_rollup WHERE org_id = %s', [org_id])
+            cursor.execute(RECONCILE_SQL, {'org_id': org_id})
+        OrgMetricsRollupState.objects.update_or_create(
+            org_id=org_id, defaults={'reconciled_at': timezone.now()},
+        )
+
+
+def orgs_due_for_reconcile() -> list:
+    """
+    Orgs whose rollup expires before the next periodic run and that have had
+    rollup writes since their last reconcile.
+    """
+    max_age = settings.CRM_SETTINGS.get('ORG_ROLLUP_MAX_AGE', DEFAULT_ROLLUP_MAX_AGE)
+    cutoff = timezone.now() - timedelta(seconds=max(max_age - RECONCILE_AHEAD, 0))
+    written = OrgMetricsRollup.objects.filter(
+        org_id=OuterRef('org_id'), updated_at__gt=OuterRef('reconciled_at'),
+    )
+    return list(
+        OrgMetricsRollupState.objects.filter(reconciled_at__lt=cutoff)
+        .filter(Exists(written))
+        .values_list('org_id', flat=True)
+    )
+
+
+def mark_stale(org_id):
+    OrgMetricsRollupState.objects.filter(org_id=org_id).delete()
+
+
+def _reconcile_lock_key(org_id) -> str:
+    return f'{ROLLUP_RECONCILE_LOCK_PREFIX}{org_id}'
+
+
+def release_reconcile_lock(org_id):
+    """Called as a reconcile starts, so writes committed after it queue another one."""
+    cache.delete(_reconcile_lock_key(org_id))
+
+
+def _queue_reconcile(org_id):
+    """Queue a reconcile for one org unless one is already queued."""
+    if not cache.add(_reconcile_lock_key(org_id), 1, timeout=300):
+        return
+    from .tasks import reconcile_org_metrics_rollup
+    transaction.on_commit(lambda: reconcile_org_metrics_rollup.delay(str(org_id)))
+
+
+def schedule_reconcile(org_id):
+    """
+    For writes that bypass model signals: mark the org's rollup stale (in
+    the caller's transaction, so readers use live counts as soon as the write
+    is visible) and queue a rebuild.
+    """
+    mark_stale(org_id)
+    _queue_reconcile(org_id)
+
+
+class OrgMetrics:
+    """Bucket totals for one org, summed by (metric, status)."""
+
+    def __init__(self, rows):
+        self._rows = {(row['metric'], row['status']): row for row in rows}
+
+    def _sum(self, key, metric, statuses):
+        return sum(
+            (row[key] or 0 for (m, s), row in self._rows.items()
+             if m == metric and (statuses is None or s in statuses)),
+            0,
+        )
+
+    def count(self, metric, *statuses):
+        return int(self._sum('count', metric, statuses or None))
+
+    def value(self, metric, *statuses):
+        return Decimal(self._sum('value', metric, statuses or None))
+
+    def recent_count(self, metric, *statuses):
+        return int(self._sum('recent_count', metric, statuses or None))
+
+    def recent_value(self, metric, *statuses):
+        return Decimal(self._sum('recent_value', metric, statuses or None))
+
+
+def get_org_metrics(org_id):
+    """
+    Rollup totals for an org, or None when the rollup can't be trusted
+    (never reconciled, or older than ORG_ROLLUP_MAX_AGE) — in which case a
+    reconcile is queued and the caller should use live queries.
+    """
+    max_age = settings.CRM_SETTINGS.get('ORG_ROLLUP_MAX_AGE', DEFAULT_ROLLUP_MAX_AGE)
+    now = timezone.now()
+
+    reconciled_at = OrgMetricsRollupState.objects.filter(
+        org_id=org_id,
+    ).values_list('reconciled_at', flat=True).first()
+    if reconciled_at is None or reconciled_at < now - timedelta(seconds=max_age):
+        _queue_reconcile(org_id)
+        return None
+
+    cutoff = (now - timedelta(days=RECENT_DAYS)).date()
+    rows = OrgMetricsRollup.objects.filter(org_id=org_id).values('metric', 'status').annotate(
+        count=Sum('count'),
+        value=Sum('value_sum'),
+        recent_count=Sum('count', filter=Q(day__gte=cutoff)),
+        recent_value=Sum('value_sum', filter=Q(day__gte=cutoff)),
+    )
+    return OrgMetrics(rows)
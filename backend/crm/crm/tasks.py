@@ -7,8 +7,8 @@ from django.conf import settings
 from django.core.mail import send_mail
 from django.utils import timezone
 
+from crm.member_directory import resolve_owner_emails
 from crm.models import Activity
-from crm.utils import get_user_email_from_org_service
 
 logger = logging.getLogger(__name__)
 
@@ -32,12 +32,13 @@ def send_activity_reminders(self, lookahead_minutes: int = 15) -> Dict:
     now = timezone.now()
     lookahead_time = now + timedelta(minutes=lookahead_minutes)
     
-    activities_to_remind = Activity.objects.filter(
+    activities_to_remind = list(Activity.objects.filter(
         reminder_at__lte=lookahead_time,
         reminder_sent=False,
-    ).select_related('contact', 'company').order_by('reminder_at')
+    ).select_related('contact', 'company').order_by('reminder_at'))
     
-    count = activities_to_remind.count()
+    count = len(activities_to_remind)
+    owner_emails = resolve_owner_emails(activities_to_remind)
     logger.info(f"Found {count} reminder(s) to send (due between now and {lookahead_time})")
     
     sent = 0
@@ -46,7 +47,7 @@ def send_activity_reminders(self, lookahead_minutes: int = 15) -> Dict:
     
     for activity in activities_to_remind:
         try:
-            owner_email = get_user_email_from_org_service(activity.owner_id, activity.org_id)
+            owner_email = owner_emails.get((activity.owner_id, activity.org_id))
             
             if not owner_email:
                 fallback_email = getattr(settings, 'REMINDER_FALLBACK_EMAIL', None)
@@ -132,78 +133,183 @@ Due Date: {due_date}
 
 
 @shared_task(bind=True, name='crm.tasks.send_activity_v2_reminders')
-def send_activity_v2_reminders(self, lookahead_minutes: int = 15) -> Dict:
-    from activities_v2.models import ActivityV2
+def send_activity_v2_reminders(self, lookahead_minutes: int = 0) -> Dict:
+    """
+    Safety net behind the reminder wheel (``activities_v2.reminder_wheel``):
+    send V2 reminders due within ``lookahead_minutes`` that the wheel missed
+    and re-add upcoming ones to it. Batches are claimed with SKIP LOCKED, so
+    this never double-sends alongside the wheel or another worker.
+    """
+    from activities_v2.reminder_wheel import resync
+    from activities_v2.reminders import dispatch_due_reminders
 
-    logger.info("Starting V2 activity reminder task")
+    result = dispatch_due_reminders(lookahead_minutes)
+    try:
+        result['rescheduled'] = resync()
+    except Exception as e:
+        logger.warning(f"[V2] Could not resync the reminder wheel: {e}")
+    logger.info(f"[V2] Activity reminder sweep completed: {result}")
+    return result
 
-    now = timezone.now()
-    lookahead_time = now + timedelta(minutes=lookahead_minutes)
 
-    activities_to_remind = ActivityV2.objects.filter(
-        reminder_at__lte=lookahead_time,
-        reminder_sent=False,
-        deleted_at__isnull=True,
-        status__in=['pending', 'in_progress'],
-    ).order_by('reminder_at')
+@shared_task(bind=True, name='crm.tasks.send_due_activity_reminders', ignore_result=True)
+def send_due_activity_reminders(self, activity_ids) -> Dict:
+    """Send the reminders the reminder wheel popped as due."""
+    from activities_v2.reminders import dispatch_reminders
 
-    count = activities_to_remind.count()
-    logger.info(f"[V2] Found {count} reminder(s) due between now and {lookahead_time}")
+    result = dispatch_reminders(activity_ids)
+    if result['failed'] or result['skipped']:
+        logger.info(f"[V2] Due reminder batch: {result}")
+    return result
 
-    sent = 0
-    failed = 0
-    skipped = 0
 
-    for activity in activities_to_remind:
+@shared_task(bind=True, name='crm.tasks.reconcile_org_metrics_rollup', ignore_result=True)
+def reconcile_org_metrics_rollup(self, org_id: str = None) -> Dict:
+    """
+    Rebuild org metrics rollup rows from the V2 tables.
+
+    With ``org_id`` only that org is rebuilt (queued when a reader finds
+    its rollup stale); otherwise the orgs whose rollup is about to expire
+    and has been written to since it was last rebuilt.
+    """
+    from crm.rollups import orgs_due_for_reconcile, reconcile_org, release_reconcile_lock
+
+    org_ids = [org_id] if org_id else orgs_due_for_reconcile()
+
+    reconciled = failed = 0
+    for oid in org_ids:
+        release_reconcile_lock(oid)
         try:
-            owner_email = get_user_email_from_org_service(activity.owner_id, activity.org_id)
+            reconcile_org(oid)
+            reconciled += 1
+        except Exception as e:
+            failed += 1
+            logger.exception(f"Failed to reconcile metrics rollup for org {oid}: {e}")
 
-            if not owner_email:
-                fallback_email = getattr(settings, 'REMINDER_FALLBACK_EMAIL', None)
-                if fallback_email:
-                    owner_email = fallback_email
-                else:
-                    logger.warning(f"[V2] No email for owner {activity.owner_id}, skipping activity {activity.id}")
-                    skipped += 1
-                    continue
+    logger.info(f"Metrics rollup reconcile: {reconciled} orgs rebuilt, {failed} failed")
+    return {'reconciled': reconciled, 'failed': failed}
 
-            subject = f"Reminder: {activity.subject}"
 
-            context = {
-                'activity_type': activity.activity_type.title(),
-                'subject': activity.subject,
-                'due_date': activity.due_date.strftime('%B %d, %Y at %I:%M %p') if activity.due_date else 'No due date',
-                'contact_name': None,
-                'company_name': None,
-                'description': activity.description or '',
-                'activity_url': f"{settings.FRONTEND_URL}/activities/{activity.activity_type}s/{activity.id}",
-            }
+@shared_task(
+    bind=True, name='crm.tasks.run_import_job', ignore_result=True,
+    acks_late=True, reject_on_worker_lost=True, max_retries=3,
+)
+def run_import_job(self, job_id: str) -> Dict:
+    """
+    Process a V2 import job, resuming after its last committed chunk.
 
-            message = _render_email_text(context)
+    Unexpected failures are retried (the checkpoint makes that safe); once
+    retries run out the job is marked failed.
+    """
+    from crm.models import ImportJob
+    from crm_service.import_jobs import mark_failed, run_import_job as run_job
 
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[owner_email],
-                fail_silently=False,
-            )
+    try:
+        job_status = run_job(job_id)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"Import job {job_id} interrupted, retrying: {e}")
+            raise self.retry(exc=e, countdown=30 * (self.request.retries + 1))
+        logger.exception(f"Import job {job_id} failed: {e}")
+        job = ImportJob.objects.filter(pk=job_id).first()
+        if job and not job.is_finished:
+            mark_failed(job, str(e))
+        return {'job_id': job_id, 'status': ImportJob.Status.FAILED}
 
-            activity.reminder_sent = True
-            activity.save(update_fields=['reminder_sent'])
+    return {'job_id': job_id, 'status': job_status}
 
-            logger.info(f"[V2] Sent reminder to {owner_email} for activity {activity.id}")
-            sent += 1
 
-        except Exception as e:
-            logger.exception(f"[V2] Failed to send reminder for activity {activity.id}: {e}")
-            failed += 1
+@shared_task(bind=True, name='crm.tasks.resume_stalled_import_jobs', ignore_result=True)
+def resume_stalled_import_jobs(self) -> Dict:
+    """Re-queue import jobs whose checkpoint hasn't moved for IMPORT_JOB_STALL_SECONDS."""
+    from crm_service.import_jobs import stalled_jobs
+
+    job_ids = [str(job_id) for job_id in stalled_jobs().values_list('id', flat=True)]
+    for job_id in job_ids:
+        run_import_job.delay(job_id)
+
+    if job_ids:
+        logger.info(f"Re-queued {len(job_ids)} stalled import job(s)")
+    return {'requeued': len(job_ids)}
+
 
-    result = {'sent': sent, 'failed': failed, 'skipped': skipped, 'total': count}
-    logger.info(f"[V2] Activity reminder task completed: {result}")
+@shared_task(
+    bind=True, name='crm.tasks.run_export_job', ignore_result=True,
+    acks_late=True, reject_on_worker_lost=True, max_retries=3,
+)
+def run_export_job(self, job_id: str) -> Dict:
+    """
+    Write a V2 export job's file. Interrupted runs are retried from the
+    start; once retries run out the job is marked failed.
+    """
+    from crm.models import ExportJob
+    from crm_service.export_jobs import mark_failed, run_export_job as run_job
+
+    try:
+        job_status = run_job(job_id)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"Export job {job_id} interrupted, retrying: {e}")
+            raise self.retry(exc=e, countdown=30 * (self.request.retries + 1))
+        logger.exception(f"Export job {job_id} failed: {e}")
+        job = ExportJob.objects.filter(pk=job_id).first()
+        if job and not job.is_finished:
+            mark_failed(job, str(e))
+        return {'job_id': job_id, 'status': ExportJob.Status.FAILED}
+
+    return {'job_id': job_id, 'status': job_status}
+
+
+@shared_task(bind=True, name='crm.tasks.purge_expired_export_jobs', ignore_result=True)
+def purge_expired_export_jobs(self) -> Dict:
+    """Delete export jobs (and their files) older than EXPORT_JOB_RETENTION_DAYS."""
+    from crm_service.export_jobs import expired_jobs, purge_job
+
+    purged = 0
+    for job in expired_jobs().iterator():
+        purge_job(job)
+        purged += 1
+
+    if purged:
+        logger.info(f"Purged {purged} expired export job(s)")
+    return {'purged': purged}
+
+
+@shared_task(bind=True, name='crm.tasks.maintain_audit_partitions', ignore_result=True)
+def maintain_audit_partitions(self) -> Dict:
+    """Create upcoming audit log partitions and apply per-org audit retention."""
+    from crm.audit_partitions import maintain_partitions
+
+    result = maintain_partitions()
+    if result['created_partitions'] or result['expired_partitions'] or result['deleted_rows']:
+        logger.info(f"Audit log partition maintenance: {result}")
     return result
 
 
+@shared_task(bind=True, name='crm.tasks.relay_event_outbox', ignore_result=True)
+def relay_event_outbox(self) -> Dict:
+    """Send queued outbox events to Kafka (no-op while another relay holds the lock)."""
+    from crm.events import delivery_metrics
+    from crm.outbox import drain
+
+    sent = drain(max_seconds=50)
+    if sent:
+        logger.info(f"Relayed {sent} event(s); delivery totals: {delivery_metrics.snapshot()}")
+    return {'sent': sent}
+
+
+@shared_task(bind=True, name='crm.tasks.purge_event_outbox_dead_letters', ignore_result=True)
+def purge_event_outbox_dead_letters(self) -> Dict:
+    """Dead-letter stranded outbox rows and drop dead letters past retention."""
+    from crm.outbox import backlog, purge_dead_letters
+
+    result = purge_dead_letters()
+    stats = backlog()
+    if result['dead_lettered'] or result['purged'] or stats['dead_letters']:
+        logger.info(f"Event outbox dead letters: {result}; backlog: {stats}")
+    return {**result, **stats}
+
+
 @shared_task(name='crm.tasks.test_celery')
 def test_celery():
     logger.info("Celery test task executed successfully!")
@@ -10,7 +10,6 @@ import httpx
 from django.conf import settings as django_settings
 from django.db import models
 from django.db.models import Sum, Count, Q
-from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -1762,17 +1761,15 @@ from .resources import (
     ContactResource, CompanyResource, LeadResource,
     DealResource, ActivityResource,
 )
-from .utils import fetch_member_names as _fetch_member_names
+from .member_directory import get_member_names
+from crm_service.exports import stream_resource_csv
 
 
-def _export_csv(resource_class, queryset, org_id, filename):
-    """Build an HttpResponse with CSV data using django-import-export."""
-    member_map = _fetch_member_names(org_id)
+def _export_csv(resource_class, queryset, org_id, filename, request=None):
+    """Stream the resource's CSV export of ``queryset``, one cursor chunk at a time."""
+    member_map = get_member_names(org_id, request)
     resource = resource_class(member_map=member_map)
-    dataset = resource.export(list(queryset))
-    response = HttpResponse(dataset.csv, content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    return response
+    return stream_resource_csv(resource, queryset, filename)
 
 
 def _parse_ids(request):
@@ -1834,7 +1831,7 @@ class ContactExportView(BaseAPIView):
 
         qs = qs[:EXPORT_MAX_ROWS]
         ts = time_mod.strftime('%Y-%m-%d')
-        return _export_csv(ContactResource, qs, self.get_org_id(), f'contacts-{ts}.csv')
+        return _export_csv(ContactResource, qs, self.get_org_id(), f'contacts-{ts}.csv', request)
 
 
 class CompanyExportView(BaseAPIView):
@@ -1864,7 +1861,7 @@ class CompanyExportView(BaseAPIView):
 
         qs = qs[:EXPORT_MAX_ROWS]
         ts = time_mod.strftime('%Y-%m-%d')
-        return _export_csv(CompanyResource, qs, self.get_org_id(), f'companies-{ts}.csv')
+        return _export_csv(CompanyResource, qs, self.get_org_id(), f'companies-{ts}.csv', request)
 
 
 class LeadExportView(BaseAPIView):
@@ -1894,7 +1891,7 @@ class LeadExportView(BaseAPIView):
 
         qs = qs[:EXPORT_MAX_ROWS]
         ts = time_mod.strftime('%Y-%m-%d')
-        return _export_csv(LeadResource, qs, self.get_org_id(), f'leads-{ts}.csv')
+        return _export_csv(LeadResource, qs, self.get_org_id(), f'leads-{ts}.csv', request)
 
 
 class DealExportView(BaseAPIView):
@@ -1927,7 +1924,7 @@ class DealExportView(BaseAPIView):
 
         qs = qs[:EXPORT_MAX_ROWS]
         ts = time_mod.strftime('%Y-%m-%d')
-        return _export_csv(DealResource, qs, self.get_org_id(), f'deals-{ts}.csv')
+        return _export_csv(DealResource, qs, self.get_org_id(), f'deals-{ts}.csv', request)
 
 
 class ActivityExportView(BaseAPIView):
@@ -1963,4 +1960,4 @@ class ActivityExportView(BaseAPIView):
 
         qs = qs[:EXPORT_MAX_ROWS]
         ts = time_mod.strftime('%Y-%m-%d')
-        return _export_csv(ActivityResource, qs, self.get_org_id(), f'activities-{ts}.csv')
+        return _export_csv(ActivityResource, qs, self.get_org_id(), f'activities-{ts}.csv', request)
@@ -3,14 +3,28 @@ Audit logging utility for V2 entities.
 
 Reuses the existing CRMAuditLog model with entity_type suffixed '_v2'.
 Provides a mixin for DRF ViewSets to auto-log create/update/delete
-and publish Kafka events for cross-service communication.
+and publish Kafka events for cross-service communication. Events go
+through the transactional outbox (``crm.events``), never to the broker
+from the request thread.
+
+Audit rows are queued, not inserted on the spot: each entry joins the
+buffer once its transaction commits (so rolled-back writes leave no
+audit row), and inside ``buffered_audit()`` — which
+``crm.middleware.AuditBufferMiddleware`` opens around every request — the
+buffer is written with a single ``bulk_create`` when the block ends.
+Outside a buffered block (tasks, shell) entries are written on commit.
 """
+import copy
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional
 from uuid import UUID
 
+from django.db import transaction
+
 from crm.models import CRMAuditLog
-from crm.events import publish_event
+from crm.events import build_event, publish_events
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +39,11 @@ KAFKA_TOPIC_MAP = {
 }
 
 
-def _publish_v2_event(*, org_id, actor_id, action, entity_type, entity_id,
-                       entity_name='', changes=None):
+def _build_v2_event(*, org_id, actor_id, action, entity_type, entity_id,
+                    entity_name='', changes=None):
     topic = KAFKA_TOPIC_MAP.get(entity_type, 'crm.events')
     base_type = entity_type.replace('_v2', '')
-    publish_event(
+    return build_event(
         topic=topic,
         event_type=f'{base_type}.{action}',
         data={
@@ -43,6 +57,59 @@ def _publish_v2_event(*, org_id, actor_id, action, entity_type, entity_id,
     )
 
 
+def _publish_v2_event(**kwargs):
+    """Queue the Kafka event in the outbox, in the caller's transaction."""
+    publish_events([_build_v2_event(**kwargs)])
+
+
+_pending_audit = ContextVar('pending_v2_audit', default=None)
+
+
+def _write_audit_entries(entries):
+    if not entries:
+        return
+    try:
+        CRMAuditLog.objects.bulk_create(entries, batch_size=1000)
+    except Exception:
+        logger.exception(f"Failed to write {len(entries)} V2 audit log entries")
+
+
+def _queue_audit_entries(entries):
+    def enqueue():
+        pending = _pending_audit.get()
+        if pending is None:
+            _write_audit_entries(entries)
+        else:
+            pending.extend(entries)
+
+    transaction.on_commit(enqueue)
+
+
+@contextmanager
+def buffered_audit():
+    """Collect the audit rows committed inside the block and insert them together at the end."""
+    if _pending_audit.get() is not None:
+        yield
+        return
+    token = _pending_audit.set([])
+    try:
+        yield
+    finally:
+        entries = _pending_audit.get()
+        _pending_audit.reset(token)
+        _write_audit_entries(entries)
+
+
+def _request_context(request):
+    if request is None:
+        return None, None
+    ip_address = (
+        request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
+        or request.META.get('REMOTE_ADDR')
+    )
+    return ip_address, request.META.get('HTTP_USER_AGENT', '')[:500]
+
+
 def log_v2_action(
     *,
     org_id,
@@ -54,30 +121,78 @@ def log_v2_action(
     changes: dict = None,
     request=None,
 ):
-    ip_address = None
-    user_agent = None
+    ip_address, user_agent = _request_context(request)
 
-    if request is not None:
-        ip_address = (
-            request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
-            or request.META.get('REMOTE_ADDR')
+    _queue_audit_entries([
+        CRMAuditLog(
+            org_id=org_id,
+            actor_id=actor_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            entity_name=(entity_name or '')[:255],
+            changes=changes or {},
+            ip_address=ip_address,
+            user_agent=user_agent,
         )
-        user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
+    ])
 
-    try:
-        CRMAuditLog.objects.create(
+
+def log_v2_bulk_action(
+    *,
+    org_id,
+    actor_id,
+    action: str,
+    instances,
+    changes_by_id: dict = None,
+    request=None,
+):
+    """
+    Audit and publish one action applied to many V2 instances: the audit
+    rows are queued together and the Kafka events written to the outbox
+    with one insert.
+    """
+    if not instances:
+        return
+    ip_address, user_agent = _request_context(request)
+    changes_by_id = changes_by_id or {}
+    entries = [
+        (
+            instance.id,
+            ENTITY_TYPE_MAP.get(type(instance).__name__, type(instance).__name__.lower()),
+            _get_entity_name(instance, None)[:255],
+            changes_by_id.get(instance.id) or {},
+        )
+        for instance in instances
+    ]
+
+    _queue_audit_entries([
+        CRMAuditLog(
             org_id=org_id,
             actor_id=actor_id,
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
-            entity_name=entity_name or '',
-            changes=changes or {},
+            entity_name=entity_name,
+            changes=changes,
             ip_address=ip_address,
             user_agent=user_agent,
         )
-    except Exception:
-        logger.exception("Failed to create V2 audit log entry")
+        for entity_id, entity_type, entity_name, changes in entries
+    ])
+
+    publish_events([
+        _build_v2_event(
+            org_id=org_id,
+            actor_id=actor_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            entity_name=entity_name,
+            changes=changes,
+        )
+        for entity_id, entity_type, entity_name, changes in entries
+    ])
 
 
 def _get_entity_name(instance, entity_type: str) -> str:
@@ -117,12 +232,23 @@ class AuditLogV2Mixin:
     DRF ViewSet mixin — auto-logs create, update, and destroy actions
     for V2 entities to CRMAuditLog.
 
-    Works at the view-method level (create/update/partial_update/destroy)
-    so it doesn't interfere with existing perform_* overrides.
+    Works at the view-method level (create/update/destroy) so it doesn't
+    interfere with existing perform_* overrides. DRF's partial_update goes
+    through update(), and the instance loaded for the snapshot is the one
+    the write updates, so auditing costs no extra reads. Each action runs
+    in one transaction, so the entity write and its outbox event commit
+    (or roll back) together.
     """
 
     audit_tracked_fields = []
 
+    def get_object(self):
+        instance = getattr(self, '_audit_instance', None)
+        if instance is None:
+            instance = self._audit_instance = super().get_object()
+        return instance
+
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         response = super().create(request, *args, **kwargs)
         if response.status_code in (200, 201):
@@ -131,26 +257,17 @@ class AuditLogV2Mixin:
                 self._audit_log_from_response('create', response.data, request=request)
         return response
 
+    @transaction.atomic
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         old_snapshot = self._snapshot(instance)
         response = super().update(request, *args, **kwargs)
         if response.status_code == 200:
-            instance.refresh_from_db()
-            changes = self._compute_changes(old_snapshot, instance)
-            self._audit_log('update', instance, changes=changes, request=request)
-        return response
-
-    def partial_update(self, request, *args, **kwargs):
-        instance = self.get_object()
-        old_snapshot = self._snapshot(instance)
-        response = super().partial_update(request, *args, **kwargs)
-        if response.status_code == 200:
-            instance.refresh_from_db()
             changes = self._compute_changes(old_snapshot, instance)
             self._audit_log('update', instance, changes=changes, request=request)
         return response
 
+    @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
@@ -162,7 +279,7 @@ class AuditLogV2Mixin:
     def _snapshot(self, instance):
         snap = {}
         if hasattr(instance, 'entity_data'):
-            snap['entity_data'] = dict(instance.entity_data)
+            snap['entity_data'] = copy.deepcopy(instance.entity_data)
         for f in self.audit_tracked_fields:
             snap[f] = getattr(instance, f, None)
         return snap
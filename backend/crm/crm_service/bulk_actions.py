@@ -0,0 +1,151 @@
+"""
+Set-based bulk update and soft delete for V2 entities.
+
+The ``bulk_update`` / ``bulk_delete`` actions of the contact, company, lead
+and deal viewsets read the selected rows once (locked, for the audit
+before-values and names), write them with a single
+``UPDATE ... WHERE id IN (...)`` — ``entity_data`` merged in SQL with
+``jsonb ||`` — and audit them with one ``bulk_create``; their events join
+the event outbox in the same transaction.
+
+``QuerySet.update`` bypasses model signals, so the search columns are
+refreshed in SQL when a searchable key changes and the org's metrics
+rollup is reconciled when a rollup field changes.
+"""
+from django.db import transaction
+from django.db.models import F, JSONField, Value
+from django.db.models.expressions import CombinedExpression
+from django.utils import timezone
+from rest_framework import serializers
+
+from crm.rollups import TRACKED_FIELDS, schedule_reconcile
+from crm_service.audit_v2 import log_v2_bulk_action
+from crm_service.search_index import refresh_search_columns
+from forms_v2.uniqueness import UniquenessEngine, unique_violations
+from forms_v2.validation import get_form_validator
+
+ROLLUP_FIELDS = {field for fields in TRACKED_FIELDS.values() for field in fields}
+
+
+def _actor_id(request, org_id):
+    return request.user.id if hasattr(request, 'user') and request.user else org_id
+
+
+def _selected(model, org_id, ids):
+    return model.objects.filter(id__in=ids, org_id=org_id, deleted_at__isnull=True)
+
+
+def _search_keys(model):
+    keys = set(model.SEARCH_FIELDS)
+    for _, fields in model.SEARCH_VECTOR_WEIGHTS:
+        keys.update(fields)
+    return keys
+
+
+def _changes(instance, system_updates, entity_data_updates):
+    """Audit diff in the shape ``AuditLogV2Mixin`` records for single updates."""
+    changes = {}
+    old_data = instance.entity_data or {}
+    for key, new_val in entity_data_updates.items():
+        old_val = old_data.get(key)
+        if old_val != new_val:
+            changes[key] = {'old': old_val, 'new': new_val}
+    for field, new_val in system_updates.items():
+        old_val = getattr(instance, field)
+        if str(old_val) != str(new_val):
+            changes[field] = {
+                'old': str(old_val) if old_val is not None else None,
+                'new': str(new_val) if new_val is not None else None,
+            }
+    return changes
+
+
+def _check_unique(model, entity_type, org_id, instances, entity_data_updates):
+    """Reject setting one unique value on several rows, or one another row holds."""
+    validator = get_form_validator(org_id, entity_type)
+    fields = [name for name in validator.unique_fields if entity_data_updates.get(name)]
+    if not fields:
+        return
+    engine = UniquenessEngine(model, org_id, fields)
+    conflicts = engine.check(
+        [entity_data_updates] * len(instances), [instance.pk for instance in instances],
+    )
+    merged = {}
+    for record_conflicts in conflicts:
+        merged.update(record_conflicts)
+    errors = validator.conflict_errors(merged)
+    if errors:
+        raise serializers.ValidationError({'entity_data': errors})
+
+
+def bulk_update_entities(model, entity_type, org_id, ids, system_updates, entity_data_updates, request) -> int:
+    """
+    Apply the same column values and ``entity_data`` keys to the selected
+    rows. Setting a unique form field on several rows fails as a whole with
+    the usual validation error.
+    """
+    with transaction.atomic():
+        instances = list(
+            _selected(model, org_id, ids)
+            .select_for_update()
+            .only('id', 'entity_data', *system_updates)
+        )
+        if not instances:
+            return 0
+        if entity_data_updates:
+            _check_unique(model, entity_type, org_id, instances, entity_data_updates)
+
+        values = dict(system_updates)
+        if entity_data_updates:
+            values['entity_data'] = CombinedExpression(
+                F('entity_data'), '||', Value(entity_data_updates, output_field=JSONField()),
+                output_field=JSONField(),
+            )
+        rows = model.objects.filter(pk__in=[instance.pk for instance in instances])
+        with unique_violations(entity_type, org_id):
+            count = rows.update(**values, updated_at=timezone.now())
+
+        if set(entity_data_updates) & _search_keys(model):
+            refresh_search_columns(rows)
+        if set(system_updates) & ROLLUP_FIELDS:
+            schedule_reconcile(org_id)
+
+        changes_by_id = {
+            instance.id: _changes(instance, system_updates, entity_data_updates)
+            for instance in instances
+        }
+        for instance in instances:
+            instance.entity_data = {**(instance.entity_data or {}), **entity_data_updates}
+        log_v2_bulk_action(
+            org_id=org_id,
+            actor_id=_actor_id(request, org_id),
+            action='update',
+            instances=instances,
+            changes_by_id=changes_by_id,
+            request=request,
+        )
+    return count
+
+
+def bulk_soft_delete(model, org_id, ids, request) -> int:
+    """Soft-delete the selected rows in one UPDATE."""
+    deleted_by = request.user.id if hasattr(request, 'user') else None
+    with transaction.atomic():
+        instances = list(_selected(model, org_id, ids).select_for_update().only('id', 'entity_data'))
+        if not instances:
+            return 0
+
+        now = timezone.now()
+        count = model.objects.filter(pk__in=[instance.pk for instance in instances]).update(
+            deleted_at=now, deleted_by=deleted_by, updated_at=now,
+        )
+        schedule_reconcile(org_id)
+
+        log_v2_bulk_action(
+            org_id=org_id,
+            actor_id=_actor_id(request, org_id),
+            action='delete',
+            instances=instances,
+            request=request,
+        )
+    return count
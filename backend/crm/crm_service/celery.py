@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_shutdown, worker_shutdown
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm_service.settings')
 
@@ -19,11 +20,48 @@ app.conf.beat_schedule = {
         'schedule': crontab(minute='*/5'),
         'options': {'expires': 240},
     },
+    'reconcile-org-metrics-rollup': {
+        'task': 'crm.tasks.reconcile_org_metrics_rollup',
+        'schedule': crontab(minute='*/15'),
+        'options': {'expires': 840},
+    },
+    'resume-stalled-import-jobs': {
+        'task': 'crm.tasks.resume_stalled_import_jobs',
+        'schedule': crontab(minute='*/5'),
+        'options': {'expires': 240},
+    },
+    'purge-expired-export-jobs': {
+        'task': 'crm.tasks.purge_expired_export_jobs',
+        'schedule': crontab(minute=30, hour=3),
+    },
+    'maintain-audit-partitions': {
+        'task': 'crm.tasks.maintain_audit_partitions',
+        'schedule': crontab(minute=0, hour=2),
+    },
+    'relay-event-outbox': {
+        'task': 'crm.tasks.relay_event_outbox',
+        'schedule': crontab(),
+        'options': {'expires': 50},
+    },
+    'purge-event-outbox-dead-letters': {
+        'task': 'crm.tasks.purge_event_outbox_dead_letters',
+        'schedule': crontab(minute=45, hour=3),
+    },
 }
 
 app.conf.timezone = 'UTC'
 
 
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_kafka_producer(**kwargs):
+    """Deliver events the relay handed to the producer before the worker exits."""
+    from django.conf import settings
+    from crm.events import flush_events
+
+    flush_events(settings.KAFKA_PRODUCER_SHUTDOWN_TIMEOUT)
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -0,0 +1,135 @@
+"""
+Batched display-name lookups for V2 list serializers.
+
+List rows reference contacts, companies and pipelines by id. Instead of one
+query per row and reference, ``DisplayNameResolver`` collects every id of a
+kind on the page the first time that kind is asked for and loads them all
+in one ``id__in`` query projected to the name fields.
+
+Each kind keeps the exact strings its serializers returned before batching:
+``contact`` falls back to the email (deal lists) while ``contact_name`` does
+not (activity lists), and ``company_including_deleted`` still names
+soft-deleted companies with ``CompanyV2.get_name`` (contact lists) where
+``company`` skips them.
+
+Serializers opt in with ``DisplayNameMixin`` and
+``Meta.list_serializer_class = DisplayNameListSerializer`` so that a
+``many=True`` page shares one resolver.
+"""
+from django.db import models
+from rest_framework import serializers
+
+
+def _contact_name(first_name, last_name, email=None):
+    return f"{first_name or ''} {last_name or ''}".strip() or (email or '')
+
+
+def _load_contacts(ids):
+    from contacts_v2.models import ContactV2
+    rows = ContactV2.objects.filter(id__in=ids, deleted_at__isnull=True).values_list(
+        'id', 'entity_data__first_name', 'entity_data__last_name', 'entity_data__email',
+    )
+    return {row[0]: _contact_name(*row[1:]) for row in rows}
+
+
+def _load_contact_names(ids):
+    from contacts_v2.models import ContactV2
+    rows = ContactV2.objects.filter(id__in=ids, deleted_at__isnull=True).values_list(
+        'id', 'entity_data__first_name', 'entity_data__last_name',
+    )
+    return {row[0]: _contact_name(*row[1:]) for row in rows}
+
+
+def _load_companies(ids):
+    from companies_v2.models import CompanyV2
+    rows = CompanyV2.objects.filter(id__in=ids, deleted_at__isnull=True).values_list(
+        'id', 'entity_data__name',
+    )
+    return {pk: name or '' for pk, name in rows}
+
+
+def _load_companies_including_deleted(ids):
+    from companies_v2.models import CompanyV2
+    companies = CompanyV2.objects.filter(id__in=ids).only('id', 'entity_data')
+    return {company.id: company.get_name() for company in companies}
+
+
+def _load_pipelines(ids):
+    from pipelines_v2.models import PipelineV2
+    return dict(
+        PipelineV2.objects.filter(id__in=ids, deleted_at__isnull=True).values_list('id', 'name')
+    )
+
+
+# kind -> (foreign key attribute on the row, loader)
+DISPLAY_NAME_SOURCES = {
+    'contact': ('contact_id', _load_contacts),
+    'contact_name': ('contact_id', _load_contact_names),
+    'company': ('company_id', _load_companies),
+    'company_including_deleted': ('company_id', _load_companies_including_deleted),
+    'pipeline': ('pipeline_id', _load_pipelines),
+}
+
+
+class DisplayNameResolver:
+    """Lazily loads display names for every row of a page, one query per kind."""
+
+    def __init__(self, instances):
+        self.instances = instances
+        self._names = {}
+
+    def get(self, kind, pk, default=''):
+        if not pk:
+            return default
+        if kind not in self._names:
+            attr, loader = DISPLAY_NAME_SOURCES[kind]
+            ids = {getattr(obj, attr, None) for obj in self.instances}
+            ids.discard(None)
+            self._names[kind] = loader(ids) if ids else {}
+        return self._names[kind].get(pk, default)
+
+    def contact(self, pk, default=''):
+        return self.get('contact', pk, default)
+
+    def contact_name(self, pk, default=''):
+        return self.get('contact_name', pk, default)
+
+    def company(self, pk, default=''):
+        return self.get('company', pk, default)
+
+    def company_including_deleted(self, pk, default=''):
+        return self.get('company_including_deleted', pk, default)
+
+    def pipeline(self, pk, default=''):
+        return self.get('pipeline', pk, default)
+
+
+class DisplayNameListSerializer(serializers.ListSerializer):
+    """Builds one resolver for the whole page and hands it to the child."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = list(iterable)
+        self.child.display_names = DisplayNameResolver(instances)
+        try:
+            return super().to_representation(instances)
+        finally:
+            self.child.display_names = None
+
+
+class DisplayNameMixin:
+    """
+    Serializer mixin exposing ``self.display_names``. Outside a list
+    serializer it falls back to a resolver over the single instance.
+    """
+
+    display_names = None
+
+    def to_representation(self, instance):
+        if self.display_names is None:
+            self.display_names = DisplayNameResolver([instance])
+            try:
+                return super().to_representation(instance)
+            finally:
+                self.display_names = None
+        return super().to_representation(instance)
@@ -0,0 +1,386 @@
+"""
+Background export jobs for the V2 entities.
+
+``?async=true`` (or ``file_format=parquet``) on a V2 ``export`` action
+records an ``ExportJob`` and queues ``crm.tasks.run_export_job``; the API
+answers 202 with the job's URL. Plain exports keep streaming CSV up to the
+action's row cap and flag a cut-off export with ``X-Export-Truncated``, so
+clients that save the response as a file keep working.
+
+The job stores a declarative spec rather than the queryset: the request's
+filter, search and ordering parameters (only the names in
+``EXPORT_PARAMS``) and the parsed ``ids``. The worker rebuilds the queryset
+by running the entity's viewset ``get_queryset`` against those parameters
+and the job's org, so it applies the same validation and whitelists as the
+request did.
+
+The task walks the same server-side cursor as the streaming exports
+(``crm_service.exports``), writes each chunk to a local temporary file as
+gzip-compressed CSV (or Parquet, when pyarrow is installed), records
+``processed_rows`` after every chunk and finally saves the file to
+``default_storage``. ``GET /api/v2/export-jobs/<id>/download/`` serves it
+once the job has completed; files are purged after
+``EXPORT_JOB_RETENTION_DAYS``.
+"""
+import csv
+import gzip
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+from uuid import UUID
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from activities_v2.models import ActivityV2
+from activities_v2.resources import ActivityV2ExportResource
+from companies_v2.models import CompanyV2
+from contacts_v2.models import ContactV2
+from crm.member_directory import get_member_names
+from crm.models import ExportJob
+from crm_service.exports import (
+    CompanyCSVExport, ContactCSVExport, DealCSVExport, LeadCSVExport, ResourceExport,
+)
+from deals_v2.models import DealV2
+from leads_v2.models import LeadV2
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MODELS = {
+    ExportJob.EntityType.CONTACT: ContactV2,
+    ExportJob.EntityType.COMPANY: CompanyV2,
+    ExportJob.EntityType.LEAD: LeadV2,
+    ExportJob.EntityType.DEAL: DealV2,
+    ExportJob.EntityType.ACTIVITY: ActivityV2,
+}
+
+# Viewsets whose get_queryset rebuilds a job's queryset (imported lazily:
+# the view modules import this one).
+EXPORT_VIEWSETS = {
+    ExportJob.EntityType.CONTACT: 'contacts_v2.views.ContactV2ViewSet',
+    ExportJob.EntityType.COMPANY: 'companies_v2.views.CompanyV2ViewSet',
+    ExportJob.EntityType.LEAD: 'leads_v2.views.LeadV2ViewSet',
+    ExportJob.EntityType.DEAL: 'deals_v2.views.DealV2ViewSet',
+    ExportJob.EntityType.ACTIVITY: 'activities_v2.views.ActivityV2ViewSet',
+}
+
+# Query parameters the V2 list/export querysets read; anything else is not
+# stored with a job.
+EXPORT_PARAMS = frozenset({
+    'search', 'mode', 'filters', 'sort_by', 'sort_direction', 'ordering',
+    'status', 'source', 'assigned_to', 'owner_id', 'company_id', 'contact_id',
+    'deal_id', 'lead_id', 'pipeline_id', 'parent_company_id', 'industry', 'size',
+    'stage', 'is_converted', 'activity_type', 'priority', 'call_direction',
+    'call_outcome', 'email_direction',
+})
+
+# The activity export action exports exactly the given ids, ignoring filters.
+IDS_ONLY_ENTITIES = frozenset({ExportJob.EntityType.ACTIVITY})
+
+ENTITY_EXPORTS = {
+    ExportJob.EntityType.CONTACT: ContactCSVExport,
+    ExportJob.EntityType.COMPANY: CompanyCSVExport,
+    ExportJob.EntityType.LEAD: LeadCSVExport,
+    ExportJob.EntityType.DEAL: DealCSVExport,
+}
+
+FILE_EXTENSIONS = {
+    ExportJob.FileFormat.CSV: 'csv.gz',
+    ExportJob.FileFormat.PARQUET: 'parquet',
+}
+
+CONTENT_TYPES = {
+    ExportJob.FileFormat.CSV: 'application/gzip',
+    ExportJob.FileFormat.PARQUET: 'application/vnd.apache.parquet',
+}
+
+DEFAULT_RETENTION_DAYS = 7
+
+
+class ExportConfigError(ValueError):
+    pass
+
+
+def _setting(name, default):
+    return settings.CRM_SETTINGS.get(name, default)
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_spec(request) -> dict:
+    """The declarative part of an export request: whitelisted params and ids."""
+    params = {
+        key: request.query_params.get(key)
+        for key in request.query_params if key in EXPORT_PARAMS
+    }
+    spec = {'params': params}
+    ids_param = request.query_params.get('ids')
+    if ids_param:
+        ids = []
+        for raw in ids_param.split(','):
+            try:
+                ids.append(str(UUID(raw.strip())))
+            except ValueError:
+                continue
+        spec['ids'] = ids
+    return spec
+
+
+def create_export_job(org_id, user_id, entity_type, spec, file_format, base_name) -> ExportJob:
+    """Record the export spec and queue the job once the transaction commits."""
+    job = ExportJob(
+        org_id=org_id,
+        created_by=user_id,
+        entity_type=entity_type,
+        file_format=file_format,
+        spec=spec,
+    )
+    job.file_name = f'{base_name}.{FILE_EXTENSIONS[file_format]}'
+    job.save()
+
+    from crm.tasks import run_export_job as run_export_job_task
+    job_id = str(job.id)
+    transaction.on_commit(lambda: run_export_job_task.delay(job_id))
+    return job
+
+
+def _viewset_class(entity_type):
+    module_name, class_name = EXPORT_VIEWSETS[entity_type].rsplit('.', 1)
+    return getattr(import_module(module_name), class_name)
+
+
+def _spec_request(job) -> Request:
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    query = QueryDict(mutable=True)
+    ids_only = job.entity_type in IDS_ONLY_ENTITIES and 'ids' in job.spec
+    if not ids_only:
+        for key, value in job.spec.get('params', {}).items():
+            if key in EXPORT_PARAMS:
+                query[key] = value
+    http_request.GET = query
+    http_request.META['HTTP_X_ORG_ID'] = str(job.org_id)
+    return Request(http_request)
+
+
+def job_queryset(job):
+    """Rebuild the job's queryset from its spec with the entity viewset."""
+    view = _viewset_class(job.entity_type)(
+        request=_spec_request(job), action='export', format_kwarg=None, args=(), kwargs={},
+    )
+    queryset = view.get_queryset()
+    if 'ids' in job.spec:
+        queryset = queryset.filter(id__in=job.spec['ids'])
+    return queryset
+
+
+def exporter_for(job):
+    if job.entity_type == ExportJob.EntityType.ACTIVITY:
+        resource = ActivityV2ExportResource(member_map=get_member_names(job.org_id))
+        return ResourceExport(resource)
+    exporter = ENTITY_EXPORTS[job.entity_type].for_org(job.org_id)
+    if exporter is None:
+        raise ExportConfigError(
+            f'No form definition found. Please configure {job.entity_type} form first.'
+        )
+    return exporter
+
+
+def _cell(value):
+    return '' if value is None else str(value)
+
+
+def write_csv(path, exporter, queryset, progress):
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(exporter.header())
+        for rows in exporter.iter_rows(queryset):
+            writer.writerows(rows)
+            progress(len(rows))
+
+
+def write_parquet(path, exporter, queryset, progress):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    header = [str(name) for name in exporter.header()]
+    schema = pa.schema([pa.field(name, pa.string()) for name in header])
+    with pq.ParquetWriter(path, schema, compression='snappy') as writer:
+        for rows in exporter.iter_rows(queryset):
+            columns = [[_cell(row[i]) for row in rows] for i in range(len(header))]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            progress(len(rows))
+
+
+WRITERS = {
+    ExportJob.FileFormat.CSV: write_csv,
+    ExportJob.FileFormat.PARQUET: write_parquet,
+}
+
+
+def _try_lock(job_id) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(hashtext(%s))', [f'export_job:{job_id}'])
+        return cursor.fetchone()[0]
+
+
+def _unlock(job_id):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_unlock(hashtext(%s))', [f'export_job:{job_id}'])
+
+
+def mark_failed(job, message):
+    job.status = ExportJob.Status.FAILED
+    job.error_message = message
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+
+
+def run_export_job(job_id) -> str:
+    """
+    Write one job's file. A retried job starts over: the partial file lives
+    only in the worker's temp dir, so nothing half-written is ever served.
+    """
+    if not _try_lock(job_id):
+        logger.info(f"Export job {job_id} is already running elsewhere")
+        return 'locked'
+    try:
+        job = ExportJob.objects.filter(pk=job_id).first()
+        if job is None or job.is_finished:
+            return job.status if job else 'missing'
+
+        try:
+            exporter = exporter_for(job)
+        except ExportConfigError as e:
+            mark_failed(job, str(e))
+            return job.status
+
+        queryset = job_queryset(job)
+        job.status = ExportJob.Status.RUNNING
+        job.total_rows = queryset.count()
+        job.processed_rows = 0
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'total_rows', 'processed_rows', 'started_at', 'updated_at'])
+
+        def progress(rows):
+            job.processed_rows += rows
+            job.save(update_fields=['processed_rows', 'updated_at'])
+
+        fd, tmp_path = tempfile.mkstemp(suffix=f'.{FILE_EXTENSIONS[job.file_format]}')
+        os.close(fd)
+        try:
+            WRITERS[job.file_format](tmp_path, exporter, queryset, progress)
+            with open(tmp_path, 'rb') as f:
+                path = f'exports/{job.org_id}/{job.id}.{FILE_EXTENSIONS[job.file_format]}'
+                job.file_path = default_storage.save(path, File(f))
+            job.file_size = os.path.getsize(tmp_path)
+        finally:
+            os.remove(tmp_path)
+
+        job.status = ExportJob.Status.COMPLETED
+        job.total_rows = job.processed_rows
+        job.finished_at = timezone.now()
+        job.save(update_fields=[
+            'status', 'total_rows', 'file_path', 'file_size', 'finished_at', 'updated_at',
+        ])
+        return job.status
+    finally:
+        _unlock(job_id)
+
+
+def expired_jobs():
+    cutoff = timezone.now() - timedelta(days=_setting('EXPORT_JOB_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+    return ExportJob.objects.filter(created_at__lt=cutoff)
+
+
+def purge_job(job):
+    if job.file_path:
+        try:
+            default_storage.delete(job.file_path)
+        except Exception as e:
+            logger.warning(f"Could not delete export file {job.file_path}: {e}")
+    job.delete()
+
+
+def job_payload(job, request=None) -> dict:
+    download_url = f'/api/v2/export-jobs/{job.id}/download/'
+    if request is not None:
+        download_url = request.build_absolute_uri(download_url)
+    completed = job.status == ExportJob.Status.COMPLETED
+    return {
+        'id': str(job.id),
+        'entity_type': job.entity_type,
+        'file_format': job.file_format,
+        'status': job.status,
+        'file_name': job.file_name,
+        'file_size': job.file_size if completed else None,
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'progress': round(job.processed_rows * 100 / job.total_rows, 1) if job.total_rows else 0,
+        'download_url': download_url if completed else None,
+        'error_message': job.error_message or None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def accepted_response(job, request):
+    payload = job_payload(job, request)
+    url = request.build_absolute_uri(f'/api/v2/export-jobs/{job.id}/')
+    return Response({**payload, 'url': url}, status=status.HTTP_202_ACCEPTED, headers={'Location': url})
+
+
+def _flag(value) -> bool:
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def handle_export_request(request, entity_type, queryset, stream, max_rows, base_name):
+    """
+    Shared tail of the V2 ``export`` actions.
+
+    ``?async=true`` (optionally with ``file_format=csv|parquet``) queues an
+    export job and answers 202; so does ``file_format=parquet``, which is
+    only written by jobs. Otherwise the first ``max_rows`` rows are streamed
+    by ``stream(queryset)``, with ``X-Export-Truncated: true`` when rows
+    were left out — use ``?async=true`` for the full export.
+    """
+    file_format = request.query_params.get('file_format', ExportJob.FileFormat.CSV)
+    if file_format not in FILE_EXTENSIONS:
+        return Response(
+            {'error': f"file_format must be one of: {', '.join(FILE_EXTENSIONS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if file_format == ExportJob.FileFormat.PARQUET and not parquet_available():
+        return Response(
+            {'error': 'Parquet exports are not available on this server'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    run_async = _flag(request.query_params.get('async', ''))
+    if not run_async and file_format == ExportJob.FileFormat.CSV:
+        truncated = queryset[max_rows:max_rows + 1].exists()
+        response = stream(queryset[:max_rows])
+        if truncated:
+            response['X-Export-Truncated'] = 'true'
+        return response
+
+    org_id = request.headers.get('X-Org-Id')
+    user_id = request.user.id if hasattr(request, 'user') else None
+    job = create_export_job(org_id, user_id, entity_type, export_spec(request), file_format, base_name)
+    return accepted_response(job, request)
@@ -0,0 +1,74 @@
+"""
+API endpoints for background V2 export jobs.
+"""
+from django.core.files.storage import default_storage
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from crm.models import ExportJob
+from crm.permissions import CRMResourcePermission
+
+from .export_jobs import CONTENT_TYPES, job_payload
+
+ENTITY_RESOURCES = {
+    ExportJob.EntityType.CONTACT: 'contacts',
+    ExportJob.EntityType.COMPANY: 'companies',
+    ExportJob.EntityType.LEAD: 'leads',
+    ExportJob.EntityType.DEAL: 'deals',
+    ExportJob.EntityType.ACTIVITY: 'activities',
+}
+
+
+class ExportJobMixin:
+    permission_classes = [CRMResourcePermission]
+
+    def get_job(self, request):
+        if not hasattr(self, '_job'):
+            self._job = ExportJob.objects.filter(
+                pk=self.kwargs['job_id'],
+                org_id=request.headers.get('X-Org-Id'),
+            ).defer('query').first()
+        return self._job
+
+    def get_resource(self, request):
+        job = self.get_job(request)
+        # Unknown jobs fall through to a 404 for anyone allowed to read contacts.
+        return ENTITY_RESOURCES.get(job.entity_type if job else None, 'contacts')
+
+    def not_found(self):
+        return Response({'error': 'Export job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ExportJobDetailView(ExportJobMixin, APIView):
+    """GET /api/v2/export-jobs/<id>/ — progress, and the download URL once done."""
+
+    def get(self, request, job_id):
+        job = self.get_job(request)
+        if job is None:
+            return self.not_found()
+        return Response(job_payload(job, request))
+
+
+class ExportJobDownloadView(ExportJobMixin, APIView):
+    """GET /api/v2/export-jobs/<id>/download/ — the finished file."""
+
+    def get(self, request, job_id):
+        job = self.get_job(request)
+        if job is None:
+            return self.not_found()
+        if job.status != ExportJob.Status.COMPLETED:
+            return Response(
+                {'error': f'Export is not ready (status: {job.status})'},
+                status=status.HTTP_409_CONFLICT
+            )
+        if not default_storage.exists(job.file_path):
+            return Response({'error': 'Export file has expired'}, status=status.HTTP_410_GONE)
+
+        return FileResponse(
+            default_storage.open(job.file_path, 'rb'),
+            as_attachment=True,
+            filename=job.file_name,
+            content_type=CONTENT_TYPES[job.file_format],
+        )
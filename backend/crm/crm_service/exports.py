@@ -0,0 +1,268 @@
+"""
+Streaming CSV exports.
+
+Exports are written as a ``StreamingHttpResponse``: rows are read with
+``QuerySet.iterator(chunk_size=...)`` (a server-side cursor on PostgreSQL),
+names referenced by a chunk are resolved for that chunk only, and each
+chunk's CSV lines are yielded as soon as they are formatted. Memory stays
+flat however many rows are exported and the header reaches the client
+before the first query completes.
+
+- ``EntityCSVExport`` subclasses render the V2 contact, company, lead and
+  deal exports (fixed columns + the org's default form fields).
+- ``ResourceExport`` / ``stream_resource_csv`` stream any
+  django-import-export resource (the V1 exports and the V2 activity export).
+
+Both expose ``header()`` and ``iter_rows(queryset)``, which background
+export jobs (``crm_service.export_jobs``) write to files instead.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from companies_v2.models import CompanyV2
+from forms_v2.models import FormDefinition
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back."""
+
+    def write(self, value):
+        return value
+
+
+def export_chunk_size():
+    return settings.CRM_SETTINGS.get('EXPORT_CHUNK_SIZE', DEFAULT_EXPORT_CHUNK_SIZE)
+
+
+def iter_batches(queryset, chunk_size=None):
+    """Yield lists of up to ``chunk_size`` objects from a server-side cursor."""
+    chunk_size = chunk_size or export_chunk_size()
+    batch = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        batch.append(obj)
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_lines(header, row_batches):
+    """Yield the CSV header, then one string per batch of rows."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for rows in row_batches:
+        yield ''.join(writer.writerow(row) for row in rows)
+
+
+def streaming_csv_response(lines, filename):
+    response = StreamingHttpResponse(lines, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class ResourceExport:
+    """Rows of a django-import-export resource's export, chunk by chunk."""
+
+    def __init__(self, resource):
+        self.resource = resource
+
+    def header(self):
+        return self.resource.get_export_headers()
+
+    def iter_rows(self, queryset):
+        for batch in iter_batches(queryset):
+            yield [self.resource.export_resource(obj) for obj in batch]
+
+    def response(self, queryset, filename):
+        return streaming_csv_response(csv_lines(self.header(), self.iter_rows(queryset)), filename)
+
+
+def stream_resource_csv(resource, queryset, filename):
+    """Stream a django-import-export resource's export of ``queryset`` as CSV."""
+    return ResourceExport(resource).response(queryset, filename)
+
+
+def _format_datetime(value):
+    return value.strftime(DATETIME_FORMAT) if value else ''
+
+
+def _format_value(value):
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return str(value) if value is not None else ''
+
+
+class EntityCSVExport:
+    """
+    CSV layout of one V2 entity: ``fixed_headers`` rendered by
+    ``fixed_values`` followed by every default-form field that isn't stored
+    in a model column (``db_column_fields``).
+    """
+
+    entity_type = None
+    fixed_headers = ()
+    db_column_fields = frozenset()
+
+    def __init__(self, org_id, form):
+        self.org_id = org_id
+        self.field_labels = []
+        self.field_names = []
+        for section in form.schema.get('sections', []):
+            for field in section.get('fields', []):
+                if field['name'] not in self.db_column_fields:
+                    self.field_labels.append(field['label'])
+                    self.field_names.append(field['name'])
+
+    @classmethod
+    def for_org(cls, org_id):
+        """The export for an org, or None when it has no default form yet."""
+        form = FormDefinition.objects.filter(
+            org_id=org_id, entity_type=cls.entity_type,
+            is_default=True, is_active=True
+        ).first()
+        return cls(org_id, form) if form else None
+
+    def header(self):
+        return [*self.fixed_headers, *self.field_labels]
+
+    def prepare(self, batch):
+        """Load whatever a batch of rows refers to (names of related records)."""
+
+    def fixed_values(self, obj):
+        raise NotImplementedError
+
+    def row(self, obj):
+        entity_data = obj.entity_data or {}
+        return [
+            *self.fixed_values(obj),
+            *(_format_value(entity_data.get(name, '')) for name in self.field_names),
+        ]
+
+    def iter_rows(self, queryset):
+        for batch in iter_batches(queryset):
+            self.prepare(batch)
+            yield [self.row(obj) for obj in batch]
+
+    def response(self, queryset, filename):
+        return streaming_csv_response(csv_lines(self.header(), self.iter_rows(queryset)), filename)
+
+
+class CompanyNamesMixin:
+    """Resolves ``company_id`` to the company's name, one query per batch."""
+
+    company_names = {}
+
+    def prepare(self, batch):
+        company_ids = {obj.company_id for obj in batch if obj.company_id}
+        self.company_names = {}
+        if company_ids:
+            companies = CompanyV2.objects.filter(id__in=company_ids).only('id', 'entity_data')
+            self.company_names = {c.id: c.get_name() for c in companies}
+
+    def company_display(self, obj):
+        if not obj.company_id:
+            return ''
+        return self.company_names.get(obj.company_id, str(obj.company_id))
+
+
+class ContactCSVExport(CompanyNamesMixin, EntityCSVExport):
+    entity_type = 'contact'
+    fixed_headers = (
+        'ID', 'Status', 'Source', 'Company', 'Assigned To',
+        'Do Not Call', 'Do Not Email', 'Created At', 'Updated At',
+    )
+    db_column_fields = frozenset({
+        'status', 'source', 'assigned_to', 'company',
+        'do_not_call', 'do_not_email',
+    })
+
+    def fixed_values(self, contact):
+        return [
+            str(contact.id),
+            contact.status or '',
+            contact.source or '',
+            self.company_display(contact),
+            str(contact.assigned_to_id) if contact.assigned_to_id else '',
+            'Yes' if contact.do_not_call else 'No',
+            'Yes' if contact.do_not_email else 'No',
+            _format_datetime(contact.created_at),
+            _format_datetime(contact.updated_at),
+        ]
+
+
+class CompanyCSVExport(EntityCSVExport):
+    entity_type = 'company'
+    fixed_headers = ('ID', 'Status', 'Industry', 'Size', 'Assigned To', 'Created At', 'Updated At')
+    db_column_fields = frozenset({
+        'status', 'industry', 'size', 'assigned_to', 'parent_company',
+    })
+
+    def fixed_values(self, company):
+        return [
+            str(company.id),
+            company.status or '',
+            company.industry or '',
+            company.size or '',
+            str(company.assigned_to_id) if company.assigned_to_id else '',
+            _format_datetime(company.created_at),
+            _format_datetime(company.updated_at),
+        ]
+
+
+class LeadCSVExport(CompanyNamesMixin, EntityCSVExport):
+    entity_type = 'lead'
+    fixed_headers = (
+        'ID', 'Status', 'Source', 'Rating', 'Company',
+        'Assigned To', 'Created At', 'Updated At',
+    )
+    db_column_fields = frozenset({
+        'status', 'source', 'rating', 'assigned_to', 'company',
+    })
+
+    def fixed_values(self, lead):
+        return [
+            str(lead.id),
+            lead.status or '',
+            lead.source or '',
+            lead.rating or '',
+            self.company_display(lead),
+            str(lead.assigned_to_id) if lead.assigned_to_id else '',
+            _format_datetime(lead.created_at),
+            _format_datetime(lead.updated_at),
+        ]
+
+
+class DealCSVExport(EntityCSVExport):
+    entity_type = 'deal'
+    fixed_headers = (
+        'ID', 'Status', 'Stage', 'Value', 'Currency', 'Probability',
+        'Expected Close', 'Actual Close', 'Loss Reason',
+        'Created At', 'Updated At',
+    )
+    db_column_fields = frozenset({
+        'status', 'stage', 'value', 'currency', 'probability',
+        'expected_close_date', 'actual_close_date', 'loss_reason',
+        'pipeline', 'assigned_to', 'contact', 'company',
+    })
+
+    def fixed_values(self, deal):
+        return [
+            str(deal.id),
+            deal.status or '',
+            deal.stage or '',
+            str(deal.value),
+            deal.currency or '',
+            str(deal.probability) if deal.probability is not None else '',
+            str(deal.expected_close_date) if deal.expected_close_date else '',
+            str(deal.actual_close_date) if deal.actual_close_date else '',
+            deal.loss_reason or '',
+            _format_datetime(deal.created_at),
+            _format_datetime(deal.updated_at),
+        ]
@@ -0,0 +1,280 @@
+"""
+Background import jobs for V2 contacts, leads and companies.
+
+Large imports no longer run inside the request. The uploaded CSV/JSON file
+(or an oversized JSON payload) is stored, an ``ImportJob`` row is created
+and the ``crm.tasks.run_import_job`` task is queued; the API answers 202
+with the job's URL.
+
+The task feeds the rows through ``crm_service.imports`` chunk by chunk.
+``ImportJob.processed_rows`` and the counters are updated, and the chunk's
+failed rows appended to ``ImportJobError``, in the same transaction as each
+chunk's writes, so a job interrupted by a worker
+restart resumes after the last committed chunk — ``acks_late`` redelivers
+it, and ``resume_stalled_import_jobs`` re-queues any job whose checkpoint
+stopped moving. A session-level advisory lock keeps two workers from
+running the same job.
+"""
+import csv
+import io
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from crm.models import ImportJob, ImportJobError
+from crm_service.imports import CompanyImporter, ContactImporter, LeadImporter
+
+logger = logging.getLogger(__name__)
+
+IMPORTERS = {
+    ImportJob.EntityType.CONTACT: ContactImporter,
+    ImportJob.EntityType.LEAD: LeadImporter,
+    ImportJob.EntityType.COMPANY: CompanyImporter,
+}
+
+IMPORT_OPTIONS = ('skip_duplicates', 'update_existing', 'duplicate_check_field')
+
+DEFAULT_SYNC_MAX_ROWS = 500
+DEFAULT_MAX_ERRORS = 10000
+DEFAULT_STALL_SECONDS = 600
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+def _setting(name, default):
+    return settings.CRM_SETTINGS.get(name, default)
+
+
+def _file_format(name, content_type=''):
+    lowered = (name or '').lower()
+    if lowered.endswith('.csv') or 'csv' in (content_type or ''):
+        return 'csv'
+    if lowered.endswith('.json') or 'json' in (content_type or ''):
+        return 'json'
+    raise ImportFileError('Only CSV and JSON files can be imported')
+
+
+def parse_rows(content: bytes, file_format: str, rows_key: str = None) -> list:
+    """Decode an uploaded file into a list of row dicts."""
+    text = content.decode('utf-8-sig')
+    if file_format == 'csv':
+        reader = csv.DictReader(io.StringIO(text))
+        # Blank cells mean "not provided", not an empty value to store.
+        return [{k.strip(): v for k, v in row.items() if k and v not in (None, '')} for row in reader]
+
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise ImportFileError(f'Invalid JSON: {e}')
+    if isinstance(data, dict):
+        data = data.get(rows_key) if rows_key in data else data.get('rows')
+    if not isinstance(data, list):
+        raise ImportFileError('JSON imports must be a list of objects')
+    return data
+
+
+def create_import_job(org_id, user_id, entity_type, options, upload=None, rows=None) -> ImportJob:
+    """Store the rows, create the job and queue it once the transaction commits."""
+    job = ImportJob(
+        org_id=org_id,
+        created_by=user_id,
+        entity_type=entity_type,
+        options={k: options[k] for k in IMPORT_OPTIONS if k in options},
+    )
+    if upload is not None:
+        file_format = _file_format(upload.name, getattr(upload, 'content_type', ''))
+        job.file_name = upload.name[:255]
+        content = upload
+    else:
+        file_format = 'json'
+        job.file_name = f'{entity_type}-import.json'
+        content = ContentFile(json.dumps(rows).encode())
+        job.total_rows = len(rows)
+
+    job.file_path = default_storage.save(f'imports/{org_id}/{job.id}.{file_format}', content)
+    job.save()
+
+    from crm.tasks import run_import_job as run_import_job_task
+    job_id = str(job.id)
+    transaction.on_commit(lambda: run_import_job_task.delay(job_id))
+    return job
+
+
+def read_job_rows(job) -> list:
+    with default_storage.open(job.file_path, 'rb') as f:
+        content = f.read()
+    rows_key = {'contact': 'contacts', 'lead': 'leads', 'company': 'companies'}[job.entity_type]
+    return parse_rows(content, _file_format(job.file_path), rows_key)
+
+
+def _try_lock(job_id) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(hashtext(%s))', [f'import_job:{job_id}'])
+        return cursor.fetchone()[0]
+
+
+def _unlock(job_id):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_unlock(hashtext(%s))', [f'import_job:{job_id}'])
+
+
+def mark_failed(job, message):
+    job.status = ImportJob.Status.FAILED
+    job.error_message = message
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error_message', 'finished_at', 'updated_at'])
+
+
+def _cleanup_file(job):
+    try:
+        default_storage.delete(job.file_path)
+    except Exception as e:
+        logger.warning(f"Could not delete import file {job.file_path}: {e}")
+
+
+def run_import_job(job_id) -> str:
+    """Process (or resume) one job. Returns the job's status afterwards."""
+    if not _try_lock(job_id):
+        logger.info(f"Import job {job_id} is already running elsewhere")
+        return 'locked'
+    try:
+        job = ImportJob.objects.filter(pk=job_id).first()
+        if job is None or job.is_finished:
+            return job.status if job else 'missing'
+
+        try:
+            rows = read_job_rows(job)
+        except (ImportFileError, UnicodeDecodeError, csv.Error) as e:
+            mark_failed(job, str(e))
+            _cleanup_file(job)
+            return job.status
+
+        job.status = ImportJob.Status.RUNNING
+        job.total_rows = len(rows)
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'total_rows', 'started_at', 'updated_at'])
+
+        importer = IMPORTERS[job.entity_type](job.org_id, user_id=job.created_by, **job.options)
+        results = importer.empty_results(len(rows))
+        max_errors = _setting('IMPORT_JOB_MAX_ERRORS', DEFAULT_MAX_ERRORS)
+
+        def checkpoint(next_row, chunk_results):
+            errors = chunk_results['errors']
+            room = max(max_errors - job.error_count, 0)
+            if room and errors:
+                ImportJobError.objects.bulk_create([
+                    ImportJobError(job=job, row=error['row'], error=error['error'], data=rows[error['row'] - 1])
+                    for error in errors[:room]
+                ])
+            job.error_count += len(errors)
+            errors.clear()
+
+            job.processed_rows = next_row
+            job.created_count += chunk_results['created']
+            job.updated_count += chunk_results['updated']
+            job.skipped_count += chunk_results['skipped']
+            chunk_results.update(created=0, updated=0, skipped=0)
+            job.save(update_fields=[
+                'processed_rows', 'created_count', 'updated_count', 'skipped_count',
+                'error_count', 'updated_at',
+            ])
+
+        importer.run(rows, start=job.processed_rows, results=results, checkpoint=checkpoint)
+
+        job.status = ImportJob.Status.COMPLETED
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+        _cleanup_file(job)
+        return job.status
+    finally:
+        _unlock(job_id)
+
+
+def stalled_jobs():
+    cutoff = timezone.now() - timedelta(seconds=_setting('IMPORT_JOB_STALL_SECONDS', DEFAULT_STALL_SECONDS))
+    return ImportJob.objects.filter(
+        status__in=[ImportJob.Status.PENDING, ImportJob.Status.RUNNING],
+        updated_at__lt=cutoff,
+    )
+
+
+def job_payload(job, request=None) -> dict:
+    errors_url = f'/api/v2/import-jobs/{job.id}/errors/'
+    if request is not None:
+        errors_url = request.build_absolute_uri(errors_url)
+    return {
+        'id': str(job.id),
+        'entity_type': job.entity_type,
+        'status': job.status,
+        'file_name': job.file_name,
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'progress': round(job.processed_rows * 100 / job.total_rows, 1) if job.total_rows else 0,
+        'created': job.created_count,
+        'updated': job.updated_count,
+        'skipped': job.skipped_count,
+        'error_count': job.error_count,
+        'errors_url': errors_url if job.error_count else None,
+        'error_message': job.error_message or None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def accepted_response(job, request):
+    payload = job_payload(job, request)
+    url = request.build_absolute_uri(f'/api/v2/import-jobs/{job.id}/')
+    return Response({**payload, 'url': url}, status=status.HTTP_202_ACCEPTED, headers={'Location': url})
+
+
+def handle_import_request(request, entity_type, rows_key):
+    """
+    Shared body of the V2 ``import`` actions: an uploaded file, or more than
+    ``IMPORT_SYNC_MAX_ROWS`` JSON rows, becomes a background job (202);
+    smaller payloads are imported in the request as before (200).
+    """
+    org_id = request.headers.get('X-Org-Id')
+    if not org_id:
+        return Response(
+            {'error': 'X-Org-Id header required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    user_id = request.user.id if hasattr(request, 'user') else None
+    options = {k: request.data.get(k) for k in IMPORT_OPTIONS if k in request.data}
+    for flag in ('skip_duplicates', 'update_existing'):
+        if isinstance(options.get(flag), str):
+            options[flag] = options[flag].lower() in ('1', 'true', 'yes')
+
+    upload = request.FILES.get('file')
+    if upload is not None:
+        try:
+            job = create_import_job(org_id, user_id, entity_type, options, upload=upload)
+        except ImportFileError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return accepted_response(job, request)
+
+    rows = request.data.get(rows_key, [])
+    if not rows:
+        return Response(
+            {'error': f'{rows_key} list is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(rows) > _setting('IMPORT_SYNC_MAX_ROWS', DEFAULT_SYNC_MAX_ROWS):
+        job = create_import_job(org_id, user_id, entity_type, options, rows=rows)
+        return accepted_response(job, request)
+
+    importer = IMPORTERS[entity_type](org_id, user_id=user_id, **options)
+    return Response(importer.run(rows), status=status.HTTP_200_OK)
@@ -0,0 +1,136 @@
+"""
+API endpoints for background V2 import jobs.
+"""
+from django.db import connection
+from rest_framework import status
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from crm.models import ImportJob, ImportJobError
+from crm.permissions import CRMResourcePermission
+from crm_service.exports import csv_lines, iter_batches, streaming_csv_response
+
+from .import_jobs import ImportFileError, accepted_response, create_import_job, job_payload
+
+ENTITY_RESOURCES = {
+    ImportJob.EntityType.CONTACT: 'contacts',
+    ImportJob.EntityType.LEAD: 'leads',
+    ImportJob.EntityType.COMPANY: 'companies',
+}
+
+
+class ImportJobMixin:
+    permission_classes = [CRMResourcePermission]
+
+    def get_job(self, request):
+        if not hasattr(self, '_job'):
+            self._job = ImportJob.objects.filter(
+                pk=self.kwargs['job_id'],
+                org_id=request.headers.get('X-Org-Id'),
+            ).first()
+        return self._job
+
+    def get_resource(self, request):
+        job = self.get_job(request)
+        # Unknown jobs fall through to a 404 for anyone allowed to import.
+        return ENTITY_RESOURCES.get(job.entity_type if job else None, 'contacts')
+
+    def not_found(self):
+        return Response({'error': 'Import job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class ImportJobCreateView(APIView):
+    """
+    POST /api/v2/import-jobs/ (multipart)
+    Fields: file (CSV or JSON), entity_type (contact|lead|company),
+    skip_duplicates, update_existing, duplicate_check_field.
+    """
+    permission_classes = [CRMResourcePermission]
+    parser_classes = [MultiPartParser, FormParser, JSONParser]
+
+    def get_resource(self, request):
+        return ENTITY_RESOURCES.get(request.data.get('entity_type'), 'contacts')
+
+    def post(self, request):
+        org_id = request.headers.get('X-Org-Id')
+        if not org_id:
+            return Response(
+                {'error': 'X-Org-Id header required'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        entity_type = request.data.get('entity_type')
+        if entity_type not in ENTITY_RESOURCES:
+            return Response(
+                {'error': f"entity_type must be one of: {', '.join(ENTITY_RESOURCES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        options = {}
+        if 'duplicate_check_field' in request.data:
+            options['duplicate_check_field'] = request.data['duplicate_check_field']
+        for flag in ('skip_duplicates', 'update_existing'):
+            if flag in request.data:
+                options[flag] = str(request.data[flag]).lower() in ('1', 'true', 'yes')
+
+        user_id = request.user.id if hasattr(request, 'user') else None
+        try:
+            job = create_import_job(org_id, user_id, entity_type, options, upload=upload)
+        except ImportFileError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return accepted_response(job, request)
+
+
+class ImportJobDetailView(ImportJobMixin, APIView):
+    """GET /api/v2/import-jobs/<id>/ — progress and counts."""
+
+    def get(self, request, job_id):
+        job = self.get_job(request)
+        if job is None:
+            return self.not_found()
+        return Response(job_payload(job, request))
+
+
+def _error_columns(job_id) -> list:
+    """Keys of the failed rows' data, in order of first appearance."""
+    table = ImportJobError._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT k.key
+            FROM {table} e, jsonb_object_keys(e.data) WITH ORDINALITY AS k(key, n)
+            WHERE e.job_id = %s AND jsonb_typeof(e.data) = 'object'
+            GROUP BY k.key
+            ORDER BY MIN(e.id), MIN(k.n)
+        """, [job_id])
+        return [row[0] for row in cursor.fetchall()]
+
+
+class ImportJobErrorsView(ImportJobMixin, APIView):
+    """GET /api/v2/import-jobs/<id>/errors/ — failed rows as CSV, with the reason."""
+
+    def get(self, request, job_id):
+        job = self.get_job(request)
+        if job is None:
+            return self.not_found()
+
+        columns = _error_columns(job.id)
+        failed_rows = ImportJobError.objects.filter(job=job).order_by('row', 'id')
+
+        def row_batches():
+            for batch in iter_batches(failed_rows):
+                yield [
+                    [error.row, error.error, *[
+                        (error.data if isinstance(error.data, dict) else {}).get(c, '') for c in columns
+                    ]]
+                    for error in batch
+                ]
+
+        return streaming_csv_response(
+            csv_lines(['row', 'error', *columns], row_batches()),
+            f'import_{job.id}_errors.csv',
+        )
@@ -0,0 +1,328 @@
+"""
+Pagination for V2 list endpoints.
+
+``V2Pagination`` keeps the page-number behaviour old clients rely on
+(``?page=N``, ``count``) and adds keyset (cursor) pagination, enabled with
+``?pagination=cursor`` or by passing a ``cursor``.
+
+Keyset mode pages on the queryset's active ordering — whatever ``sort_by``
+/ ``ordering`` / search ranking produced — with the primary key appended
+as tie-breaker. The next page is selected with a row-value comparison on
+those keys instead of OFFSET, and no COUNT(*) is run, so deep pages cost
+the same as the first and stay stable while rows are inserted.
+
+Cursors are opaque (urlsafe base64 JSON) and carry a fingerprint of the
+ordering they were issued for; reusing one under a different sort is
+rejected.
+
+In page-number mode the total goes through ``CountStrategyPaginator``: an
+exact count when the result has at most ``LIST_COUNT_EXACT_THRESHOLD`` rows,
+otherwise a per-filter total cached in Redis: an exact count or the
+planner's row estimate, depending on ``LIST_COUNT_STRATEGY``. Responses say which one they got
+through ``count_is_estimate``.
+"""
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page, Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_ALIAS = '_cursor_{}'
+LIST_COUNT_PREFIX = 'list_count:'
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+class KeyTerm:
+    """One ordering key: expression, direction and where NULLs sort."""
+
+    def __init__(self, expression, descending, nulls_last=None):
+        self.expression = expression
+        self.descending = descending
+        # PostgreSQL default: NULLs sort as larger than any value.
+        self.nulls_last = (not descending) if nulls_last is None else nulls_last
+
+    def reversed(self):
+        return KeyTerm(self.expression, not self.descending, not self.nulls_last)
+
+    def order_by(self, alias):
+        if self.nulls_last == (not self.descending):
+            return OrderBy(F(alias), descending=self.descending)
+        if self.nulls_last:
+            return OrderBy(F(alias), descending=self.descending, nulls_last=True)
+        return OrderBy(F(alias), descending=self.descending, nulls_first=True)
+
+    def after(self, alias, value, rest):
+        """Q for rows strictly after ``value`` on this key (``rest`` breaks ties)."""
+        is_null = Q(**{f'{alias}__isnull': True})
+        if value is None:
+            if self.nulls_last:
+                return is_null & rest if rest is not None else Q(pk__in=[])
+            tied = (is_null & rest) if rest is not None else Q(pk__in=[])
+            return ~is_null | tied
+
+        lookup = 'lt' if self.descending else 'gt'
+        condition = Q(**{f'{alias}__{lookup}': value})
+        if self.nulls_last:
+            condition |= is_null
+        if rest is not None:
+            condition |= Q(**{alias: value}) & rest
+        return condition
+
+
+def get_key_terms(queryset):
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+    if not ordering and any(f.name == 'created_at' for f in queryset.model._meta.fields):
+        ordering = ['-created_at']
+
+    terms = []
+    has_pk = False
+    for item in ordering:
+        if isinstance(item, str):
+            if item == '?':
+                raise NotFound('Random ordering cannot be paginated with a cursor')
+            name = item.lstrip('-')
+            if name in ('pk', queryset.model._meta.pk.name):
+                has_pk = True
+            terms.append(KeyTerm(F(name), item.startswith('-')))
+        elif isinstance(item, OrderBy):
+            terms.append(KeyTerm(
+                item.expression, item.descending,
+                nulls_last=True if item.nulls_last else (False if item.nulls_first else None),
+            ))
+        else:
+            terms.append(KeyTerm(item, False))
+
+    if not has_pk:
+        terms.append(KeyTerm(F('pk'), terms[-1].descending if terms else True))
+    return terms
+
+
+def _fingerprint(terms):
+    spec = repr([(str(t.expression), t.descending, t.nulls_last) for t in terms])
+    return hashlib.md5(spec.encode()).hexdigest()[:12]
+
+
+def planner_row_estimate(queryset) -> int:
+    """Row estimate of the top plan node from EXPLAIN, without running the query."""
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedPage(Page):
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountStrategyPaginator(DjangoPaginator):
+    """
+    Django paginator whose ``count`` is exact only while it is cheap.
+
+    Above the threshold it is the cached total: an exact count under the
+    'cached' strategy, the planner's estimate under 'estimate'. Estimated
+    totals are not used to validate page bounds; ``has_next`` is decided by
+    fetching one extra row instead.
+    """
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return len(queryset)
+
+        crm_settings = settings.CRM_SETTINGS
+        threshold = crm_settings.get('LIST_COUNT_EXACT_THRESHOLD', 10000)
+        strategy = crm_settings.get('LIST_COUNT_STRATEGY', 'estimate')
+        ttl = crm_settings.get('LIST_COUNT_CACHE_TTL', 60)
+
+        # Only counts above the threshold are cached, so a hit skips the
+        # bounded count too. The flag follows the strategy, not the cache:
+        # 'cached' totals are exact, 'estimate' totals are not.
+        queryset = queryset.order_by()
+        sql, params = queryset.query.sql_with_params()
+        key = LIST_COUNT_PREFIX + hashlib.md5(repr((sql, params)).encode()).hexdigest()
+        cached = cache.get(key)
+        if cached is not None:
+            self.count_is_estimate = strategy != 'cached'
+            return cached
+
+        bounded = queryset[:threshold + 1].count()
+        if bounded <= threshold:
+            return bounded
+
+        if strategy == 'cached':
+            total = queryset.count()
+        else:
+            total = max(planner_row_estimate(queryset), bounded)
+            self.count_is_estimate = True
+        cache.set(key, total, timeout=ttl)
+        return total
+
+    def validate_number(self, number):
+        self.count  # resolves count_is_estimate
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise InvalidPage('That page number is not an integer')
+        if number < 1:
+            raise InvalidPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise InvalidPage('That page contains no results')
+        return EstimatedPage(rows[:self.per_page], number, self, len(rows) > self.per_page)
+
+
+class V2Pagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    django_paginator_class = CountStrategyPaginator
+
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_by_cursor(queryset, request)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return Response(OrderedDict([
+                ('count', self.page.paginator.count),
+                ('count_is_estimate', self.page.paginator.count_is_estimate),
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data),
+            ]))
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    # -- keyset mode --------------------------------------------------------
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        terms = get_key_terms(queryset)
+        fingerprint = _fingerprint(terms)
+        cursor = self.decode_cursor(request, fingerprint, len(terms))
+        reverse = bool(cursor and cursor['r'])
+
+        active = [t.reversed() for t in terms] if reverse else terms
+        aliases = [CURSOR_ALIAS.format(i) for i in range(len(terms))]
+
+        queryset = queryset.annotate(
+            **{alias: term.expression for alias, term in zip(aliases, terms)}
+        ).order_by(*[term.order_by(alias) for alias, term in zip(aliases, active)])
+
+        if cursor:
+            condition = None
+            for alias, term, value in reversed(list(zip(aliases, active, cursor['v']))):
+                condition = term.after(alias, value, condition)
+            queryset = queryset.filter(condition)
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.fingerprint = fingerprint
+        self.aliases = aliases
+        self.rows = rows
+        # Going forward we came from a cursor (so there's a previous page);
+        # going backward we came from a later page (so there's a next one).
+        self.has_next = has_more if not reverse else bool(cursor)
+        self.has_previous = bool(cursor) if not reverse else has_more
+        return rows
+
+    def decode_cursor(self, request, fingerprint, size):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values, reverse, issued_for = payload['v'], bool(payload.get('r')), payload['o']
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+        if issued_for != fingerprint or not isinstance(values, list) or len(values) != size:
+            raise NotFound('Cursor does not match the current sort order')
+        return {'v': values, 'r': reverse}
+
+    def encode_cursor(self, row, reverse):
+        payload = {
+            'v': [_encode_value(getattr(row, alias)) for alias in self.aliases],
+            'r': int(reverse),
+            'o': self.fingerprint,
+        }
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode()
+        ).decode().rstrip('=')
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self.encode_cursor(self.rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.rows:
+            return None
+        return self.encode_cursor(self.rows[0], reverse=True)
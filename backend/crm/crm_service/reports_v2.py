@@ -20,6 +20,10 @@ class DashboardV2View(APIView):
 
     Org-wide overview: entity counts, deal pipeline summary,
     activity breakdown, recent trends.
+
+    Totals come from the org metrics rollup; while it is stale they are
+    aggregated live. Overdue activities depend on the current time and
+    are always counted live.
     """
 
     def get(self, request):
@@ -27,13 +31,57 @@ class DashboardV2View(APIView):
         if not org_id:
             return Response({'error': 'X-Org-Id header required'}, status=status.HTTP_400_BAD_REQUEST)
 
+        from crm.rollups import get_org_metrics
+        from activities_v2.models import ActivityV2
+
+        now = timezone.now()
+        overdue_activities = ActivityV2.objects.filter(
+            org_id=org_id,
+            due_date__lt=now,
+            status__in=['pending', 'in_progress'],
+        ).count()
+
+        metrics = get_org_metrics(org_id)
+        if metrics is None:
+            return Response(self._live_dashboard(org_id, now, overdue_activities))
+
+        return Response({
+            'counts': {
+                'contacts': metrics.count('contact'),
+                'companies': metrics.count('company'),
+                'leads': metrics.count('lead'),
+                'deals': metrics.count('deal'),
+                'activities': metrics.count('activity'),
+            },
+            'deals': {
+                'open': metrics.count('deal', 'open'),
+                'won': metrics.count('deal', 'won'),
+                'lost': metrics.count('deal', 'lost'),
+                'total_value': str(metrics.value('deal')),
+                'open_value': str(metrics.value('deal', 'open')),
+                'won_value': str(metrics.value('deal', 'won')),
+            },
+            'activities': {
+                'total': metrics.count('activity'),
+                'overdue': overdue_activities,
+            },
+            'last_30_days': {
+                'new_contacts': metrics.recent_count('contact'),
+                'new_leads': metrics.recent_count('lead'),
+                'deals_won': metrics.recent_count('deal_closed', 'won'),
+                'revenue_won': str(metrics.recent_value('deal_closed', 'won')),
+            },
+            'source': 'rollup',
+        })
+
+    def _live_dashboard(self, org_id, now, overdue_activities):
+        """Aggregate straight from the entity tables (rollup missing or stale)."""
         from contacts_v2.models import ContactV2
         from companies_v2.models import CompanyV2
         from leads_v2.models import LeadV2
         from deals_v2.models import DealV2
         from activities_v2.models import ActivityV2
 
-        now = timezone.now()
         thirty_days_ago = now - timedelta(days=30)
 
         contact_count = ContactV2.objects.filter(org_id=org_id, deleted_at__isnull=True).count()
@@ -52,12 +100,6 @@ class DashboardV2View(APIView):
         )
 
         activity_count = ActivityV2.objects.filter(org_id=org_id).count()
-        overdue_activities = ActivityV2.objects.filter(
-            org_id=org_id,
-            due_date__lt=now,
-            status__in=['pending', 'in_progress'],
-        ).count()
-
         new_contacts_30d = ContactV2.objects.filter(
             org_id=org_id, deleted_at__isnull=True,
             created_at__gte=thirty_days_ago,
@@ -73,7 +115,7 @@ class DashboardV2View(APIView):
             value=Coalesce(Sum('value'), Decimal('0')),
         )
 
-        return Response({
+        return {
             'counts': {
                 'contacts': contact_count,
                 'companies': company_count,
@@ -99,7 +141,8 @@ class DashboardV2View(APIView):
                 'deals_won': won_deals_30d['count'],
                 'revenue_won': str(won_deals_30d['value']),
             },
-        })
+            'source': 'live',
+        }
 
 
 class SalesPipelineReportV2View(APIView):
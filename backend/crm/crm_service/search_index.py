@@ -0,0 +1,153 @@
+"""
+Search indexing helpers for V2 entities.
+
+Searchable V2 models keep two denormalized columns built from their
+``entity_data``:
+
+- ``search_text``: lowercased ``SEARCH_FIELDS`` values behind a pg_trgm GIN
+  index, used for substring matching and similarity ranking.
+- ``search_vector``: a tsvector weighted by ``SEARCH_VECTOR_WEIGHTS``
+  (name > email > phone > description) behind a GIN index, used for
+  full-text search ranked with ``ts_rank``.
+
+Both are written with the row on save (``refresh_search_columns`` after
+set-based updates). The migrations that add them backfill existing rows;
+``manage.py rebuild_search_index`` rebuilds them on demand.
+"""
+from functools import reduce
+from operator import add
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Func, JSONField, TextField, Value
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Lower, NullIf, Trim
+
+SEARCH_CONFIG = 'simple'
+
+
+def build_search_text(entity_data, fields) -> str:
+    if not isinstance(entity_data, dict):
+        return ''
+
+    parts = []
+    for field in fields:
+        value = entity_data.get(field)
+        if value is None or value == '':
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ' '.join(str(v) for v in value if v is not None)
+        value = str(value).strip()
+        if value:
+            parts.append(value)
+
+    return ' '.join(parts).lower()
+
+
+def build_search_vector(weights, source='entity_data'):
+    """
+    Weighted tsvector expression over entity_data keys, usable in update().
+    ``source`` may be a jsonb expression instead of the column, e.g. the
+    values a save is about to write.
+    """
+    vectors = [
+        SearchVector(
+            *[KeyTextTransform(field, source) for field in fields],
+            weight=weight,
+            config=SEARCH_CONFIG,
+        )
+        for weight, fields in weights
+        if fields
+    ]
+    return reduce(add, vectors)
+
+
+def build_search_text_expression(fields):
+    """
+    SQL counterpart of ``build_search_text`` for ``QuerySet.update()``.
+    Scalar values render identically; list values render as JSON text.
+    """
+    parts = [NullIf(Trim(KeyTextTransform(field, 'entity_data')), Value('')) for field in fields]
+    return Lower(Func(Value(' '), *parts, function='CONCAT_WS', output_field=TextField()))
+
+
+def refresh_search_columns(queryset):
+    """Recompute search_text and search_vector for a queryset in one UPDATE."""
+    model = queryset.model
+    return queryset.update(
+        search_text=build_search_text_expression(model.SEARCH_FIELDS),
+        search_vector=build_search_vector(model.SEARCH_VECTOR_WEIGHTS),
+    )
+
+
+def refresh_search_vectors(queryset):
+    """Recompute search_vector for every row of a queryset in one UPDATE."""
+    return queryset.update(
+        search_vector=build_search_vector(queryset.model.SEARCH_VECTOR_WEIGHTS),
+    )
+
+
+def backfill_search_vectors(model, weights, batch_size=1000) -> int:
+    """
+    Fill NULL search_vector columns in pk batches. Takes the weights
+    explicitly so migrations can pass historical models.
+    """
+    vector = build_search_vector(weights)
+    total = 0
+    last_pk = None
+    while True:
+        queryset = model._base_manager.filter(search_vector__isnull=True).order_by('pk')
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return total
+        total += model._base_manager.filter(pk__in=pks).update(search_vector=vector)
+        last_pk = pks[-1]
+
+
+def full_text_search(queryset, query):
+    """
+    Filter a searchable queryset with websearch_to_tsquery and annotate
+    ``search_rank`` (ts_rank) for ordering.
+    """
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    return queryset.filter(search_vector=search_query).annotate(
+        search_rank=SearchRank(F('search_vector'), search_query),
+    )
+
+
+class SearchIndexMixin:
+    """
+    Model mixin — keeps ``search_text`` and ``search_vector`` in step with
+    ``entity_data``.
+
+    Both are written by the same INSERT/UPDATE as the row: ``search_text``
+    is built in Python, ``search_vector`` in SQL from the ``entity_data``
+    being saved. Saves restricted with ``update_fields`` only refresh when
+    ``entity_data`` is part of the update.
+    """
+
+    SEARCH_FIELDS = ()
+    SEARCH_VECTOR_WEIGHTS = ()
+
+    def build_search_text(self) -> str:
+        return build_search_text(self.entity_data, self.SEARCH_FIELDS)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        refresh = update_fields is None or 'entity_data' in update_fields
+
+        if refresh:
+            self.search_text = self.build_search_text()
+            self.search_vector = build_search_vector(
+                self.SEARCH_VECTOR_WEIGHTS,
+                source=Value(self.entity_data, output_field=JSONField()),
+            )
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'search_text', 'search_vector'}
+
+        super().save(*args, **kwargs)
+
+        if refresh:
+            # Drop the expression; the stored vector loads on next access.
+            self.__dict__.pop('search_vector', None)
@@ -1,13 +1,22 @@
 """
 Global Search V2
 
-Cross-entity search across all V2 entities using JSONB lookups.
+Cross-entity search across all V2 entities.
+
+Contacts, companies, deals and leads match against their trigram-indexed
+``search_text`` column and are ranked by word similarity to the query.
+With ``mode=fts`` they match their weighted ``search_vector`` through
+websearch_to_tsquery and are ranked with ts_rank instead.
+By default every requested entity type is searched in a single UNION ALL
+statement; ``execution=sequential`` runs one query per type instead.
 Endpoint: GET /api/v2/search/?q=<query>&limit=5&types=contact,company,...
 """
 
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
 from django.db.models import Q
 
 from contacts_v2.models import ContactV2
@@ -16,6 +25,129 @@ from deals_v2.models import DealV2
 from leads_v2.models import LeadV2
 from activities_v2.models import ActivityV2
 from pipelines_v2.models import PipelineV2
+from .search_index import SEARCH_CONFIG, full_text_search
+
+RESULT_KEYS = {
+    'contact': 'contacts',
+    'company': 'companies',
+    'deal': 'deals',
+    'lead': 'leads',
+    'activity': 'activities',
+    'pipeline': 'pipelines',
+}
+
+# How contacts, companies, deals and leads are matched and scored, per mode.
+SEARCH_MODES = {
+    'trigram': {
+        'match': 'search_text LIKE %(pattern)s',
+        'score': 'word_similarity(%(term)s, search_text)',
+    },
+    'fts': {
+        'match': f"search_vector @@ websearch_to_tsquery('{SEARCH_CONFIG}', %(query)s)",
+        'score': f"ts_rank(search_vector, websearch_to_tsquery('{SEARCH_CONFIG}', %(query)s))",
+    },
+}
+
+# Common projection for the UNION ALL execution mode:
+# (id, type, name, secondary, status, detail, score).
+# Branches are formatted with the {match}/{score} pair of the search mode.
+UNION_BRANCHES = {
+    'contact': """
+        SELECT id, 'contact' AS type,
+               COALESCE(NULLIF(TRIM(CONCAT_WS(' ', entity_data->>'first_name', entity_data->>'last_name')), ''),
+                        'Unnamed Contact') AS name,
+               COALESCE(entity_data->>'email', '') AS secondary,
+               status, NULL::text AS detail,
+               {score} AS score
+        FROM crm_contacts_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL AND {match}
+        ORDER BY score DESC, created_at DESC
+        LIMIT %(limit)s
+    """,
+    'company': """
+        SELECT id, 'company' AS type,
+               COALESCE(entity_data->>'name', 'Unnamed Company') AS name,
+               COALESCE(entity_data->>'email', '') AS secondary,
+               status, industry AS detail,
+               {score} AS score
+        FROM crm_companies_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL AND {match}
+        ORDER BY score DESC, created_at DESC
+        LIMIT %(limit)s
+    """,
+    'deal': """
+        SELECT id, 'deal' AS type,
+               COALESCE(entity_data->>'name', 'Unnamed Deal') AS name,
+               value::text AS secondary,
+               status, stage AS detail,
+               {score} AS score
+        FROM crm_deals_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL AND {match}
+        ORDER BY score DESC, created_at DESC
+        LIMIT %(limit)s
+    """,
+    'lead': """
+        SELECT id, 'lead' AS type,
+               COALESCE(NULLIF(TRIM(CONCAT_WS(' ', entity_data->>'first_name', entity_data->>'last_name')), ''),
+                        'Unnamed Lead') AS name,
+               COALESCE(entity_data->>'email', '') AS secondary,
+               status, source AS detail,
+               {score} AS score
+        FROM crm_leads_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL AND {match}
+        ORDER BY score DESC, created_at DESC
+        LIMIT %(limit)s
+    """,
+    'activity': """
+        SELECT id, 'activity' AS type,
+               subject AS name,
+               activity_type AS secondary,
+               status, to_json(due_date) #>> '{{}}' AS detail,
+               0::real AS score
+        FROM crm_activities_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL
+          AND (subject ILIKE %(raw_pattern)s OR description ILIKE %(raw_pattern)s)
+        ORDER BY created_at DESC
+        LIMIT %(limit)s
+    """,
+    'pipeline': """
+        SELECT id, 'pipeline' AS type,
+               name,
+               is_default::text AS secondary,
+               is_active::text AS status, NULL::text AS detail,
+               0::real AS score
+        FROM crm_pipelines_v2
+        WHERE org_id = %(org_id)s AND deleted_at IS NULL
+          AND (name ILIKE %(raw_pattern)s OR description ILIKE %(raw_pattern)s)
+        ORDER BY "order", name
+        LIMIT %(limit)s
+    """,
+}
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _format_union_row(row):
+    """Map a projected UNION ALL row onto the per-type search result shape."""
+    entity_id, entity_type, name, secondary, status_value, detail, _score = row
+    item = {'id': str(entity_id), 'type': entity_type, 'name': name}
+
+    if entity_type == 'contact':
+        item.update({'email': secondary, 'status': status_value})
+    elif entity_type == 'company':
+        item.update({'email': secondary, 'status': status_value, 'industry': detail})
+    elif entity_type == 'deal':
+        item.update({'value': secondary, 'status': status_value, 'stage': detail})
+    elif entity_type == 'lead':
+        item.update({'email': secondary, 'status': status_value, 'source': detail})
+    elif entity_type == 'activity':
+        item.update({'activity_type': secondary, 'status': status_value, 'due_date': detail})
+    elif entity_type == 'pipeline':
+        item.update({'is_default': secondary == 'true', 'is_active': status_value == 'true'})
+
+    return item
 
 
 class GlobalSearchV2View(APIView):
@@ -40,39 +172,68 @@ class GlobalSearchV2View(APIView):
                 'pipelines': [],
             })
 
+        self.search_mode = request.query_params.get('mode', 'trigram')
+        if self.search_mode not in SEARCH_MODES:
+            self.search_mode = 'trigram'
+
         search_all = not entity_types
-        results = {}
+        requested = [t for t in RESULT_KEYS if search_all or t in entity_types]
+
+        execution = request.query_params.get('execution', 'union')
+        if execution == 'sequential':
+            results = {}
+            for entity_type in requested:
+                key = RESULT_KEYS[entity_type]
+                results[key] = getattr(self, f'_search_{key}')(org_id, query, limit)
+            return Response(results)
 
-        if search_all or 'contact' in entity_types:
-            results['contacts'] = self._search_contacts(org_id, query, limit)
+        return Response(self._search_union(org_id, query, limit, requested))
 
-        if search_all or 'company' in entity_types:
-            results['companies'] = self._search_companies(org_id, query, limit)
+    def _search_union(self, org_id, query, limit, entity_types):
+        """
+        Run every requested branch as one UNION ALL statement — a single
+        round trip, each branch limited and ranked on its own.
+        """
+        results = {RESULT_KEYS[t]: [] for t in entity_types}
+        if not entity_types:
+            return results
 
-        if search_all or 'deal' in entity_types:
-            results['deals'] = self._search_deals(org_id, query, limit)
+        sql = '\nUNION ALL\n'.join(
+            f'({UNION_BRANCHES[t].format(**SEARCH_MODES[self.search_mode])})'
+            for t in entity_types
+        )
+        params = {
+            'org_id': str(org_id),
+            'query': query,
+            'term': query.lower(),
+            'pattern': f'%{_escape_like(query.lower())}%',
+            'raw_pattern': f'%{_escape_like(query)}%',
+            'limit': limit,
+        }
 
-        if search_all or 'lead' in entity_types:
-            results['leads'] = self._search_leads(org_id, query, limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for row in cursor.fetchall():
+                entity_type = row[1]
+                results[RESULT_KEYS[entity_type]].append(_format_union_row(row))
 
-        if search_all or 'activity' in entity_types:
-            results['activities'] = self._search_activities(org_id, query, limit)
+        return results
 
-        if search_all or 'pipeline' in entity_types:
-            results['pipelines'] = self._search_pipelines(org_id, query, limit)
+    def _ranked_search(self, model, org_id, query, limit):
+        queryset = model.objects.filter(org_id=org_id, deleted_at__isnull=True)
 
-        return Response(results)
+        if self.search_mode == 'fts':
+            return full_text_search(queryset, query).order_by('-search_rank', '-created_at')[:limit]
+
+        term = query.lower()
+        return queryset.filter(
+            search_text__contains=term,
+        ).annotate(
+            search_rank=TrigramWordSimilarity(term, 'search_text'),
+        ).order_by('-search_rank', '-created_at')[:limit]
 
     def _search_contacts(self, org_id, query, limit):
-        contacts = ContactV2.objects.filter(
-            org_id=org_id,
-            deleted_at__isnull=True,
-        ).filter(
-            Q(entity_data__first_name__icontains=query) |
-            Q(entity_data__last_name__icontains=query) |
-            Q(entity_data__email__icontains=query) |
-            Q(entity_data__phone__icontains=query)
-        )[:limit]
+        contacts = self._ranked_search(ContactV2, org_id, query, limit)
 
         return [
             {
@@ -86,15 +247,7 @@ class GlobalSearchV2View(APIView):
         ]
 
     def _search_companies(self, org_id, query, limit):
-        companies = CompanyV2.objects.filter(
-            org_id=org_id,
-            deleted_at__isnull=True,
-        ).filter(
-            Q(entity_data__name__icontains=query) |
-            Q(entity_data__email__icontains=query) |
-            Q(entity_data__phone__icontains=query) |
-            Q(entity_data__website__icontains=query)
-        )[:limit]
+        companies = self._ranked_search(CompanyV2, org_id, query, limit)
 
         return [
             {
@@ -109,12 +262,7 @@ class GlobalSearchV2View(APIView):
         ]
 
     def _search_deals(self, org_id, query, limit):
-        deals = DealV2.objects.filter(
-            org_id=org_id,
-            deleted_at__isnull=True,
-        ).filter(
-            Q(entity_data__name__icontains=query)
-        )[:limit]
+        deals = self._ranked_search(DealV2, org_id, query, limit)
 
         return [
             {
@@ -129,15 +277,7 @@ class GlobalSearchV2View(APIView):
         ]
 
     def _search_leads(self, org_id, query, limit):
-        leads = LeadV2.objects.filter(
-            org_id=org_id,
-            deleted_at__isnull=True,
-        ).filter(
-            Q(entity_data__first_name__icontains=query) |
-            Q(entity_data__last_name__icontains=query) |
-            Q(entity_data__email__icontains=query) |
-            Q(entity_data__company_name__icontains=query)
-        )[:limit]
+        leads = self._ranked_search(LeadV2, org_id, query, limit)
 
         return [
             {
@@ -56,6 +56,7 @@ MIDDLEWARE = [
     'truevalue_common.gateway_auth.ServiceAuthMiddleware',
     'truevalue_common.middleware.RequestLoggingMiddleware',
     'crm.middleware.PermissionStalenessMiddleware',
+    'crm.middleware.AuditBufferMiddleware',
 ]
 
 ROOT_URLCONF = 'crm_service.urls'
@@ -133,6 +134,9 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# Uploaded import files; must be shared between web and Celery workers
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', str(BASE_DIR / 'media'))
+
 # =============================================================================
 # DEFAULT PRIMARY KEY
 # =============================================================================
@@ -182,6 +186,13 @@ JWT_ALGORITHM = 'RS256'
 # =============================================================================
 AUTH_SERVICE_URL = os.getenv('AUTH_SERVICE_URL', 'http://localhost:8001')
 ORG_SERVICE_URL = os.getenv('ORG_SERVICE_URL', 'http://localhost:8002')
+ORG_SERVICE_TIMEOUT = float(os.getenv('ORG_SERVICE_TIMEOUT', '5.0'))
+ORG_SERVICE_MAX_CONNECTIONS = int(os.getenv('ORG_SERVICE_MAX_CONNECTIONS', '20'))
+ORG_SERVICE_CACHE_TTL = int(os.getenv('ORG_SERVICE_CACHE_TTL', '300'))
+ORG_SERVICE_NEGATIVE_CACHE_TTL = int(os.getenv('ORG_SERVICE_NEGATIVE_CACHE_TTL', '30'))
+ORG_SERVICE_CACHE_SIZE = int(os.getenv('ORG_SERVICE_CACHE_SIZE', '4096'))
+ORG_SERVICE_BREAKER_THRESHOLD = int(os.getenv('ORG_SERVICE_BREAKER_THRESHOLD', '5'))
+ORG_SERVICE_BREAKER_RESET = float(os.getenv('ORG_SERVICE_BREAKER_RESET', '30'))
 PERMISSION_SERVICE_URL = os.getenv('PERMISSION_SERVICE_URL', 'http://localhost:8003')
 BILLING_SERVICE_URL = os.getenv('BILLING_SERVICE_URL', 'http://localhost:8004')
 
@@ -203,6 +214,22 @@ CACHES = {
 # KAFKA
 # =============================================================================
 KAFKA_BOOTSTRAP_SERVERS = os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092')
+# 'kafka', or 'memory' for the in-process broker stand-in (crm.kafka_memory)
+KAFKA_PRODUCER_BACKEND = os.getenv('KAFKA_PRODUCER_BACKEND', 'kafka')
+# Producer tuning for the event outbox relay (crm.outbox), which sends in large batches
+# Compression codec: lz4 (default) or zstd for a better ratio at some CPU cost
+KAFKA_PRODUCER_COMPRESSION = os.getenv('KAFKA_PRODUCER_COMPRESSION', 'lz4')
+KAFKA_PRODUCER_LINGER_MS = int(os.getenv('KAFKA_PRODUCER_LINGER_MS', '20'))
+KAFKA_PRODUCER_BATCH_BYTES = int(os.getenv('KAFKA_PRODUCER_BATCH_BYTES', '262144'))
+KAFKA_PRODUCER_BATCH_MESSAGES = int(os.getenv('KAFKA_PRODUCER_BATCH_MESSAGES', '10000'))
+KAFKA_PRODUCER_QUEUE_MAX_MESSAGES = int(os.getenv('KAFKA_PRODUCER_QUEUE_MAX_MESSAGES', '100000'))
+# Seconds a shutting-down process waits for buffered messages to be delivered
+KAFKA_PRODUCER_SHUTDOWN_TIMEOUT = int(os.getenv('KAFKA_PRODUCER_SHUTDOWN_TIMEOUT', '10'))
+# Event wire encoding (crm.event_codecs): json or msgpack, per topic as "crm.*=msgpack,audit.events=json"
+KAFKA_DEFAULT_ENCODING = os.getenv('KAFKA_DEFAULT_ENCODING', 'json')
+KAFKA_TOPIC_ENCODINGS = dict(
+    item.strip().split('=', 1) for item in os.getenv('KAFKA_TOPIC_ENCODINGS', '').split(',') if '=' in item
+)
 
 # =============================================================================
 # ELASTICSEARCH
@@ -244,6 +271,58 @@ CRM_SETTINGS = {
         'website', 'referral', 'cold_call', 'trade_show',
         'social_media', 'advertisement', 'partner', 'other'
     ],
+    # Max managed entity_data expression indexes per kind (search/sort) per table
+    'ENTITY_DATA_INDEX_LIMIT': int(os.getenv('ENTITY_DATA_INDEX_LIMIT', '24')),
+    # 1 = back is_unique form fields with per-org partial unique indexes (the locked check always applies)
+    'ENTITY_DATA_UNIQUE_INDEXES': int(os.getenv('ENTITY_DATA_UNIQUE_INDEXES', '0')),
+    # Max per-org unique indexes per V2 table when enabled; each one costs every write to the table
+    'ENTITY_DATA_UNIQUE_INDEX_LIMIT': int(os.getenv('ENTITY_DATA_UNIQUE_INDEX_LIMIT', '50')),
+    # Seconds an org's member name map stays in Redis
+    'MEMBER_DIRECTORY_TTL': int(os.getenv('MEMBER_DIRECTORY_TTL', '300')),
+    # List totals: exact up to the threshold, then 'estimate' (EXPLAIN) or 'cached' (exact, reused for the TTL)
+    'LIST_COUNT_EXACT_THRESHOLD': int(os.getenv('LIST_COUNT_EXACT_THRESHOLD', '10000')),
+    'LIST_COUNT_STRATEGY': os.getenv('LIST_COUNT_STRATEGY', 'estimate'),
+    'LIST_COUNT_CACHE_TTL': int(os.getenv('LIST_COUNT_CACHE_TTL', '60')),
+    # Seconds after its last reconcile an org's metrics rollup is still trusted
+    'ORG_ROLLUP_MAX_AGE': int(os.getenv('ORG_ROLLUP_MAX_AGE', '3600')),
+    # Seconds compiled form validators (and the org -> default form pointer) stay in Redis
+    'FORM_VALIDATOR_CACHE_TTL': int(os.getenv('FORM_VALIDATOR_CACHE_TTL', '3600')),
+    # Rows per validate/write chunk in the V2 bulk import engine
+    'IMPORT_CHUNK_SIZE': int(os.getenv('IMPORT_CHUNK_SIZE', '1000')),
+    # Imports above this many JSON rows (and every file upload) run as background jobs
+    'IMPORT_SYNC_MAX_ROWS': int(os.getenv('IMPORT_SYNC_MAX_ROWS', '500')),
+    # Failed rows kept (with their data) on an import job for download
+    'IMPORT_JOB_MAX_ERRORS': int(os.getenv('IMPORT_JOB_MAX_ERRORS', '10000')),
+    # Seconds without a checkpoint before a pending/running import job is re-queued
+    'IMPORT_JOB_STALL_SECONDS': int(os.getenv('IMPORT_JOB_STALL_SECONDS', '600')),
+    # Rows fetched per server-side cursor round trip (and per name lookup) in CSV exports
+    'EXPORT_CHUNK_SIZE': int(os.getenv('EXPORT_CHUNK_SIZE', '2000')),
+    # Days finished export job files are kept for download
+    'EXPORT_JOB_RETENTION_DAYS': int(os.getenv('EXPORT_JOB_RETENTION_DAYS', '7')),
+    # Days audit log entries are kept for orgs without an AuditRetentionPolicy
+    'AUDIT_LOG_RETENTION_DAYS': int(os.getenv('AUDIT_LOG_RETENTION_DAYS', '365')),
+    # Monthly audit log partitions created ahead of the current month
+    'AUDIT_LOG_PARTITIONS_AHEAD': int(os.getenv('AUDIT_LOG_PARTITIONS_AHEAD', '3')),
+    # 1 = drop expired audit partitions instead of detaching them as archive tables
+    'AUDIT_LOG_DROP_EXPIRED': int(os.getenv('AUDIT_LOG_DROP_EXPIRED', '0')),
+    # Outbox rows the event relay sends per batch (one transaction, one producer flush)
+    'EVENT_OUTBOX_BATCH_SIZE': int(os.getenv('EVENT_OUTBOX_BATCH_SIZE', '1000')),
+    # Failed deliveries after which an outbox row is moved to crm_event_outbox_dead
+    'EVENT_OUTBOX_MAX_ATTEMPTS': int(os.getenv('EVENT_OUTBOX_MAX_ATTEMPTS', '10')),
+    # Days dead-lettered outbox rows are kept for inspection
+    'EVENT_OUTBOX_DEAD_LETTER_RETENTION_DAYS': int(os.getenv('EVENT_OUTBOX_DEAD_LETTER_RETENTION_DAYS', '14')),
+    # Seconds the relay waits for the broker to acknowledge a batch
+    'EVENT_OUTBOX_FLUSH_TIMEOUT': int(os.getenv('EVENT_OUTBOX_FLUSH_TIMEOUT', '30')),
+    # Seconds the relay_events command sleeps when the outbox is empty
+    'EVENT_OUTBOX_POLL_INTERVAL': int(os.getenv('EVENT_OUTBOX_POLL_INTERVAL', '1')),
+    # Due V2 reminders claimed (FOR UPDATE SKIP LOCKED) and sent per transaction
+    'REMINDER_BATCH_SIZE': int(os.getenv('REMINDER_BATCH_SIZE', '200')),
+    # Threads sending a reminder batch, each over its own SMTP connection
+    'REMINDER_SEND_THREADS': int(os.getenv('REMINDER_SEND_THREADS', '8')),
+    # Longest sleep of the reminder_scheduler loop between checks of the reminder wheel
+    'REMINDER_WHEEL_TICK_SECONDS': int(os.getenv('REMINDER_WHEEL_TICK_SECONDS', '1')),
+    # Minutes ahead the reminder sweep re-adds pending reminders to the wheel
+    'REMINDER_WHEEL_RESYNC_MINUTES': int(os.getenv('REMINDER_WHEEL_RESYNC_MINUTES', '60')),
 }
 
 # =============================================================================
@@ -313,16 +392,7 @@ CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
-CELERY_BEAT_SCHEDULE = {
-    'send-activity-reminders-v1': {
-        'task': 'crm.tasks.send_activity_reminders',
-        'schedule': 300.0,
-    },
-    'send-activity-reminders-v2': {
-        'task': 'crm.tasks.send_activity_v2_reminders',
-        'schedule': 300.0,
-    },
-}
+# Periodic tasks are defined once, in app.conf.beat_schedule (crm_service/celery.py)
 
 # =============================================================================
 # EMAIL CONFIGURATION
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
-from . import search_v2, audit_v2_views, reports_v2
+from . import search_v2, audit_v2_views, import_jobs_views, export_jobs_views, reports_v2
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from rest_framework import permissions
@@ -41,6 +41,11 @@ urlpatterns = [
     path('api/v2/', include('tags_v2.urls')),
     path('api/v2/search/', search_v2.GlobalSearchV2View.as_view(), name='global-search-v2'),
     path('api/v2/audit-log/', audit_v2_views.AuditLogV2View.as_view(), name='audit-log-v2'),
+    path('api/v2/import-jobs/', import_jobs_views.ImportJobCreateView.as_view(), name='import-job-create-v2'),
+    path('api/v2/import-jobs/<uuid:job_id>/', import_jobs_views.ImportJobDetailView.as_view(), name='import-job-detail-v2'),
+    path('api/v2/import-jobs/<uuid:job_id>/errors/', import_jobs_views.ImportJobErrorsView.as_view(), name='import-job-errors-v2'),
+    path('api/v2/export-jobs/<uuid:job_id>/', export_jobs_views.ExportJobDetailView.as_view(), name='export-job-detail-v2'),
+    path('api/v2/export-jobs/<uuid:job_id>/download/', export_jobs_views.ExportJobDownloadView.as_view(), name='export-job-download-v2'),
     path('api/v2/reports/dashboard/', reports_v2.DashboardV2View.as_view(), name='dashboard-v2'),
     path('api/v2/reports/pipeline/', reports_v2.SalesPipelineReportV2View.as_view(), name='pipeline-report-v2'),
     path('api/v2/reports/team-activity/', reports_v2.TeamActivityReportV2View.as_view(), name='team-activity-report-v2'),
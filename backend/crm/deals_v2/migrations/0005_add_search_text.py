@@ -0,0 +1,41 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from crm_service.search_index import build_search_text
+
+SEARCH_FIELDS = ('name',)
+
+
+def backfill_search_text(apps, schema_editor):
+    DealV2 = apps.get_model('deals_v2', 'DealV2')
+    batch = []
+    for obj in DealV2.objects.only('id', 'entity_data').iterator(chunk_size=1000):
+        obj.search_text = build_search_text(obj.entity_data, SEARCH_FIELDS)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            DealV2.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        DealV2.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deals_v2', '0004_remove_stage_choices'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='dealv2',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='dealv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='deals_v2_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,22 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deals_v2', '0005_add_search_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dealv2',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='dealv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='deals_v2_search_fts_idx'),
+        ),
+    ]
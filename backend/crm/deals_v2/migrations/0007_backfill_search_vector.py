@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from crm_service.search_index import backfill_search_vectors
+
+SEARCH_VECTOR_WEIGHTS = (
+    ('A', ('name',)),
+    ('D', ('description',)),
+)
+
+
+def backfill_search_vector(apps, schema_editor):
+    DealV2 = apps.get_model('deals_v2', 'DealV2')
+    backfill_search_vectors(DealV2, SEARCH_VECTOR_WEIGHTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deals_v2', '0006_add_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,15 @@
 import uuid
 from decimal import Decimal
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from crm_service.search_index import SearchIndexMixin
 
-class DealV2(models.Model):
+
+class DealV2(SearchIndexMixin, models.Model):
 
     class Status(models.TextChoices):
         OPEN = 'open', 'Open'
@@ -13,6 +17,12 @@ class DealV2(models.Model):
         LOST = 'lost', 'Lost'
         ABANDONED = 'abandoned', 'Abandoned'
 
+    SEARCH_FIELDS = ('name',)
+    SEARCH_VECTOR_WEIGHTS = (
+        ('A', ('name',)),
+        ('D', ('description',)),
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     org_id = models.UUIDField(db_index=True)
 
@@ -63,6 +73,8 @@ class DealV2(models.Model):
     converted_from_lead_id = models.UUIDField(null=True, blank=True)
 
     entity_data = models.JSONField(default=dict, blank=True)
+    search_text = models.TextField(default='', blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -90,6 +102,15 @@ class DealV2(models.Model):
             models.Index(fields=['org_id', 'company_id'], name='deals_v2_company_idx'),
             models.Index(fields=['org_id', 'pipeline_id'], name='deals_v2_pipeline_fk_idx'),
             models.Index(fields=['org_id', 'deleted_at'], name='deals_v2_deleted_idx'),
+            GinIndex(
+                name='deals_v2_search_trgm_idx',
+                fields=['search_text'],
+                opclasses=['gin_trgm_ops'],
+            ),
+            GinIndex(
+                name='deals_v2_search_fts_idx',
+                fields=['search_vector'],
+            ),
         ]
 
     def __str__(self):
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import DealV2
-from forms_v2.models import FormDefinition
+from forms_v2.uniqueness import check_unique, unique_violations
+from forms_v2.validation import get_form_validator
+from crm_service.display_names import DisplayNameListSerializer, DisplayNameMixin
 from django.db import transaction
 from django.utils import timezone
 from decimal import Decimal, InvalidOperation
@@ -96,9 +98,8 @@ class DealV2Serializer(serializers.ModelSerializer):
         if not obj.assigned_to_id:
             return ''
         try:
-            from crm.utils import fetch_member_names
-            members = fetch_member_names(str(obj.org_id))
-            return members.get(str(obj.assigned_to_id), '')
+            from crm.member_directory import resolve_member_name
+            return resolve_member_name(obj.org_id, obj.assigned_to_id, self.context.get('request'))
         except Exception:
             return ''
 
@@ -261,126 +262,14 @@ class DealV2Serializer(serializers.ModelSerializer):
         if not org_id:
             raise serializers.ValidationError("X-Org-Id header required")
 
-        form = FormDefinition.objects.filter(
-            org_id=org_id,
-            entity_type='deal',
-            form_type='create',
-            is_default=True,
-            is_active=True
-        ).first()
-
-        if not form:
-            from forms_v2.default_schemas import get_default_deal_schema
-            form = FormDefinition.objects.create(
-                org_id=org_id,
-                entity_type='deal',
-                form_type='create',
-                name='Default Deal Form',
-                description='Auto-generated default form for deals.',
-                is_default=True,
-                is_active=True,
-                schema=get_default_deal_schema(),
-                created_by=getattr(request.user, 'id', None)
-            )
-
-        field_definitions = {}
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                field_name = field.get('name')
-                if field_name:
-                    field_definitions[field_name] = field
-
-        if not field_definitions:
+        validator = get_form_validator(
+            org_id, 'deal', created_by=getattr(request.user, 'id', None)
+        )
+        if not validator.fields:
             raise serializers.ValidationError("No field definitions found in form schema.")
 
-        errors = {}
-
-        for field_name, field_def in field_definitions.items():
-            field_value = value.get(field_name)
-            field_label = field_def.get('label', field_name)
-            field_type = field_def.get('field_type')
-            is_required = field_def.get('is_required', False)
-            is_unique = field_def.get('is_unique', False)
-
-            if is_required:
-                if field_value is None or field_value == '':
-                    errors[field_name] = f"{field_label} is required"
-                    continue
-
-            if field_value is None or field_value == '':
-                continue
-
-            if is_unique and field_value:
-                from django.db.models import Q
-                existing_query = Q(**{f'entity_data__{field_name}': field_value})
-                existing = DealV2.objects.filter(
-                    org_id=org_id, deleted_at__isnull=True
-                ).filter(existing_query)
-
-                if self.instance:
-                    existing = existing.exclude(id=self.instance.id)
-
-                if existing.exists():
-                    errors[field_name] = f"{field_label} must be unique. This value already exists."
-                    continue
-
-            try:
-                if field_type in ['number', 'decimal', 'currency']:
-                    num_value = float(field_value) if not isinstance(field_value, (int, float)) else field_value
-                    validation = field_def.get('validation_rules', {})
-                    if 'min' in validation and num_value < validation['min']:
-                        errors[field_name] = f"{field_label} must be at least {validation['min']}"
-                    if 'max' in validation and num_value > validation['max']:
-                        errors[field_name] = f"{field_label} must be at most {validation['max']}"
-
-                elif field_type == 'email':
-                    if '@' not in str(field_value) or '.' not in str(field_value):
-                        errors[field_name] = f"{field_label} must be a valid email"
-
-                elif field_type == 'url':
-                    if not str(field_value).startswith(('http://', 'https://')):
-                        errors[field_name] = f"{field_label} must be a valid URL"
-
-                elif field_type == 'phone':
-                    if len(str(field_value).strip()) < 10:
-                        errors[field_name] = f"{field_label} must be a valid phone number"
-
-                elif field_type in ['select', 'radio']:
-                    options = field_def.get('options', {})
-                    valid_values = [opt['value'] for opt in options.get('options', [])]
-                    if valid_values and str(field_value) not in valid_values:
-                        errors[field_name] = f"{field_label} must be one of: {', '.join(valid_values)}"
-
-                elif field_type == 'multi_select':
-                    if not isinstance(field_value, list):
-                        errors[field_name] = f"{field_label} must be a list"
-                    else:
-                        options = field_def.get('options', {})
-                        valid_values = [opt['value'] for opt in options.get('options', [])]
-                        if valid_values:
-                            invalid = [v for v in field_value if str(v) not in valid_values]
-                            if invalid:
-                                errors[field_name] = f"{field_label} contains invalid values: {', '.join(map(str, invalid))}"
-
-                elif field_type == 'checkbox':
-                    if not isinstance(field_value, bool):
-                        errors[field_name] = f"{field_label} must be true or false"
-
-                elif field_type == 'text':
-                    validation = field_def.get('validation_rules', {})
-                    text_len = len(str(field_value))
-                    if 'min_length' in validation and text_len < validation['min_length']:
-                        errors[field_name] = f"{field_label} must be at least {validation['min_length']} characters"
-                    if 'max_length' in validation and text_len > validation['max_length']:
-                        errors[field_name] = f"{field_label} must be at most {validation['max_length']} characters"
-                    if 'pattern' in validation:
-                        import re
-                        if not re.match(validation['pattern'], str(field_value)):
-                            errors[field_name] = f"{field_label} format is invalid"
-
-            except Exception as e:
-                errors[field_name] = f"{field_label} validation error: {str(e)}"
-
+        conflicts = check_unique(DealV2, org_id, validator, value, instance=self.instance)
+        errors = validator.validate(value, conflicts=conflicts)
         if errors:
             raise serializers.ValidationError(errors)
 
@@ -400,7 +289,8 @@ class DealV2Serializer(serializers.ModelSerializer):
                         validated_data['probability'] = stage_obj.probability
             except Exception:
                 pass
-        return DealV2.objects.create(**validated_data)
+        with unique_violations('deal', validated_data.get('org_id')):
+            return DealV2.objects.create(**validated_data)
 
     @transaction.atomic
     def update(self, instance, validated_data):
@@ -450,11 +340,12 @@ class DealV2Serializer(serializers.ModelSerializer):
             except Exception:
                 pass
 
-        instance.save()
+        with unique_violations('deal', instance.org_id):
+            instance.save()
         return instance
 
 
-class DealV2ListSerializer(serializers.ModelSerializer):
+class DealV2ListSerializer(DisplayNameMixin, serializers.ModelSerializer):
 
     display_name = serializers.SerializerMethodField()
     display_value = serializers.SerializerMethodField()
@@ -474,6 +365,7 @@ class DealV2ListSerializer(serializers.ModelSerializer):
             'display_name', 'display_value', 'display_stage',
             'display_contact', 'display_company', 'display_pipeline',
         ]
+        list_serializer_class = DisplayNameListSerializer
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -516,37 +408,10 @@ class DealV2ListSerializer(serializers.ModelSerializer):
         return obj.stage.replace('_', ' ').title() if obj.stage else ''
 
     def get_display_contact(self, obj):
-        if not obj.contact_id:
-            return ''
-        try:
-            from contacts_v2.models import ContactV2
-            contact = ContactV2.objects.filter(id=obj.contact_id, deleted_at__isnull=True).first()
-            if contact:
-                first = contact.entity_data.get('first_name', '')
-                last = contact.entity_data.get('last_name', '')
-                return f"{first} {last}".strip() or contact.entity_data.get('email', '')
-            return ''
-        except Exception:
-            return ''
+        return self.display_names.contact(obj.contact_id)
 
     def get_display_company(self, obj):
-        if not obj.company_id:
-            return ''
-        try:
-            from companies_v2.models import CompanyV2
-            company = CompanyV2.objects.filter(id=obj.company_id, deleted_at__isnull=True).first()
-            if company:
-                return company.entity_data.get('name', '')
-            return ''
-        except Exception:
-            return ''
+        return self.display_names.company(obj.company_id)
 
     def get_display_pipeline(self, obj):
-        if not obj.pipeline_id:
-            return ''
-        try:
-            from pipelines_v2.models import PipelineV2
-            pipeline = PipelineV2.objects.filter(id=obj.pipeline_id, deleted_at__isnull=True).first()
-            return pipeline.name if pipeline else ''
-        except Exception:
-            return ''
+        return self.display_names.pipeline(obj.pipeline_id)
@@ -1,11 +1,9 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Q, Count, Sum, Avg
+from django.db.models.fields.json import KT
 from django.utils import timezone
-from django.http import HttpResponse
-import csv
 import json
 from uuid import UUID
 from decimal import Decimal
@@ -13,10 +11,15 @@ from decimal import Decimal
 from .models import DealV2
 from .serializers import DealV2Serializer, DealV2ListSerializer
 from crm_service.audit_v2 import AuditLogV2Mixin
+from crm_service.bulk_actions import bulk_soft_delete, bulk_update_entities
+from crm_service.search_index import full_text_search
 from crm.permissions import CRMResourcePermission
+from crm_service.pagination import V2Pagination
+from crm_service.exports import DealCSVExport
+from crm_service.export_jobs import handle_export_request
 
 
-class DealV2Pagination(PageNumberPagination):
+class DealV2Pagination(V2Pagination):
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -40,7 +43,10 @@ class DealV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
         )
 
         search = self.request.query_params.get('search')
-        if search:
+        search_mode = self.request.query_params.get('mode')
+        if search and search_mode == 'fts':
+            queryset = full_text_search(queryset, search)
+        elif search:
             from forms_v2.models import FormDefinition
 
             form = FormDefinition.objects.filter(
@@ -168,9 +174,14 @@ class DealV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
 
         if sort_by in allowed_sort_fields:
             field = allowed_sort_fields[sort_by]
-            if sort_direction == 'desc':
+            if field.startswith('entity_data__'):
+                field = KT(field)
+                field = field.desc() if sort_direction == 'desc' else field.asc()
+            elif sort_direction == 'desc':
                 field = f'-{field}'
             queryset = queryset.order_by(field)
+        elif search and search_mode == 'fts':
+            queryset = queryset.order_by('-search_rank', '-created_at')
         else:
             queryset = queryset.order_by('-created_at')
 
@@ -266,12 +277,7 @@ class DealV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        deleted_by = request.user.id if hasattr(request, 'user') else None
-        deals = DealV2.objects.filter(id__in=deal_ids, org_id=org_id, deleted_at__isnull=True)
-        count = 0
-        for deal in deals:
-            deal.soft_delete(deleted_by=deleted_by)
-            count += 1
+        count = bulk_soft_delete(DealV2, org_id, deal_ids, request)
 
         return Response({
             'message': f'{count} deals deleted successfully',
@@ -313,17 +319,9 @@ class DealV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
             if field in data:
                 system_updates[field] = data[field]
 
-        deals = DealV2.objects.filter(
-            id__in=deal_ids, org_id=org_id, deleted_at__isnull=True
+        count = bulk_update_entities(
+            DealV2, 'deal', org_id, deal_ids, system_updates, entity_data_updates, request
         )
-        count = 0
-        for deal in deals:
-            for field, value in system_updates.items():
-                setattr(deal, field, value)
-            if entity_data_updates:
-                deal.entity_data.update(entity_data_updates)
-            deal.save()
-            count += 1
 
         return Response({
             'message': f'{count} deals updated successfully',
@@ -352,68 +350,22 @@ class DealV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-        EXPORT_MAX_ROWS = 50000
-        deals = list(queryset[:EXPORT_MAX_ROWS])
-
-        from forms_v2.models import FormDefinition
-        form = FormDefinition.objects.filter(
-            org_id=org_id, entity_type='deal',
-            is_default=True, is_active=True
-        ).first()
-
-        if not form:
+        exporter = DealCSVExport.for_org(org_id)
+        if exporter is None:
             return Response(
                 {'error': 'No form definition found. Please configure deal form first.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        db_column_fields = {
-            'status', 'stage', 'value', 'currency', 'probability',
-            'expected_close_date', 'actual_close_date', 'loss_reason',
-            'pipeline', 'assigned_to', 'contact', 'company',
-        }
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="deals-{timezone.now().strftime("%Y-%m-%d")}.csv"'
-
-        writer = csv.writer(response)
-        headers = [
-            'ID', 'Status', 'Stage', 'Value', 'Currency', 'Probability',
-            'Expected Close', 'Actual Close', 'Loss Reason',
-            'Created At', 'Updated At',
-        ]
-        field_names = []
-
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                if field['name'] not in db_column_fields:
-                    headers.append(field['label'])
-                    field_names.append(field['name'])
-
-        writer.writerow(headers)
-
-        for deal in deals:
-            row = [
-                str(deal.id),
-                deal.status or '',
-                deal.stage or '',
-                str(deal.value),
-                deal.currency or '',
-                str(deal.probability) if deal.probability is not None else '',
-                str(deal.expected_close_date) if deal.expected_close_date else '',
-                str(deal.actual_close_date) if deal.actual_close_date else '',
-                deal.loss_reason or '',
-                deal.created_at.strftime('%Y-%m-%d %H:%M:%S') if deal.created_at else '',
-                deal.updated_at.strftime('%Y-%m-%d %H:%M:%S') if deal.updated_at else '',
-            ]
-            for field_name in field_names:
-                value = deal.entity_data.get(field_name, '')
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                row.append(str(value) if value is not None else '')
-            writer.writerow(row)
-
-        return response
+        # Rows are streamed from a server-side cursor, chunk by chunk; larger
+        # exports (or ?async=true) run as an export job instead.
+        EXPORT_MAX_ROWS = 50000
+        base_name = f'deals-{timezone.now().strftime("%Y-%m-%d")}'
+        return handle_export_request(
+            request, 'deal', queryset,
+            lambda qs: exporter.response(qs, f'{base_name}.csv'),
+            max_rows=EXPORT_MAX_ROWS, base_name=base_name,
+        )
 
     @action(detail=False, methods=['post'])
     def check_duplicate(self, request):
@@ -11,4 +11,4 @@ class FormsV2Config(AppConfig):
         Initialize app when Django starts.
         Import signals, register admin, etc.
         """
-        pass
+        from . import signals  # noqa: F401
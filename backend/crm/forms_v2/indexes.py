@@ -0,0 +1,228 @@
+"""
+Expression index manager for entity_data fields.
+
+V2 list endpoints filter and sort on ``entity_data`` keys chosen by each
+tenant's default form. This module turns those form schemas into a set of
+managed expression indexes per V2 table and reconciles it with what exists:
+
+- searchable text fields get a trigram GIN index on
+  ``UPPER(entity_data->>'field')`` (what ``icontains`` compiles to);
+- sortable fields get a btree index on ``(org_id, (entity_data->>'field'))``;
+- with ``ENTITY_DATA_UNIQUE_INDEXES`` on, ``is_unique`` fields get a
+  partial unique index on ``(entity_data->'field')`` per org that marks
+  them unique, covering that org's live, non-empty values — at most
+  ``ENTITY_DATA_UNIQUE_INDEX_LIMIT`` per table, since every partial index
+  is maintained (and its predicate checked) on each write to the shared
+  table. Uniqueness itself never depends on them: the check in
+  ``uniqueness`` runs under a per-(org, field) advisory lock, and the
+  indexes are only a backstop for the orgs that get one.
+
+Managed indexes carry the ``<table alias>_ed`` prefix so hand-written indexes
+are never touched. DDL runs with CONCURRENTLY, outside any transaction.
+"""
+import hashlib
+import logging
+import re
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+
+from .models import FormDefinition
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TABLES = {
+    'contact': ('crm_contacts_v2', 'contacts_v2'),
+    'company': ('crm_companies_v2', 'companies_v2'),
+    'deal': ('crm_deals_v2', 'deals_v2'),
+    'lead': ('crm_leads_v2', 'leads_v2'),
+}
+
+# entity_data keys exposed through ``sort_by`` on the V2 list endpoints.
+DEFAULT_SORTABLE_FIELDS = {
+    'contact': ['first_name', 'last_name', 'email', 'company_name'],
+    'company': ['name'],
+    'deal': ['name'],
+    'lead': ['first_name', 'last_name', 'email', 'company_name'],
+}
+
+SEARCHABLE_FIELD_TYPES = {'text', 'textarea', 'email', 'phone', 'url'}
+
+FIELD_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+DEFAULT_INDEX_LIMIT = 24
+DEFAULT_UNIQUE_INDEX_LIMIT = 50
+
+
+def _index_name(alias: str, kind: str, field: str) -> str:
+    name = f'{alias}_ed{kind}_{field}'.lower()
+    if len(name) > 63:
+        digest = hashlib.md5(field.encode()).hexdigest()[:8]
+        name = f'{alias}_ed{kind}_{field[:40]}_{digest}'.lower()
+    return name
+
+
+def unique_index_name(alias: str, org_id, field: str) -> str:
+    return _index_name(alias, 'j', f'{uuid.UUID(str(org_id)).hex}_{field}')
+
+
+def collect_schema_fields(entity_type: str) -> tuple[Counter, Counter]:
+    """
+    Count, across every org's default form, how many orgs mark each field
+    searchable and sortable.
+    """
+    searchable = Counter()
+    sortable = Counter()
+
+    forms = FormDefinition.objects.filter(
+        entity_type=entity_type, form_type='create',
+        is_default=True, is_active=True,
+    ).values_list('schema', flat=True)
+
+    for schema in forms.iterator(chunk_size=500):
+        for section in (schema or {}).get('sections', []):
+            for field in section.get('fields', []):
+                name = field.get('name')
+                if not name or not FIELD_NAME_RE.match(name):
+                    continue
+                if (field.get('is_searchable', True)
+                        and field.get('field_type', '') in SEARCHABLE_FIELD_TYPES):
+                    searchable[name] += 1
+                if field.get('is_sortable', False):
+                    sortable[name] += 1
+
+    return searchable, sortable
+
+
+def collect_unique_fields(entity_type: str) -> list[tuple]:
+    """(org_id, field) for every field an org's default form marks unique."""
+    forms = FormDefinition.objects.filter(
+        entity_type=entity_type, form_type='create',
+        is_default=True, is_active=True,
+    ).values_list('org_id', 'schema')
+
+    unique = set()
+    for org_id, schema in forms.iterator(chunk_size=500):
+        for section in (schema or {}).get('sections', []):
+            for field in section.get('fields', []):
+                name = field.get('name')
+                if name and FIELD_NAME_RE.match(name) and field.get('is_unique', False):
+                    unique.add((org_id, name))
+    return sorted(unique, key=lambda item: (str(item[0]), item[1]))
+
+
+def desired_unique_indexes(entity_type: str) -> dict:
+    """
+    Return {index_name: CREATE UNIQUE INDEX statement} for unique form
+    fields; empty unless ``ENTITY_DATA_UNIQUE_INDEXES`` is on.
+    """
+    if not settings.CRM_SETTINGS.get('ENTITY_DATA_UNIQUE_INDEXES', 0):
+        return {}
+    limit = settings.CRM_SETTINGS.get('ENTITY_DATA_UNIQUE_INDEX_LIMIT', DEFAULT_UNIQUE_INDEX_LIMIT)
+    table, alias = ENTITY_TABLES[entity_type]
+    unique_fields = collect_unique_fields(entity_type)
+    if len(unique_fields) > limit:
+        logger.info(
+            f"{len(unique_fields)} unique {entity_type} fields, indexing the first {limit}; "
+            f"the rest rely on the locked uniqueness check"
+        )
+    indexes = {}
+    for org_id, field in unique_fields[:limit]:
+        name = unique_index_name(alias, org_id, field)
+        indexes[name] = (
+            f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f"((entity_data->'{field}')) "
+            f"WHERE org_id = '{uuid.UUID(str(org_id))}' AND deleted_at IS NULL "
+            f"AND entity_data->>'{field}' <> ''"
+        )
+    return indexes
+
+
+def desired_indexes(entity_type: str) -> dict:
+    """Return {index_name: CREATE INDEX statement} the schemas call for."""
+    table, alias = ENTITY_TABLES[entity_type]
+    limit = settings.CRM_SETTINGS.get('ENTITY_DATA_INDEX_LIMIT', DEFAULT_INDEX_LIMIT)
+    searchable, sortable = collect_schema_fields(entity_type)
+
+    for name in DEFAULT_SORTABLE_FIELDS.get(entity_type, []):
+        sortable[name] += 1
+
+    indexes = {}
+    for field, _ in searchable.most_common(limit):
+        name = _index_name(alias, 's', field)
+        indexes[name] = (
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f"USING gin (UPPER(entity_data->>'{field}') gin_trgm_ops)"
+        )
+    for field, _ in sortable.most_common(limit):
+        name = _index_name(alias, 'o', field)
+        indexes[name] = (
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f"(org_id, (entity_data->>'{field}'))"
+        )
+    indexes.update(desired_unique_indexes(entity_type))
+    return indexes
+
+
+def existing_indexes(entity_type: str) -> dict:
+    """Return {index_name: is_valid} for managed indexes on the entity table."""
+    table, alias = ENTITY_TABLES[entity_type]
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname, i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            WHERE t.relname = %s AND c.relname LIKE %s
+        """, [table, f'{alias}\\_ed%'])
+        return {name: valid for name, valid in cursor.fetchall()}
+
+
+def plan_entity_indexes(entity_type: str) -> dict:
+    desired = desired_indexes(entity_type)
+    existing = existing_indexes(entity_type)
+
+    invalid = {name for name, valid in existing.items() if not valid}
+    return {
+        'create': {
+            name: sql for name, sql in desired.items()
+            if name not in existing or name in invalid
+        },
+        'drop': sorted((set(existing) - set(desired)) | invalid),
+    }
+
+
+def sync_entity_indexes(entity_type: str, dry_run: bool = False) -> dict:
+    """
+    Create missing and drop stale managed indexes for one entity type.
+    Invalid leftovers from interrupted concurrent builds are rebuilt.
+
+    A unique index can't be built while the org already holds duplicate
+    values; it is reported under ``failed`` and retried on the next sync.
+    """
+    plan = plan_entity_indexes(entity_type)
+    plan['failed'] = []
+    if dry_run:
+        return plan
+
+    if connection.in_atomic_block:
+        raise RuntimeError("Concurrent index builds cannot run inside a transaction")
+
+    with connection.cursor() as cursor:
+        for name in plan['drop']:
+            logger.info(f"Dropping entity_data index {name}")
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+        for name, sql in plan['create'].items():
+            logger.info(f"Creating entity_data index {name}")
+            try:
+                cursor.execute(sql)
+            except DatabaseError as e:
+                if not sql.startswith('CREATE UNIQUE'):
+                    raise
+                logger.warning(f"Could not build unique index {name}: {e}")
+                cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+                plan['failed'].append(name)
+
+    return plan
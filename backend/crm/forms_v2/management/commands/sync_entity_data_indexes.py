@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from forms_v2.indexes import ENTITY_TABLES, sync_entity_indexes
+
+
+class Command(BaseCommand):
+    help = 'Create/drop entity_data expression indexes to match the searchable, sortable and unique form fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity',
+            type=str,
+            choices=list(ENTITY_TABLES),
+            help='Sync a single entity type (default: all)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the planned changes without running any DDL',
+        )
+
+    def handle(self, *args, **options):
+        entity_types = [options['entity']] if options['entity'] else list(ENTITY_TABLES)
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN — no indexes will be changed'))
+
+        for entity_type in entity_types:
+            plan = sync_entity_indexes(entity_type, dry_run=dry_run)
+            self.stdout.write(f'\n{entity_type}:')
+            for name in plan['create']:
+                self.stdout.write(self.style.SUCCESS(f'  + {name}'))
+            for name in plan['drop']:
+                self.stdout.write(self.style.WARNING(f'  - {name}'))
+            for name in plan['failed']:
+                self.stdout.write(self.style.ERROR(f'  ! {name} (duplicate values exist)'))
+            if not plan['create'] and not plan['drop']:
+                self.stdout.write('  up to date')
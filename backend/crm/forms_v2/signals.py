@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .indexes import ENTITY_TABLES
+from .models import FormDefinition
+from .validation import invalidate_form_validator
+
+
+def _schedule_index_sync(instance):
+    if instance.entity_type not in ENTITY_TABLES:
+        return
+
+    from .tasks import sync_entity_data_indexes
+
+    entity_type = instance.entity_type
+    transaction.on_commit(lambda: sync_entity_data_indexes.delay(entity_type))
+
+
+def _schedule_validator_invalidation(instance):
+    org_id, entity_type = instance.org_id, instance.entity_type
+    # Drop the pointer now and again after commit, so no request re-caches
+    # the old default form in between.
+    invalidate_form_validator(org_id, entity_type)
+    transaction.on_commit(lambda: invalidate_form_validator(org_id, entity_type))
+
+
+@receiver(post_save, sender=FormDefinition)
+def form_definition_saved(sender, instance, **kwargs):
+    _schedule_index_sync(instance)
+    _schedule_validator_invalidation(instance)
+
+
+@receiver(post_delete, sender=FormDefinition)
+def form_definition_deleted(sender, instance, **kwargs):
+    _schedule_index_sync(instance)
+    _schedule_validator_invalidation(instance)
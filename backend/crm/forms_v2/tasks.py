@@ -0,0 +1,22 @@
+import logging
+from typing import Dict
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='forms_v2.tasks.sync_entity_data_indexes', ignore_result=True)
+def sync_entity_data_indexes(entity_type: str) -> Dict:
+    from .indexes import sync_entity_indexes
+
+    plan = sync_entity_indexes(entity_type)
+    result = {
+        'entity_type': entity_type,
+        'created': sorted(plan['create']),
+        'dropped': plan['drop'],
+        'failed': plan['failed'],
+    }
+    if plan['create'] or plan['drop']:
+        logger.info(f"entity_data index sync: {result}")
+    return result
@@ -0,0 +1,215 @@
+"""
+Uniqueness checks for ``is_unique`` form fields.
+
+Values are compared as jsonb (``entity_data->'field'``), the same equality
+the optional managed unique indexes enforce (see
+``indexes.desired_unique_indexes``): ``"1"`` and ``1`` are different
+values, as they were when the check compared JSON documents.
+
+``UniquenessEngine.check`` resolves a whole batch of records with one
+``IN`` query per unique field and flags values repeated inside the batch;
+the first occurrence wins, as if the rows had been written one by one.
+Inside a transaction it first takes an advisory lock per (table, org,
+field), so concurrent writers of the same org's unique field check and
+write one after another and the check alone keeps values unique for orgs
+without a unique index.
+"""
+import json
+from contextlib import contextmanager
+
+from django.db import IntegrityError, connection
+from django.db.models.fields.json import KT, KeyTransform
+from django.db.models.functions import Upper
+from rest_framework import serializers
+
+from .indexes import ENTITY_TABLES, unique_index_name
+
+EXISTS = 'exists'
+DUPLICATE = 'duplicate'
+
+UNIQUE_MESSAGES = {
+    EXISTS: "{label} must be unique. This value already exists.",
+    DUPLICATE: "{label} must be unique. This value appears more than once in the batch.",
+}
+
+IN_LIST_CHUNK = 1000
+
+
+def _jsonb_key(key: str):
+    # jsonb orders object keys by byte length, then bytewise.
+    encoded = key.encode('utf-8')
+    return len(encoded), encoded
+
+
+def unique_text(value):
+    """
+    The text ``entity_data->>'field'`` yields for a stored value: strings
+    as-is, anything else in jsonb's output format (non-ASCII kept, ``", "``
+    and ``": "`` separators, object keys in jsonb order).
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: _jsonb_key(item[0]))
+        return '{' + ', '.join(
+            f'{json.dumps(k, ensure_ascii=False)}: {_jsonb_literal(v)}' for k, v in items
+        ) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(_jsonb_literal(v) for v in value) + ']'
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _jsonb_literal(value):
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    return unique_text(value)
+
+
+def _normalize(value):
+    # jsonb compares numbers by value: 1 and 1.0 are equal.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def unique_key(value):
+    """Hashable key under which two values are equal exactly when their jsonb is."""
+    return json.dumps(_normalize(value), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+
+def lock_unique_fields(table, org_id, fields):
+    """Serialize check-then-write on these unique fields until the transaction ends."""
+    if not fields or not connection.in_atomic_block:
+        return
+    with connection.cursor() as cursor:
+        for field in sorted(fields):
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(hashtext(%s))', [f'unique:{table}:{org_id}:{field}']
+            )
+
+
+def _chunks(values, size=IN_LIST_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class UniquenessEngine:
+    """Unique-field lookups for one org's live rows of a V2 entity model."""
+
+    def __init__(self, model, org_id, fields):
+        self.model = model
+        self.org_id = org_id
+        self.fields = tuple(fields)
+
+    def _live(self):
+        return self.model.objects.filter(org_id=self.org_id, deleted_at__isnull=True)
+
+    def lock(self):
+        lock_unique_fields(self.model._meta.db_table, self.org_id, self.fields)
+
+    def taken(self, field, values) -> dict:
+        """Return {unique_key(value): set of pks} for values already stored in ``field``."""
+        alias = f'_unique_{field}'
+        found = {}
+        for chunk in _chunks(values):
+            rows = self._live().annotate(
+                **{alias: KeyTransform(field, 'entity_data')}
+            ).filter(**{f'{alias}__in': chunk}).values_list(alias, 'pk')
+            for value, pk in rows:
+                found.setdefault(unique_key(value), set()).add(pk)
+        return found
+
+    def existing_rows(self, field, values, case_insensitive=False) -> dict:
+        """Return {match_key(value): instance} of live rows matching ``field``."""
+        alias = f'_match_{field}'
+        expression = KT(f'entity_data__{field}')
+        if case_insensitive:
+            expression = Upper(expression)
+
+        keys = {self.match_key(v, case_insensitive) for v in values if v}
+        found = {}
+        for chunk in _chunks(keys):
+            rows = self._live().annotate(**{alias: expression}).filter(**{f'{alias}__in': chunk})
+            for row in rows:
+                found.setdefault(getattr(row, alias), row)
+        return found
+
+    @staticmethod
+    def match_key(value, case_insensitive=False):
+        text = unique_text(value)
+        return text.upper() if case_insensitive else text
+
+    def check(self, records, record_ids=None) -> list:
+        """
+        Return one {field: EXISTS | DUPLICATE} dict per record.
+
+        ``record_ids`` gives the pk each record is stored under (None for
+        new rows) so a record never conflicts with itself.
+        """
+        record_ids = list(record_ids) if record_ids is not None else [None] * len(records)
+        conflicts = [{} for _ in records]
+        self.lock()
+
+        for field in self.fields:
+            positions = {}
+            values = {}
+            for index, record in enumerate(records):
+                value = record.get(field)
+                if value:
+                    key = unique_key(value)
+                    values.setdefault(key, value)
+                    positions.setdefault(key, []).append(index)
+            if not positions:
+                continue
+
+            taken = self.taken(field, values.values())
+            for key, indexes in positions.items():
+                owners = taken.get(key, set())
+                for order, index in enumerate(indexes):
+                    if owners - {record_ids[index]}:
+                        conflicts[index][field] = EXISTS
+                    elif order > 0:
+                        conflicts[index][field] = DUPLICATE
+        return conflicts
+
+
+def check_unique(model, org_id, validator, data, instance=None) -> dict:
+    """Conflicts for a single record against ``validator``'s unique fields."""
+    if not validator.unique_fields:
+        return {}
+    engine = UniquenessEngine(model, org_id, validator.unique_fields)
+    return engine.check([data], [instance.pk if instance else None])[0]
+
+
+def _violated_constraint(exc):
+    diag = getattr(exc.__cause__, 'diag', None)
+    return getattr(diag, 'constraint_name', None)
+
+
+@contextmanager
+def unique_violations(entity_type, org_id):
+    """
+    Turn a managed unique index violation (a concurrent writer got there
+    first) into the same validation error the pre-write check reports.
+    """
+    try:
+        yield
+    except IntegrityError as e:
+        constraint = _violated_constraint(e)
+        if not constraint:
+            raise
+
+        from .validation import get_form_validator
+
+        _, alias = ENTITY_TABLES[entity_type]
+        for field in get_form_validator(org_id, entity_type).fields:
+            if field.unique and unique_index_name(alias, org_id, field.name) == constraint:
+                raise serializers.ValidationError({
+                    'entity_data': {field.name: UNIQUE_MESSAGES[EXISTS].format(label=field.label)}
+                })
+        raise
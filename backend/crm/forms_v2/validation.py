@@ -0,0 +1,327 @@
+"""
+Compiled form-schema validators for V2 ``entity_data``.
+
+``compile_form`` turns a FormDefinition schema into a ``FormValidator``:
+field definitions are flattened once, regex patterns compiled, option
+lists turned into sets and min/max rules read up front, so validating a
+record is a single pass over prepared fields.
+
+``get_form_validator`` resolves an org's default create form for an entity
+type without touching the database on the hot path:
+
+- ``form_validator_ref:<org>:<entity>`` in Redis points at the current
+  (form id, updated_at);
+- compiled validators are cached in-process and in Redis under
+  ``form_validator:<form id>:<updated_at>``, so an edited form can never be
+  served from an old entry.
+
+Saving or deleting a FormDefinition drops the pointer (see ``signals``).
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import FormDefinition
+from .uniqueness import UNIQUE_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+VALIDATOR_REF_PREFIX = 'form_validator_ref:'
+VALIDATOR_PREFIX = 'form_validator:'
+DEFAULT_VALIDATOR_CACHE_TTL = 3600
+LOCAL_CACHE_SIZE = 256
+
+# Contacts and leads historically validate 'currency' fields as free values.
+NUMERIC_FIELD_TYPES = {
+    'contact': frozenset({'number', 'decimal'}),
+    'lead': frozenset({'number', 'decimal'}),
+    'company': frozenset({'number', 'decimal', 'currency'}),
+    'deal': frozenset({'number', 'decimal', 'currency'}),
+}
+
+DEFAULT_FORMS = {
+    'contact': ('Default Contact Form', 'Auto-generated default form for contacts.'),
+    'company': ('Default Company Form', 'Auto-generated default form for companies.'),
+    'deal': ('Default Deal Form', 'Auto-generated default form for deals.'),
+    'lead': (
+        'Default Lead Form',
+        'Auto-generated default form for leads. You can customize this via the layout editor.',
+    ),
+}
+
+
+class CompiledField:
+    """One schema field with its rules prepared for repeated checks."""
+
+    def __init__(self, field_def, numeric_types):
+        self.name = field_def['name']
+        self.label = field_def.get('label', self.name)
+        self.required = bool(field_def.get('is_required', False))
+        self.unique = bool(field_def.get('is_unique', False))
+
+        field_type = field_def.get('field_type')
+        if field_type in numeric_types:
+            field_type = 'number'
+        self.field_type = field_type
+
+        rules = field_def.get('validation_rules') or {}
+        self.min = rules.get('min')
+        self.max = rules.get('max')
+        self.min_length = rules.get('min_length')
+        self.max_length = rules.get('max_length')
+
+        self.pattern = None
+        self.pattern_error = None
+        if field_type == 'text' and 'pattern' in rules:
+            try:
+                self.pattern = re.compile(rules['pattern'])
+            except (re.error, TypeError) as e:
+                self.pattern_error = str(e)
+
+        self.options = ()
+        self.option_set = frozenset()
+        if field_type in ('select', 'radio', 'multi_select'):
+            options = (field_def.get('options') or {}).get('options', [])
+            self.options = tuple(opt['value'] for opt in options)
+            self.option_set = frozenset(self.options)
+
+    def check(self, value):
+        """Return an error message for a non-empty value, or None."""
+        label = self.label
+        field_type = self.field_type
+
+        if field_type == 'number':
+            number = value if isinstance(value, (int, float)) else float(value)
+            error = None
+            if self.min is not None and number < self.min:
+                error = f"{label} must be at least {self.min}"
+            if self.max is not None and number > self.max:
+                error = f"{label} must be at most {self.max}"
+            return error
+
+        if field_type == 'email':
+            text = str(value)
+            if '@' not in text or '.' not in text:
+                return f"{label} must be a valid email"
+            return None
+
+        if field_type == 'url':
+            if not str(value).startswith(('http://', 'https://')):
+                return f"{label} must be a valid URL"
+            return None
+
+        if field_type == 'phone':
+            if len(str(value).strip()) < 10:
+                return f"{label} must be a valid phone number"
+            return None
+
+        if field_type in ('select', 'radio'):
+            if self.option_set and str(value) not in self.option_set:
+                return f"{label} must be one of: {', '.join(self.options)}"
+            return None
+
+        if field_type == 'multi_select':
+            if not isinstance(value, list):
+                return f"{label} must be a list"
+            if self.option_set:
+                invalid = [v for v in value if str(v) not in self.option_set]
+                if invalid:
+                    return f"{label} contains invalid values: {', '.join(map(str, invalid))}"
+            return None
+
+        if field_type == 'checkbox':
+            if not isinstance(value, bool):
+                return f"{label} must be true or false"
+            return None
+
+        if field_type == 'text':
+            text = str(value)
+            error = None
+            if self.min_length is not None and len(text) < self.min_length:
+                error = f"{label} must be at least {self.min_length} characters"
+            if self.max_length is not None and len(text) > self.max_length:
+                error = f"{label} must be at most {self.max_length} characters"
+            if self.pattern_error is not None:
+                raise ValueError(self.pattern_error)
+            if self.pattern is not None and not self.pattern.match(text):
+                error = f"{label} format is invalid"
+            return error
+
+        return None
+
+
+class FormValidator:
+    """Validates ``entity_data`` dicts against one compiled form version."""
+
+    def __init__(self, form_id, updated_at, fields):
+        self.form_id = form_id
+        self.updated_at = updated_at
+        self.fields = tuple(fields)
+        self.unique_fields = tuple(f.name for f in self.fields if f.unique)
+
+    def conflict_errors(self, conflicts):
+        """Messages for a record's {field_name: EXISTS | DUPLICATE} conflicts."""
+        return {
+            field.name: UNIQUE_MESSAGES[conflicts[field.name]].format(label=field.label)
+            for field in self.fields
+            if field.unique and field.name in conflicts
+        }
+
+    def validate(self, data, conflicts=None):
+        """
+        Return {field_name: message}. ``conflicts`` is the record's
+        {field_name: EXISTS | DUPLICATE} from ``uniqueness.UniquenessEngine``.
+        """
+        unique_errors = self.conflict_errors(conflicts or {})
+        errors = {}
+        for field in self.fields:
+            value = data.get(field.name)
+
+            if value is None or value == '':
+                if field.required:
+                    errors[field.name] = f"{field.label} is required"
+                continue
+
+            if field.name in unique_errors:
+                errors[field.name] = unique_errors[field.name]
+                continue
+
+            try:
+                error = field.check(value)
+            except Exception as e:
+                error = f"{field.label} validation error: {str(e)}"
+            if error:
+                errors[field.name] = error
+        return errors
+
+
+def compile_form(form):
+    numeric_types = NUMERIC_FIELD_TYPES.get(form.entity_type, NUMERIC_FIELD_TYPES['company'])
+    fields = OrderedDict()
+    for section in (form.schema or {}).get('sections', []):
+        for field_def in section.get('fields', []):
+            if field_def.get('name'):
+                # Later duplicates win, as when the schema was walked per call.
+                fields[field_def['name']] = field_def
+    return FormValidator(
+        form.id,
+        form.updated_at,
+        [CompiledField(field_def, numeric_types) for field_def in fields.values()],
+    )
+
+
+_local_cache = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _validator_key(form_id, updated_at):
+    return f'{VALIDATOR_PREFIX}{form_id}:{updated_at.isoformat() if updated_at else ""}'
+
+
+def _ref_key(org_id, entity_type):
+    return f'{VALIDATOR_REF_PREFIX}{org_id}:{entity_type}'
+
+
+def _cache_ttl():
+    return settings.CRM_SETTINGS.get('FORM_VALIDATOR_CACHE_TTL', DEFAULT_VALIDATOR_CACHE_TTL)
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Form validator cache read failed for {key}: {e}")
+        return None
+
+
+def _cache_set(key, value):
+    try:
+        cache.set(key, value, timeout=_cache_ttl())
+    except Exception as e:
+        logger.warning(f"Form validator cache write failed for {key}: {e}")
+
+
+def _local_get(key):
+    with _local_lock:
+        validator = _local_cache.get(key)
+        if validator is not None:
+            _local_cache.move_to_end(key)
+        return validator
+
+
+def _local_set(key, validator):
+    with _local_lock:
+        _local_cache[key] = validator
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > LOCAL_CACHE_SIZE:
+            _local_cache.popitem(last=False)
+
+
+def validator_for_form(form):
+    """Compiled validator for a loaded FormDefinition, via both caches."""
+    key = _validator_key(form.id, form.updated_at)
+    validator = _local_get(key)
+    if validator is not None:
+        return validator
+
+    validator = _cache_get(key)
+    if validator is None:
+        validator = compile_form(form)
+        _cache_set(key, validator)
+    _local_set(key, validator)
+    return validator
+
+
+def get_default_form(org_id, entity_type, created_by=None):
+    """The org's default create form, auto-creating it from the built-in schema."""
+    form = FormDefinition.objects.filter(
+        org_id=org_id,
+        entity_type=entity_type,
+        form_type='create',
+        is_default=True,
+        is_active=True
+    ).first()
+    if form:
+        return form
+
+    from . import default_schemas
+    name, description = DEFAULT_FORMS[entity_type]
+    return FormDefinition.objects.create(
+        org_id=org_id,
+        entity_type=entity_type,
+        form_type='create',
+        name=name,
+        description=description,
+        is_default=True,
+        is_active=True,
+        schema=getattr(default_schemas, f'get_default_{entity_type}_schema')(),
+        created_by=created_by,
+    )
+
+
+def get_form_validator(org_id, entity_type, created_by=None):
+    """Validator for the org's default create form of ``entity_type``."""
+    ref_key = _ref_key(org_id, entity_type)
+    ref = _cache_get(ref_key)
+    if ref is not None:
+        key = _validator_key(*ref)
+        validator = _local_get(key) or _cache_get(key)
+        if validator is not None:
+            _local_set(key, validator)
+            return validator
+
+    form = get_default_form(org_id, entity_type, created_by=created_by)
+    validator = validator_for_form(form)
+    _cache_set(ref_key, (form.id, form.updated_at))
+    return validator
+
+
+def invalidate_form_validator(org_id, entity_type):
+    try:
+        cache.delete(_ref_key(org_id, entity_type))
+    except Exception as e:
+        logger.warning(f"Form validator invalidation failed for org={org_id} {entity_type}: {e}")
@@ -3,14 +3,14 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from crm.permissions import CRMResourcePermission
-from rest_framework.pagination import PageNumberPagination
+from crm_service.pagination import V2Pagination
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
 logger = logging.getLogger(__name__)
 
 
-class FormDefinitionPagination(PageNumberPagination):
+class FormDefinitionPagination(V2Pagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
@@ -248,12 +248,12 @@ class FormDefinitionViewSet(viewsets.ModelViewSet):
         data = []
 
         if entity == 'user':
-            from crm.utils import fetch_member_names
+            from crm.member_directory import get_member_names
             
             try:
-                logger.info(f"Fetching org members using fetch_member_names: org_id={org_id}")
+                logger.info(f"Fetching org members from member directory: org_id={org_id}")
                 
-                members_map = fetch_member_names(str(org_id))
+                members_map = get_member_names(org_id, request)
                 
                 logger.info(f"Found {len(members_map)} members from utility function")
                 
@@ -0,0 +1,41 @@
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from crm_service.search_index import build_search_text
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'company_name')
+
+
+def backfill_search_text(apps, schema_editor):
+    LeadV2 = apps.get_model('leads_v2', 'LeadV2')
+    batch = []
+    for obj in LeadV2.objects.only('id', 'entity_data').iterator(chunk_size=1000):
+        obj.search_text = build_search_text(obj.entity_data, SEARCH_FIELDS)
+        batch.append(obj)
+        if len(batch) >= 1000:
+            LeadV2.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        LeadV2.objects.bulk_update(batch, ['search_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_v2', '0002_add_hybrid_fields'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='leadv2',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='leadv2',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='leads_v2_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
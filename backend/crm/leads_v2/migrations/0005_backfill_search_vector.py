@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from crm_service.search_index import backfill_search_vectors
+
+SEARCH_VECTOR_WEIGHTS = (
+    ('A', ('first_name', 'last_name', 'company_name')),
+    ('B', ('email',)),
+    ('C', ('phone', 'mobile')),
+    ('D', ('title', 'description')),
+)
+
+
+def backfill_search_vector(apps, schema_editor):
+    LeadV2 = apps.get_model('leads_v2', 'LeadV2')
+    backfill_search_vectors(LeadV2, SEARCH_VECTOR_WEIGHTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads_v2', '0004_add_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
 import uuid
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 
+from crm_service.search_index import SearchIndexMixin
 
-class LeadV2(models.Model):
+
+class LeadV2(SearchIndexMixin, models.Model):
     class Status(models.TextChoices):
         NEW = 'new', 'New'
         CONTACTED = 'contacted', 'Contacted'
@@ -29,6 +33,14 @@ class LeadV2(models.Model):
         WARM = 'warm', 'Warm'
         COLD = 'cold', 'Cold'
     
+    SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'company_name')
+    SEARCH_VECTOR_WEIGHTS = (
+        ('A', ('first_name', 'last_name', 'company_name')),
+        ('B', ('email',)),
+        ('C', ('phone', 'mobile')),
+        ('D', ('title', 'description')),
+    )
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     org_id = models.UUIDField(db_index=True)
     
@@ -75,6 +87,8 @@ class LeadV2(models.Model):
     )
     
     entity_data = models.JSONField(default=dict, blank=True)
+    search_text = models.TextField(default='', blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     is_converted = models.BooleanField(default=False, db_index=True)
     converted_at = models.DateTimeField(null=True, blank=True)
@@ -104,6 +118,15 @@ class LeadV2(models.Model):
             models.Index(fields=['org_id', 'source'], name='leads_v2_source_idx'),
             models.Index(fields=['org_id', 'owner_id']),
             models.Index(fields=['org_id', 'deleted_at']),
+            GinIndex(
+                name='leads_v2_search_trgm_idx',
+                fields=['search_text'],
+                opclasses=['gin_trgm_ops'],
+            ),
+            GinIndex(
+                name='leads_v2_search_fts_idx',
+                fields=['search_vector'],
+            ),
         ]
     
     def __str__(self):
@@ -1,13 +1,11 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.throttling import AnonRateThrottle
 from django.db.models import Q, Count
+from django.db.models.fields.json import KT
 from django.utils import timezone
-from django.http import HttpResponse
-import csv
 import json
 import logging
 from uuid import UUID
@@ -15,12 +13,18 @@ from uuid import UUID
 from .models import LeadV2
 from .serializers import LeadV2Serializer, LeadV2ListSerializer
 from crm_service.audit_v2 import AuditLogV2Mixin
+from crm_service.bulk_actions import bulk_soft_delete, bulk_update_entities
+from crm_service.search_index import full_text_search
 from crm.permissions import CRMResourcePermission
+from crm_service.pagination import V2Pagination
+from crm_service.exports import LeadCSVExport
+from crm_service.export_jobs import handle_export_request
+from crm_service.import_jobs import handle_import_request
 
 logger = logging.getLogger(__name__)
 
 
-class LeadV2Pagination(PageNumberPagination):
+class LeadV2Pagination(V2Pagination):
     page_size = 25
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -50,7 +54,10 @@ class LeadV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
         )
         
         search = self.request.query_params.get('search')
-        if search:
+        search_mode = self.request.query_params.get('mode')
+        if search and search_mode == 'fts':
+            queryset = full_text_search(queryset, search)
+        elif search:
             from forms_v2.models import FormDefinition
             
             form = FormDefinition.objects.filter(
@@ -177,9 +184,14 @@ class LeadV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
         
         if sort_by in allowed_sort_fields:
             field = allowed_sort_fields[sort_by]
-            if sort_direction == 'desc':
+            if field.startswith('entity_data__'):
+                field = KT(field)
+                field = field.desc() if sort_direction == 'desc' else field.asc()
+            elif sort_direction == 'desc':
                 field = f'-{field}'
             queryset = queryset.order_by(field)
+        elif search and search_mode == 'fts':
+            queryset = queryset.order_by('-search_rank', '-created_at')
         else:
             queryset = queryset.order_by('-created_at')
         
@@ -277,12 +289,7 @@ class LeadV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        deleted_by = request.user.id if hasattr(request, 'user') else None
-        leads = LeadV2.objects.filter(id__in=lead_ids, org_id=org_id, deleted_at__isnull=True)
-        count = 0
-        for lead in leads:
-            lead.soft_delete(deleted_by=deleted_by)
-            count += 1
+        count = bulk_soft_delete(LeadV2, org_id, lead_ids, request)
         
         return Response({
             'message': f'{count} leads deleted successfully',
@@ -321,24 +328,32 @@ class LeadV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
             if field in data:
                 system_updates[field] = data[field]
         
-        leads = LeadV2.objects.filter(id__in=lead_ids, org_id=org_id, deleted_at__isnull=True)
-        count = 0
-        
-        for lead in leads:
-            for field, value in system_updates.items():
-                setattr(lead, field, value)
-            
-            if entity_data_updates:
-                lead.entity_data.update(entity_data_updates)
-            
-            lead.save()
-            count += 1
+        count = bulk_update_entities(
+            LeadV2, 'lead', org_id, lead_ids, system_updates, entity_data_updates, request
+        )
         
         return Response({
             'message': f'{count} leads updated successfully',
             'count': count
         })
     
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_leads(self, request):
+        """
+        Bulk import leads from JSON list.
+        Request: {
+          "leads": [
+            { "first_name": "...", "last_name": "...", "email": "...", ... }
+          ],
+          "skip_duplicates": true,
+          "update_existing": false,
+          "duplicate_check_field": "email"
+        }
+        or multipart with a CSV/JSON ``file``. Uploads, and payloads over
+        IMPORT_SYNC_MAX_ROWS rows, run as an import job: 202 with its URL.
+        """
+        return handle_import_request(request, 'lead', 'leads')
+
     @action(detail=False, methods=['get'])
     def export(self, request):
         """
@@ -371,76 +386,22 @@ class LeadV2ViewSet(AuditLogV2Mixin, viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        EXPORT_MAX_ROWS = 50000
-        leads = list(queryset[:EXPORT_MAX_ROWS])
-        
-        from forms_v2.models import FormDefinition
-        form = FormDefinition.objects.filter(
-            org_id=org_id,
-            entity_type='lead',
-            is_default=True,
-            is_active=True
-        ).first()
-        
-        if not form:
+        exporter = LeadCSVExport.for_org(org_id)
+        if exporter is None:
             return Response(
                 {'error': 'No form definition found. Please configure lead form first.'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        db_column_fields = {
-            'status', 'source', 'rating', 'assigned_to', 'company',
-        }
 
-        from companies_v2.models import CompanyV2
-        company_ids = {l.company_id for l in leads if l.company_id}
-        company_names = {}
-        if company_ids:
-            companies = CompanyV2.objects.filter(id__in=company_ids).only('id', 'entity_data')
-            company_names = {c.id: c.get_name() for c in companies}
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="leads-{timezone.now().strftime("%Y-%m-%d")}.csv"'
-        
-        writer = csv.writer(response)
-        
-        headers = ['ID', 'Status', 'Source', 'Rating', 'Company',
-                    'Assigned To', 'Created At', 'Updated At']
-        field_names = []
-        
-        for section in form.schema.get('sections', []):
-            for field in section.get('fields', []):
-                if field['name'] not in db_column_fields:
-                    headers.append(field['label'])
-                    field_names.append(field['name'])
-        
-        writer.writerow(headers)
-        
-        for lead in leads:
-            company_display = ''
-            if lead.company_id:
-                company_display = company_names.get(lead.company_id, str(lead.company_id))
-
-            row = [
-                str(lead.id),
-                lead.status or '',
-                lead.source or '',
-                lead.rating or '',
-                company_display,
-                str(lead.assigned_to_id) if lead.assigned_to_id else '',
-                lead.created_at.strftime('%Y-%m-%d %H:%M:%S') if lead.created_at else '',
-                lead.updated_at.strftime('%Y-%m-%d %H:%M:%S') if lead.updated_at else '',
-            ]
-            
-            for field_name in field_names:
-                value = lead.entity_data.get(field_name, '')
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value)
-                row.append(str(value) if value is not None else '')
-            
-            writer.writerow(row)
-        
-        return response
+        # Rows are streamed from a server-side cursor, chunk by chunk; larger
+        # exports (or ?async=true) run as an export job instead.
+        EXPORT_MAX_ROWS = 50000
+        base_name = f'leads-{timezone.now().strftime("%Y-%m-%d")}'
+        return handle_export_request(
+            request, 'lead', queryset,
+            lambda qs: exporter.response(qs, f'{base_name}.csv'),
+            max_rows=EXPORT_MAX_ROWS, base_name=base_name,
+        )
     
     @action(detail=False, methods=['post'], permission_classes=[AllowAny], throttle_classes=[WebFormThrottle])
     def web_form(self, request):
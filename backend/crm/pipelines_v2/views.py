@@ -1,7 +1,6 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from collections import defaultdict
 from django.db.models import Count, Sum, Q, Max
 from django.utils import timezone
@@ -15,9 +14,10 @@ from .serializers import (
 )
 from crm.permissions import CRMResourcePermission
 from crm_service.audit_v2 import AuditLogV2Mixin
+from crm_service.pagination import V2Pagination
 
 
-class PipelineV2Pagination(PageNumberPagination):
+class PipelineV2Pagination(V2Pagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -2,7 +2,6 @@ from uuid import UUID
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django.db.models import Count, Q
 
 from .models import TagV2, EntityTagV2
@@ -15,9 +14,10 @@ from .serializers import (
 )
 from crm.permissions import CRMResourcePermission
 from crm_service.audit_v2 import AuditLogV2Mixin
+from crm_service.pagination import V2Pagination
 
 
-class TagV2Pagination(PageNumberPagination):
+class TagV2Pagination(V2Pagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200